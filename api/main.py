@@ -1,17 +1,25 @@
 """FastAPI приложение"""
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 from config import settings
 from database.database import get_db, init_db
 from database.models import Client, MatrixCalculation
-from matrix_calculator import MatrixCalculator, MatrixData
+from matrix_calculator import MatrixCalculator, MatrixData, MatrixRecord
+from matrix_calculator.interpretations import resolve_interpretations
+from matrix_calculator.models import MAX_NAME_LENGTH
 from reports import ReportGenerator
+from reports.image_cache import ImageCache
+from reports.layout import MEDIA_TYPES
+from reports.pdf_jobs import PDFJobQueue, QueueFullError, DONE, FAILED
+from rendering.executor import RenderExecutor, configure_executor
+import asyncio
 import io
+import threading
 
 app = FastAPI(
     title="Личная Матрица Судьбы API",
@@ -20,24 +28,62 @@ app = FastAPI(
 )
 
 # Инициализация
-calculator = MatrixCalculator()
-report_generator = ReportGenerator()
+calculator = MatrixCalculator(
+    cache_size=settings.matrix_cache_size,
+    cache_ttl=settings.matrix_cache_ttl,
+    date_cache_size=settings.matrix_date_cache_size,
+    name_cache_size=settings.matrix_name_cache_size,
+    date_index_path=settings.date_index_path
+)
+
+if settings.font_paths:
+    from rendering.fonts import configure_fonts
+    configure_fonts(settings.font_paths)
+
+# Отрисовка изображений и PDF выполняется в пуле, а не в цикле событий
+render_executor = configure_executor(settings.render_executor, settings.render_workers)
+
+report_generator = ReportGenerator(
+    image_cache=ImageCache(
+        maxsize=settings.image_cache_size,
+        directory=settings.image_cache_dir,
+        disk_max_bytes=settings.image_cache_disk_max_mb * 1024 * 1024
+    ),
+    executor=render_executor
+)
+
+# Фоновая генерация PDF в отдельном пуле, чтобы долгие сборки не занимали
+# пул изображений
+pdf_jobs = PDFJobQueue(
+    executor=RenderExecutor(settings.render_executor, settings.pdf_workers),
+    max_pending=settings.pdf_queue_size,
+    cache_size=settings.pdf_cache_size
+)
 
 # Инициализация БД при старте
 @app.on_event("startup")
 async def startup_event():
     init_db()
+    # Индекс поиска дат загружается (или строится, ~150 мс) в потоке, а не
+    # в первом запросе к /api/dates/search
+    await asyncio.get_running_loop().run_in_executor(None, calculator.load_date_index)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    render_executor.shutdown()
+    pdf_jobs.shutdown()
 
 
 # Модели запросов
 class MatrixRequest(BaseModel):
-    name: str
+    name: str = Field(max_length=MAX_NAME_LENGTH)
     birth_date: date
     gender: Optional[str] = None
 
 
 class ClientCreate(BaseModel):
-    name: str
+    name: str = Field(max_length=MAX_NAME_LENGTH)
     birth_date: date
     gender: Optional[str] = None
     phone: Optional[str] = None
@@ -45,6 +91,19 @@ class ClientCreate(BaseModel):
     notes: Optional[str] = None
 
 
+def _wants_interpretations(expand: Optional[str]) -> bool:
+    """Запрошены ли полные тексты интерпретаций (?expand=interpretations)"""
+    return bool(expand) and 'interpretations' in expand.split(',')
+
+
+def serialize_result(result: MatrixRecord, expand: Optional[str] = None) -> dict:
+    """Сериализует результат; тексты интерпретаций добавляются только по запросу"""
+    data = result.to_dict()
+    if _wants_interpretations(expand):
+        data['interpretations'] = result.interpretation_texts()
+    return data
+
+
 # API endpoints
 @app.get("/")
 async def root():
@@ -57,7 +116,7 @@ async def root():
 
 
 @app.post("/api/calculate")
-async def calculate_matrix(request: MatrixRequest):
+async def calculate_matrix(request: MatrixRequest, expand: Optional[str] = None):
     """Расчет матрицы судьбы"""
     try:
         matrix_data = MatrixData(
@@ -66,18 +125,18 @@ async def calculate_matrix(request: MatrixRequest):
             gender=request.gender
         )
         
-        result = calculator.calculate_matrix(matrix_data)
+        result = calculator.calculate_record(matrix_data)
         
         return {
             "success": True,
-            "data": result.model_dump()
+            "data": serialize_result(result, expand)
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/api/calculate/report")
-async def calculate_matrix_report(request: MatrixRequest):
+async def calculate_matrix_report(request: MatrixRequest, expand: Optional[str] = None):
     """Расчет матрицы с текстовым отчетом"""
     try:
         matrix_data = MatrixData(
@@ -86,25 +145,89 @@ async def calculate_matrix_report(request: MatrixRequest):
             gender=request.gender
         )
         
-        result = calculator.calculate_matrix(matrix_data)
-        report = report_generator.generate_text_report(matrix_data, result)
+        record = calculator.calculate_record(matrix_data)
+        report = report_generator.generate_text_report(matrix_data, record.to_model())
         
         return {
             "success": True,
             "report": report,
-            "data": result.model_dump()
+            "data": serialize_result(record, expand)
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/reports/pdf", status_code=202)
+async def create_pdf_report(request: MatrixRequest):
+    """Ставит генерацию PDF отчета в очередь и возвращает идентификатор задачи
+    
+    Готовый отчет скачивается через GET /api/reports/pdf/{job_id}; при
+    заполненной очереди возвращается 429.
+    """
+    try:
+        matrix_data = MatrixData(
+            birth_date=request.birth_date,
+            name=request.name,
+            gender=request.gender
+        )
+        result = calculator.calculate_record(matrix_data).to_model()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        job = pdf_jobs.submit(matrix_data, result)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    
+    return {
+        "success": True,
+        "data": {
+            **job.to_dict(),
+            "url": f"/api/reports/pdf/{job.id}"
+        }
+    }
+
+
+@app.get("/api/reports/pdf/{job_id}")
+async def get_pdf_report(job_id: str):
+    """Статус задачи PDF; для готовой задачи - сам PDF"""
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status == DONE:
+        return StreamingResponse(
+            io.BytesIO(job.pdf),
+            media_type="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=matrix_report.pdf"}
+        )
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    return JSONResponse(
+        status_code=202,
+        content={"success": True, "data": job.to_dict()},
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.get("/api/calculate/visual")
 async def calculate_matrix_visual(
     name: str,
     birth_date: date,
-    gender: Optional[str] = None
+    gender: Optional[str] = None,
+    format: str = "png"
 ):
-    """Расчет матрицы с визуализацией"""
+    """Расчет матрицы с визуализацией
+    
+    format: png (палитра, по умолчанию), webp (без потерь), jpeg или
+    svg - векторный вариант без растеризации на сервере
+    """
+    if format not in MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(MEDIA_TYPES)}"
+        )
+    
     try:
         matrix_data = MatrixData(
             birth_date=birth_date,
@@ -113,17 +236,136 @@ async def calculate_matrix_visual(
         )
         
         result = calculator.calculate_matrix(matrix_data)
-        visual = report_generator.generate_visual_matrix(result)
+        visual = await report_generator.generate_visual_matrix_async(result, format)
         
         return StreamingResponse(
             io.BytesIO(visual),
-            media_type="image/png",
-            headers={"Content-Disposition": "attachment; filename=matrix.png"}
+            media_type=MEDIA_TYPES[format],
+            headers={"Content-Disposition": f"attachment; filename=matrix.{format}"}
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+FORECAST_FORMATS = ('json', 'binary')
+
+
+@app.get("/api/forecast")
+async def get_forecast(
+    birth_date: date,
+    start: Optional[date] = None,
+    days: int = 365,
+    format: str = "json"
+):
+    """Ежедневный прогноз (личный год, месяц, день) на диапазон дат
+    
+    format=binary возвращает три массива по байту на день подряд:
+    личный год, личный месяц, личный день.
+    """
+    if format not in FORECAST_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(FORECAST_FORMATS)}"
+        )
+    if not 1 <= days <= 36600:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 36600")
+    start = start or date.today()
+    # Последний день прогноза (start + days - 1) должен быть представим как date
+    if (date.max - start).days < days - 1:
+        raise HTTPException(status_code=400, detail=f"forecast must end by {date.max}")
+    
+    # NumPy загружается только при первом обращении к прогнозу
+    from matrix_calculator.forecast import forecast
+    
+    series = forecast(birth_date, start, days)
+    
+    if format == "binary":
+        return Response(
+            content=series.to_bytes(),
+            media_type="application/octet-stream",
+            headers={"X-Forecast-Start": series.start.isoformat(), "X-Forecast-Days": str(days)}
+        )
+    
+    return {
+        "success": True,
+        "data": series.to_dict()
+    }
+
+
+def _parse_cells(cells: str) -> List[int]:
+    """'1,2,3,4,5,6' -> значения ячеек, зависящих только от даты (DATE_CELLS)"""
+    # Индекс дат (и NumPy) загружается только при поиске
+    from matrix_calculator.date_index import DATE_CELLS
+    
+    try:
+        values = [int(value) for value in cells.split(',')]
+    except ValueError:
+        values = []
+    if len(values) != len(DATE_CELLS) or not all(0 <= value <= 22 for value in values):
+        raise HTTPException(
+            status_code=400,
+            detail=f"cells must be {len(DATE_CELLS)} comma-separated numbers 0-22 "
+                   f"({', '.join(DATE_CELLS)})"
+        )
+    return values
+
+
+@app.get("/api/dates/search")
+async def search_dates(
+    cells: Optional[str] = None,
+    destiny_number: Optional[int] = None,
+    personal_number: Optional[int] = None,
+    life_path: Optional[int] = None,
+    year_reduced: Optional[int] = None,
+    day_reduced: Optional[int] = None,
+    month_reduced: Optional[int] = None,
+    karmic: List[int] = Query(default=[]),
+    limit: int = 100
+):
+    """Поиск дат рождения (1900–2100) по числам матрицы и кармическим числам
+    
+    cells - значения шести ячеек, зависящих от даты, через запятую:
+    top_left, top_center, top_right, middle_left, center, bottom_right.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    
+    try:
+        count, days = calculator.search_birth_dates(
+            limit=limit,
+            cells=_parse_cells(cells) if cells is not None else None,
+            destiny_number=destiny_number,
+            personal_number=personal_number,
+            life_path=life_path,
+            year_reduced=year_reduced,
+            day_reduced=day_reduced,
+            month_reduced=month_reduced,
+            karmic=karmic
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "success": True,
+        "count": count,
+        "data": [str(day) for day in days]
+    }
+
+
+@app.get("/api/stats/cache")
+async def cache_stats():
+    """Счетчики кэшей расчетов и изображений, очередь пула отрисовки"""
+    return {
+        "success": True,
+        "data": {
+            **calculator.cache_stats(),
+            'image': report_generator.image_cache.stats(),
+            'render_executor': render_executor.stats(),
+            'pdf_jobs': pdf_jobs.stats()
+        }
+    }
+
+
 @app.post("/api/clients")
 async def create_client(client: ClientCreate, db: Session = Depends(get_db)):
     """Создание нового клиента"""
@@ -199,9 +441,85 @@ async def get_client(client_id: int, db: Session = Depends(get_db)):
     }
 
 
+# Индекс совместимости клиентской базы. Строится при первом запросе и
+# пополняется клиентами с id больше последнего учтенного: клиенты не
+# изменяются и не удаляются, а так учитываются и клиенты, созданные ботом
+_client_index = None
+_client_index_last_id = 0
+_client_index_lock = threading.Lock()
+
+
+def refresh_client_index(db: Session):
+    """Индекс совместимости, пополненный новыми клиентами из БД"""
+    global _client_index, _client_index_last_id
+    from matrix_calculator.compatibility import CompatibilityIndex
+    
+    with _client_index_lock:
+        if _client_index is None:
+            _client_index = CompatibilityIndex()
+        rows = (
+            db.query(Client.id, Client.name, Client.birth_date)
+            .filter(Client.id > _client_index_last_id)
+            .order_by(Client.id)
+            .all()
+        )
+        if rows:
+            batch = calculator.calculate_batch(
+                [row.birth_date for row in rows],
+                [row.name for row in rows]
+            )
+            _client_index.append(batch.matrix, ids=[row.id for row in rows])
+            _client_index_last_id = rows[-1].id
+        return _client_index
+
+
+@app.get("/api/clients/{client_id}/compatible")
+def get_compatible_clients(
+    client_id: int,
+    limit: int = 10,
+    db: Session = Depends(get_db)
+):
+    """Поиск наиболее совместимых клиентов по матрице судьбы
+    
+    Обычная функция: FastAPI выполняет ее в пуле потоков, и построение
+    индекса при первом запросе не блокирует цикл событий.
+    """
+    client = db.query(Client).filter(Client.id == client_id).first()
+    
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    try:
+        from matrix_calculator.compatibility import pack_matrix
+        
+        index = refresh_client_index(db)
+        result = calculator.calculate_record(MatrixData(
+            birth_date=client.birth_date,
+            name=client.name
+        ))
+        matches = index.top_k(pack_matrix(result.matrix), limit, exclude_id=client.id)
+        names = dict(
+            db.query(Client.id, Client.name)
+            .filter(Client.id.in_([match_id for match_id, _ in matches]))
+            .all()
+        )
+        
+        return {
+            "success": True,
+            "count": len(matches),
+            "data": [
+                {"client_id": match_id, "name": names[match_id], "score": score}
+                for match_id, score in matches
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/api/clients/{client_id}/calculate")
 async def calculate_for_client(
     client_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Расчет матрицы для существующего клиента"""
@@ -217,12 +535,12 @@ async def calculate_for_client(
             gender=client.gender
         )
         
-        result = calculator.calculate_matrix(matrix_data)
+        result = calculator.calculate_record(matrix_data)
         
         # Сохраняем расчет
         calculation = MatrixCalculation(
             client_id=client.id,
-            result_data=result.model_dump()
+            result_data=result.to_dict()
         )
         db.add(calculation)
         db.commit()
@@ -231,31 +549,43 @@ async def calculate_for_client(
         return {
             "success": True,
             "calculation_id": calculation.id,
-            "data": result.model_dump()
+            "data": serialize_result(result, expand)
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/api/clients/{client_id}/calculations")
-async def get_client_calculations(client_id: int, db: Session = Depends(get_db)):
+async def get_client_calculations(
+    client_id: int,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """Получение всех расчетов клиента"""
     client = db.query(Client).filter(Client.id == client_id).first()
     
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
+    results = []
+    for calc in client.calculations:
+        result_data = calc.result_data
+        # Старые расчеты уже содержат тексты в поле interpretations
+        if _wants_interpretations(expand) and 'interpretation_keys' in result_data:
+            result_data = {
+                **result_data,
+                'interpretations': resolve_interpretations(result_data['interpretation_keys'])
+            }
+        results.append({
+            "id": calc.id,
+            "created_at": str(calc.created_at),
+            "result": result_data
+        })
+    
     return {
         "success": True,
-        "count": len(client.calculations),
-        "data": [
-            {
-                "id": calc.id,
-                "created_at": str(calc.created_at),
-                "result": calc.result_data
-            }
-            for calc in client.calculations
-        ]
+        "count": len(results),
+        "data": results
     }
 
 
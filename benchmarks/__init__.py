@@ -0,0 +1,10 @@
+"""Воспроизводимые замеры производительности
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_batch
+    python -m benchmarks.bench_forecast
+    python -m benchmarks.bench_records
+    python -m benchmarks.bench_pdf
+    python -m benchmarks.bench_text_report
+    python -m benchmarks.bench_formats
+"""
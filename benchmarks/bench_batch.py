@@ -0,0 +1,61 @@
+"""Пакетный расчет calculate_batch против цикла calculate_matrix
+
+По умолчанию 1M строк (даты - объекты date, имена на кириллице); скалярный
+цикл замеряется на части строк и пересчитывается на полный объем.
+Первые строки пакета сверяются с результатами скалярного расчета.
+
+    python -m benchmarks.bench_batch [--rows 1000000] [--scalar-rows 50000]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from matrix_calculator import MatrixCalculator, MatrixData
+
+NAMES = ('Иван Петров', 'Анна', 'Мария-Луиза Ёлкина', 'Олег', 'Екатерина Щукина')
+
+
+def make_rows(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    start = date(1930, 1, 1)
+    birth_dates = [start + timedelta(days=rng.randrange(30000)) for _ in range(count)]
+    names = [rng.choice(NAMES) for _ in range(count)]
+    return birth_dates, names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--scalar-rows', type=int, default=50_000)
+    parser.add_argument('--check-rows', type=int, default=20_000)
+    args = parser.parse_args()
+
+    calculator = MatrixCalculator()
+    birth_dates, names = make_rows(args.rows)
+
+    started = time.perf_counter()
+    batch = calculator.calculate_batch(birth_dates, names)
+    batch_seconds = time.perf_counter() - started
+
+    scalar_rows = min(args.scalar_rows, args.rows)
+    started = time.perf_counter()
+    scalar = [
+        calculator.calculate_matrix(MatrixData(birth_date=birth_date, name=name))
+        for birth_date, name in zip(birth_dates[:scalar_rows], names[:scalar_rows])
+    ]
+    scalar_seconds = (time.perf_counter() - started) * args.rows / scalar_rows
+
+    for index, expected in enumerate(scalar[:args.check_rows]):
+        assert batch.to_result(index).model_dump() == expected.model_dump(), index
+
+    print(f"rows:              {args.rows}")
+    print(f"calculate_batch:   {batch_seconds:.2f} s")
+    print(f"calculate_matrix:  {scalar_seconds:.2f} s "
+          f"(по {scalar_rows} строкам, пересчитано на {args.rows})")
+    print(f"ускорение:         {scalar_seconds / batch_seconds:.1f}x")
+    print(f"сверено строк:     {min(args.check_rows, scalar_rows)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Векторный прогноз forecast_batch против скалярного reduce_number
+
+По умолчанию 1k клиентов на 10 лет (3650 дней). Скалярный расчет по тем
+же формулам замеряется на части клиентов, пересчитывается на полный
+объем и сверяется с векторным результатом.
+
+    python -m benchmarks.bench_forecast [--clients 1000] [--days 3650]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from matrix_calculator.forecast import forecast_batch
+from matrix_calculator.numerology import reduce_number
+
+
+def scalar_forecast(birth_date: date, start: date, days: int):
+    """Личный год, месяц и день по формулам модуля forecast, по одному дню"""
+    personal_year, personal_month, personal_day = [], [], []
+    for offset in range(days):
+        current = start + timedelta(days=offset)
+        year = reduce_number(birth_date.day + birth_date.month + reduce_number(current.year))
+        month = reduce_number(year + current.month)
+        personal_year.append(year)
+        personal_month.append(month)
+        personal_day.append(reduce_number(month + current.day))
+    return personal_year, personal_month, personal_day
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=3650)
+    parser.add_argument('--scalar-clients', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    birth_dates = [date(1940, 1, 1) + timedelta(days=rng.randrange(25000))
+                   for _ in range(args.clients)]
+    start = date(2026, 1, 1)
+
+    started = time.perf_counter()
+    series = forecast_batch(birth_dates, start, args.days)
+    batch_seconds = time.perf_counter() - started
+
+    scalar_clients = min(args.scalar_clients, args.clients)
+    started = time.perf_counter()
+    scalar = [scalar_forecast(birth_date, start, args.days)
+              for birth_date in birth_dates[:scalar_clients]]
+    scalar_seconds = (time.perf_counter() - started) * args.clients / scalar_clients
+
+    for index, (year, month, day) in enumerate(scalar):
+        assert np.array_equal(series['personal_year'][index], year), index
+        assert np.array_equal(series['personal_month'][index], month), index
+        assert np.array_equal(series['personal_day'][index], day), index
+
+    size = sum(values.nbytes for values in series.values())
+    print(f"клиенты x дни:   {args.clients} x {args.days}")
+    print(f"forecast_batch:  {batch_seconds * 1000:.0f} ms ({size / 1024:.0f} КБ)")
+    print(f"reduce_number:   {scalar_seconds:.2f} s "
+          f"(по {scalar_clients} клиентам, пересчитано на {args.clients})")
+    print(f"ускорение:       {scalar_seconds / batch_seconds:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Изображение матрицы: время кодирования и размер по форматам
+
+Для сравнения первой строкой идет RGB PNG с настройками PIL по умолчанию -
+так изображение кодировалось до палитры. SVG собирается из шаблона.
+
+    python -m benchmarks.bench_formats [--number 30]
+"""
+import argparse
+import io
+import random
+import time
+
+from reports.compositor import IMAGE_FORMATS, get_compositor
+from reports.layout import CELL_COORDS
+from reports.svg import render_svg
+
+
+def make_matrices(count: int = 10, seed: int = 3):
+    rng = random.Random(seed)
+    return [
+        {position: rng.randint(1, 22) for position in CELL_COORDS}
+        for _ in range(count)
+    ]
+
+
+def measure(encode, matrices, number: int):
+    """(мс на изображение, средний размер в байтах)"""
+    sizes = [len(encode(matrix)) for matrix in matrices]
+    started = time.perf_counter()
+    for index in range(number):
+        encode(matrices[index % len(matrices)])
+    elapsed = (time.perf_counter() - started) / number
+    return elapsed * 1000, sum(sizes) / len(sizes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=30)
+    args = parser.parse_args()
+
+    compositor = get_compositor()
+    matrices = make_matrices()
+
+    def rgb_png(matrix):
+        buffer = io.BytesIO()
+        compositor.render(matrix).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    encoders = [('png (rgb, по умолчанию)', rgb_png)]
+    encoders += [
+        (image_format, lambda matrix, f=image_format: compositor.encode(matrix, f))
+        for image_format in IMAGE_FORMATS
+    ]
+    encoders.append(('svg', lambda matrix: render_svg(matrix).encode('utf-8')))
+
+    for name, encode in encoders:
+        milliseconds, size = measure(encode, matrices, args.number)
+        print(f"{name:24} {milliseconds:7.2f} ms {size:9.0f} B")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Сборка PDF: общий генератор с кэшем абзацев против нового на каждый отчет
+
+Новый PDFGenerator на каждый документ заново строит стили и разбирает
+разметку абзацев - так PDF собирались до кэширования. Байты документов
+сверяются (rl_config.invariant отключает дату создания и случайный ID).
+
+    python -m benchmarks.bench_pdf [--number 200] [--threads 4]
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+from reportlab import rl_config
+
+from matrix_calculator import MatrixCalculator, MatrixData
+from reports.pdf_generator import PDFGenerator, get_pdf_generator
+
+NAMES = ('Иван', 'Анна', 'Петр Сидоров', 'Мария')
+
+
+def make_cases(count: int = 40, seed: int = 5):
+    rng = random.Random(seed)
+    calculator = MatrixCalculator()
+    cases = []
+    for _ in range(count):
+        data = MatrixData(
+            birth_date=date(1950, 1, 1) + timedelta(days=rng.randrange(25000)),
+            name=rng.choice(NAMES),
+            gender=rng.choice((None, 'male', 'female'))
+        )
+        cases.append((data, calculator.calculate_matrix(data)))
+    return cases
+
+
+def rate(build, cases, number: int) -> float:
+    started = time.perf_counter()
+    for index in range(number):
+        build(*cases[index % len(cases)])
+    return number / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    rl_config.invariant = 1
+    cases = make_cases()
+    shared = get_pdf_generator()
+
+    def fresh(data, result):
+        return PDFGenerator().generate_pdf(data, result)
+
+    for data, result in cases:
+        assert shared.generate_pdf(data, result) == fresh(data, result), data
+
+    # Общий генератор из нескольких потоков дает те же байты
+    expected = {id(case): fresh(*case) for case in cases}
+    errors = []
+
+    def worker(offset: int) -> None:
+        for index in range(len(cases)):
+            case = cases[(index + offset) % len(cases)]
+            if shared.generate_pdf(*case) != expected[id(case)]:
+                errors.append(case[0])
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+    print(f"сверено документов:     {len(cases)} (и {args.threads} потока)")
+    print(f"новый генератор:        {rate(fresh, cases, args.number):.1f} PDF/s")
+    print(f"общий генератор:        {rate(shared.generate_pdf, cases, args.number):.1f} PDF/s")
+
+
+if __name__ == '__main__':
+    main()
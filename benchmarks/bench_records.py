@@ -0,0 +1,49 @@
+"""Построение и сериализация результата: MatrixRecord против MatrixResult
+
+Замеряется один расчет без кэша результатов (record + to_dict против
+модели Pydantic + model_dump) и попадание в кэш калькулятора.
+
+    python -m benchmarks.bench_records [--number 50000]
+"""
+import argparse
+import timeit
+from datetime import date
+
+from matrix_calculator import MatrixCalculator, MatrixData
+
+NAME = 'Иван Петров'
+BIRTH_DATE = date(1987, 11, 29)
+
+
+def per_call_us(fn, number: int) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=50_000)
+    args = parser.parse_args()
+
+    calculator = MatrixCalculator()
+    data = MatrixData(birth_date=BIRTH_DATE, name=NAME)
+    name_key = calculator.name_engine.normalize(NAME)
+    record = calculator._calculate(name_key, BIRTH_DATE)
+    assert record.to_dict() == record.to_model().model_dump()
+
+    cached = MatrixCalculator(cache_size=100)
+    cached.calculate_record(data).to_model()
+
+    results = {
+        'MatrixRecord': lambda: calculator._calculate(name_key, BIRTH_DATE),
+        'MatrixRecord + to_dict': lambda: calculator._calculate(name_key, BIRTH_DATE).to_dict(),
+        'MatrixResult + model_dump': lambda: calculator._calculate(name_key, BIRTH_DATE)
+        .to_model().model_dump(),
+        'кэш: to_dict': lambda: cached.calculate_record(data).to_dict(),
+        'кэш: model_dump': lambda: cached.calculate_matrix(data).model_dump(),
+    }
+    for label, fn in results.items():
+        print(f"{label:28s} {per_call_us(fn, args.number):6.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Текстовый отчет: скорость сборки и пиковая память на один отчет
+
+Первый проход идет с пустыми кэшами превью и разделов, дальше отчеты
+собираются из уже разобранных кусков. Пик памяти снимается tracemalloc
+на одном прогретом отчете.
+
+    python -m benchmarks.bench_text_report [--number 500] [--repeat 4]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from matrix_calculator import MatrixCalculator, MatrixData
+from reports import text_report
+from reports.generator import ReportGenerator
+
+NAMES = ('Иван', 'Анна Петрова', 'Jo {x}', 'Мария-Луиза')
+EXTRA = {'summary': 'резюме ' * 100, 'detailed_info': '\nподробно\n'}
+
+
+def make_cases(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    calculator = MatrixCalculator()
+    cases = []
+    for _ in range(count):
+        data = MatrixData(
+            birth_date=date(1920, 1, 1) + timedelta(days=rng.randrange(40000)),
+            name=rng.choice(NAMES),
+            gender=rng.choice((None, 'male'))
+        )
+        cases.append((data, calculator.calculate_matrix(data)))
+    return cases
+
+
+def rate(generator: ReportGenerator, cases, additional_info=None) -> float:
+    started = time.perf_counter()
+    for data, result in cases:
+        generator.generate_text_report(data, result, additional_info)
+    return len(cases) / (time.perf_counter() - started)
+
+
+def peak(generator: ReportGenerator, case) -> int:
+    generator.generate_text_report(*case)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    generator.generate_text_report(*case)
+    result = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=4)
+    args = parser.parse_args()
+
+    cases = make_cases(args.number)
+    generator = ReportGenerator(enable_web_scraping=False)
+
+    text_report._previews.clear()
+    text_report._sections.clear()
+    cold = rate(generator, cases)
+    warm = max(rate(generator, cases) for _ in range(args.repeat))
+    extra = max(rate(generator, cases, EXTRA) for _ in range(args.repeat))
+    length = len(generator.generate_text_report(*cases[0]))
+
+    print(f"отчетов:                {len(cases)} (~{length} символов)")
+    print(f"пустые кэши:            {cold:.0f} reports/s")
+    print(f"прогретые кэши:         {warm:.0f} reports/s")
+    print(f"с доп. информацией:     {extra:.0f} reports/s")
+    print(f"пик памяти на отчет:    {peak(generator, cases[0]) / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,8 @@ from database.database import get_db_sync, init_db
 from database.models import Client, MatrixCalculation, Feedback
 from matrix_calculator import MatrixCalculator, MatrixData
 from reports import ReportGenerator
+from reports.image_cache import ImageCache
+from rendering.executor import configure_executor
 from bot.admin_panel import (
     admin_panel, admin_clients, admin_stats, admin_recent, admin_settings, admin_check
 )
@@ -29,8 +31,28 @@ logger = logging.getLogger(__name__)
 WAITING_NAME, WAITING_DATE, WAITING_GENDER, WAITING_FEEDBACK = range(4)
 
 # Инициализация
-calculator = MatrixCalculator()
-report_generator = ReportGenerator()
+calculator = MatrixCalculator(
+    cache_size=settings.matrix_cache_size,
+    cache_ttl=settings.matrix_cache_ttl,
+    date_cache_size=settings.matrix_date_cache_size,
+    name_cache_size=settings.matrix_name_cache_size
+)
+
+if settings.font_paths:
+    from rendering.fonts import configure_fonts
+    configure_fonts(settings.font_paths)
+
+# Отрисовка изображений выполняется в пуле, обработчики не блокируют цикл событий
+render_executor = configure_executor(settings.render_executor, settings.render_workers)
+
+report_generator = ReportGenerator(
+    image_cache=ImageCache(
+        maxsize=settings.image_cache_size,
+        directory=settings.image_cache_dir,
+        disk_max_bytes=settings.image_cache_disk_max_mb * 1024 * 1024
+    ),
+    executor=render_executor
+)
 
 
 def create_progress_indicator(current: int, total: int) -> str:
@@ -576,7 +598,7 @@ async def calculate_matrix(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         # Генерируем расширенный отчет с информацией с сайтов
         enhanced_report = await report_generator.generate_enhanced_report(matrix_data, result)
-        text_report = enhanced_report['text_report']
+        report_messages = enhanced_report['telegram_messages']
         visual_matrix = enhanced_report['visual_matrix']
         additional_images = enhanced_report.get('additional_images', [])
         
@@ -615,20 +637,9 @@ async def calculate_matrix(update: Update, context: ContextTypes.DEFAULT_TYPE):
             except Exception as e:
                 logger.error(f"Ошибка при отправке дополнительного изображения: {e}")
         
-        # Отправляем текстовый отчет частями
-        max_length = 4000
-        if len(text_report) > max_length:
-            parts = [text_report[i:i+max_length] for i in range(0, len(text_report), max_length)]
-            for i, part in enumerate(parts, 1):
-                await message.reply_text(
-                    f"<pre>{part}</pre>",
-                    parse_mode=ParseMode.HTML
-                )
-        else:
-            await message.reply_text(
-                f"<pre>{text_report}</pre>",
-                parse_mode=ParseMode.HTML
-            )
+        # Отправляем текстовый отчет: сообщения уже разбиты по разделам и экранированы
+        for report_message in report_messages:
+            await message.reply_text(report_message, parse_mode=ParseMode.HTML)
         
         # Кнопки для дополнительных действий
         keyboard = [
@@ -887,7 +898,10 @@ def main():
     
     # Запуск бота
     logger.info("Бот запущен...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    try:
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
+    finally:
+        render_executor.shutdown()
 
 
 if __name__ == '__main__':
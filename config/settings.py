@@ -1,6 +1,6 @@
 """Конфигурация приложения"""
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
 
@@ -23,6 +23,33 @@ class Settings(BaseSettings):
     # Application
     debug: bool = False
     
+    # Кэш результатов расчета матрицы
+    matrix_cache_size: int = 10000
+    matrix_cache_ttl: Optional[float] = None  # секунды, None - без ограничения
+    matrix_date_cache_size: int = 20000
+    matrix_name_cache_size: int = 20000
+    
+    # Кэш изображений матрицы: число в памяти, каталог на диске (None - без диска)
+    image_cache_size: int = 1024
+    image_cache_dir: Optional[str] = None
+    image_cache_disk_max_mb: int = 512
+    
+    # Пул отрисовки (PIL, PDF): 'thread' или 'process', размер (0 - по числу ядер, до 8)
+    render_executor: str = "thread"
+    render_workers: int = 0
+    
+    # Фоновая генерация PDF: свой пул, предел очереди (дальше - 429), кэш готовых PDF
+    pdf_workers: int = 2
+    pdf_queue_size: int = 32
+    pdf_cache_size: int = 256
+    
+    # Дополнительные шрифты (пути к .ttf/.ttc), проверяются перед системными
+    # и встроенным DejaVu Sans Bold
+    font_paths: List[str] = []
+    
+    # Файл обратного индекса дат (None - строится в памяти при запуске API)
+    date_index_path: Optional[str] = None
+    
     @property
     def is_railway(self) -> bool:
         """Проверяет, запущено ли на Railway"""
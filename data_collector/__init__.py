@@ -1,14 +1,24 @@
 """Модуль для сбора и обработки данных с веб-сайтов"""
-from .web_scraper import WebScraper
-from .text_processor import TextProcessor
-from .image_processor import ImageProcessor
-from .config import MATRIX_SOURCES, MATRIX_KEYWORDS, PROCESSING_CONFIG
-
-__all__ = [
-    'WebScraper', 
-    'TextProcessor', 
-    'ImageProcessor', 
-    'MATRIX_SOURCES',
-    'MATRIX_KEYWORDS',
-    'PROCESSING_CONFIG'
-]
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .web_scraper import WebScraper
+    from .text_processor import TextProcessor
+    from .image_processor import ImageProcessor
+    from .config import MATRIX_SOURCES, MATRIX_KEYWORDS, PROCESSING_CONFIG
+
+# Имя -> подмодуль; aiohttp, BeautifulSoup и PIL загружаются при первом обращении
+_EXPORTS = {
+    'WebScraper': '.web_scraper',
+    'TextProcessor': '.text_processor',
+    'ImageProcessor': '.image_processor',
+    'MATRIX_SOURCES': '.config',
+    'MATRIX_KEYWORDS': '.config',
+    'PROCESSING_CONFIG': '.config',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,21 +1,25 @@
 """Модуль для обработки и генерации изображений"""
 import aiohttp
 import aiofiles
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from typing import List, Optional, Tuple
 import io
 import logging
-import os
 from urllib.parse import urlparse
 
+from rendering.executor import RenderExecutor, get_executor
+from rendering.fonts import get_font
+
 logger = logging.getLogger(__name__)
 
 
 class ImageProcessor:
     """Класс для обработки и генерации изображений"""
     
-    def __init__(self):
+    def __init__(self, executor: Optional[RenderExecutor] = None):
         self.session: Optional[aiohttp.ClientSession] = None
+        # Пул для PIL-операций асинхронных методов (None - общий пул)
+        self.executor = executor
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
@@ -46,7 +50,23 @@ class ImageProcessor:
             logger.error(f"Ошибка при скачивании изображения {url}: {e}")
             return None
     
-    def resize_image(self, image_bytes: bytes, max_size: Tuple[int, int] = (800, 600)) -> Optional[bytes]:
+    def _get_executor(self) -> RenderExecutor:
+        return self.executor if self.executor is not None else get_executor()
+    
+    async def resize_image_async(self, image_bytes: bytes,
+                                 max_size: Tuple[int, int] = (800, 600)) -> Optional[bytes]:
+        """resize_image в пуле отрисовки"""
+        return await self._get_executor().run(ImageProcessor.resize_image, image_bytes, max_size)
+    
+    async def create_info_image_async(self, title: str, text: str,
+                                      width: int = 800, height: int = 600) -> bytes:
+        """create_info_image в пуле отрисовки"""
+        return await self._get_executor().run(ImageProcessor.create_info_image,
+                                              title, text, width, height)
+    
+    # Статические методы, чтобы передаваться в пул процессов без сессии aiohttp
+    @staticmethod
+    def resize_image(image_bytes: bytes, max_size: Tuple[int, int] = (800, 600)) -> Optional[bytes]:
         """Изменяет размер изображения"""
         try:
             img = Image.open(io.BytesIO(image_bytes))
@@ -68,35 +88,17 @@ class ImageProcessor:
             logger.error(f"Ошибка при изменении размера изображения: {e}")
             return None
     
-    def create_info_image(self, title: str, text: str, width: int = 800, height: int = 600) -> bytes:
+    @staticmethod
+    def create_info_image(title: str, text: str, width: int = 800, height: int = 600) -> bytes:
         """Создает информационное изображение с текстом"""
         try:
             # Создаем изображение
             img = Image.new('RGB', (width, height), color='white')
             draw = ImageDraw.Draw(img)
             
-            # Пытаемся найти шрифт
-            font_large = None
-            font_small = None
-            
-            font_paths = [
-                "/System/Library/Fonts/Helvetica.ttc",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                "C:/Windows/Fonts/arial.ttf",
-            ]
-            
-            for path in font_paths:
-                try:
-                    if os.path.exists(path):
-                        font_large = ImageFont.truetype(path, 32)
-                        font_small = ImageFont.truetype(path, 18)
-                        break
-                except:
-                    continue
-            
-            if font_large is None:
-                font_large = ImageFont.load_default()
-                font_small = ImageFont.load_default()
+            # Шрифты из общего реестра процесса
+            font_large = get_font(32)
+            font_small = get_font(18)
             
             # Рисуем заголовок
             y_position = 30
@@ -149,7 +151,7 @@ class ImageProcessor:
                 image_bytes = await self.download_image(url)
                 if image_bytes:
                     # Изменяем размер
-                    resized = self.resize_image(image_bytes)
+                    resized = await self.resize_image_async(image_bytes)
                     if resized:
                         processed_images.append(resized)
             except Exception as e:
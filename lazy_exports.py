@@ -0,0 +1,30 @@
+"""Ленивый экспорт имен пакета (PEP 562)
+
+Пакет отдает имена из подмодулей, не импортируя их заранее: тяжелые
+зависимости (PIL, reportlab, NumPy, aiohttp) загружаются при первом
+обращении. Модуль ничего не импортирует сам, чтобы им могли
+пользоваться все пакеты проекта.
+"""
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """Возвращает (__getattr__, __dir__) для пакета package
+
+    exports: имя -> относительный путь подмодуля ('.models'). Загруженное
+    имя сохраняется в пакете, следующие обращения идут мимо __getattr__.
+    """
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
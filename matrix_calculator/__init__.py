@@ -1,5 +1,20 @@
 """Модуль расчета личной матрицы судьбы"""
-from .calculator import MatrixCalculator
-from .models import MatrixData, MatrixResult
+from typing import TYPE_CHECKING
 
-__all__ = ['MatrixCalculator', 'MatrixData', 'MatrixResult']
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .calculator import MatrixCalculator
+    from .models import MatrixData, MatrixRecord, MatrixResult
+
+# Имя -> подмодуль; модули загружаются при первом обращении
+_EXPORTS = {
+    'MatrixCalculator': '.calculator',
+    'MatrixData': '.models',
+    'MatrixRecord': '.models',
+    'MatrixResult': '.models',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,243 @@
+"""Пакетный (векторизованный) расчет матриц на NumPy
+
+Используется для массового пересчета клиентской базы: все числа матрицы
+считаются сразу для всех строк в виде колонок NumPy, а объекты
+MatrixResult создаются только по запросу.
+"""
+from datetime import date
+from typing import Iterator, Sequence, Union
+
+import numpy as np
+
+from .calculator import MatrixCalculator
+from . import karmic
+from .models import MATRIX_POSITIONS, MatrixResult
+from .name_engine import FIELD_BITS, NameEngine
+from .numerology import REDUCE_TABLE_SIZE, REDUCED
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_REDUCED = np.array(REDUCED, dtype=np.int64)
+_VALUE_MASKS = np.array(karmic.VALUE_MASKS, dtype=np.uint8)
+_CHAIN_MASKS = np.array(karmic.CHAIN_MASKS, dtype=np.uint8)
+
+
+def _digit_sum(values: np.ndarray) -> np.ndarray:
+    """Сумма цифр для каждого элемента массива"""
+    values = values.copy()
+    total = np.zeros_like(values)
+    while values.any():
+        total += values % 10
+        values //= 10
+    return total
+
+
+def reduce_array(values: np.ndarray) -> np.ndarray:
+    """Векторизованный аналог reduce_number (мастер-числа 11, 22 не редуцируются)"""
+    values = np.asarray(values, dtype=np.int64).copy()
+    large = values >= REDUCE_TABLE_SIZE
+    while large.any():
+        values[large] = _digit_sum(values[large])
+        large = values >= REDUCE_TABLE_SIZE
+    negative = values < 0
+    reduced = _REDUCED[np.where(negative, 0, values)]
+    return np.where(negative, values, reduced)
+
+
+def karmic_mask_array(*columns: np.ndarray) -> np.ndarray:
+    """Битовая маска кармических чисел, встречающихся в колонках"""
+    mask = np.zeros(len(columns[0]), dtype=np.uint8)
+    for column in columns:
+        # Все кармические числа меньше размера таблицы: большие дают маску 0
+        mask |= _VALUE_MASKS[np.clip(column, 0, REDUCE_TABLE_SIZE - 1)]
+    return mask
+
+
+def chain_mask_array(values: np.ndarray) -> np.ndarray:
+    """Векторизованный аналог karmic.chain_mask для неотрицательных сумм"""
+    values = np.asarray(values, dtype=np.int64).copy()
+    large = values >= REDUCE_TABLE_SIZE
+    while large.any():
+        values[large] = _digit_sum(values[large])
+        large = values >= REDUCE_TABLE_SIZE
+    return _CHAIN_MASKS[values]
+
+
+def _pack_chains(masks: dict) -> np.ndarray:
+    """Упаковывает колонки масок позиций так же, как karmic.pack_positions"""
+    packed = np.zeros(len(next(iter(masks.values()))), dtype=np.uint64)
+    for position, mask in masks.items():
+        packed |= mask.astype(np.uint64) << np.uint64(karmic.POSITION_SHIFTS[position])
+    return packed
+
+
+def _build_lookup(engine: NameEngine) -> np.ndarray:
+    """Упакованные значения NameEngine в виде массива, индексируемого кодом символа"""
+    # Последний элемент таблицы всегда 0 - для символов вне алфавита
+    lookup = np.zeros(max(map(ord, engine.packed)) + 2, dtype=np.uint64)
+    for letter, packed in engine.packed.items():
+        lookup[ord(letter)] = packed
+    return lookup
+
+
+def _name_sums(names: Sequence[str], engine: NameEngine, lookup: np.ndarray):
+    """Суммы гласных, согласных и всех букв каждого имени за один проход"""
+    lengths = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    # surrogatepass: одиночный суррогат (например, из \ud800 в JSON) - просто
+    # символ вне алфавита
+    codes = np.frombuffer(''.join(names).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+    values = lookup[np.minimum(codes, len(lookup) - 1)]
+    # Переполнение uint64 в накопленной сумме безопасно: разность по модулю 2**64
+    # точна, а сумма имени не длиннее engine.packed_length помещается в поля
+    cumulative = np.concatenate((np.zeros(1, dtype=np.uint64), np.cumsum(values)))
+    packed = cumulative[ends] - cumulative[starts]
+
+    field_mask = np.uint64((1 << FIELD_BITS) - 1)
+    vowels = (packed & field_mask).astype(np.int64)
+    consonants = ((packed >> np.uint64(FIELD_BITS)) & field_mask).astype(np.int64)
+    others = (packed >> np.uint64(2 * FIELD_BITS)).astype(np.int64)
+    expression = vowels + consonants + others
+
+    # Более длинные имена считаются по полям отдельно
+    for index in np.flatnonzero(lengths > engine.packed_length).tolist():
+        vowels[index], consonants[index], expression[index] = engine.score(names[index])
+    return vowels, consonants, expression
+
+
+def _to_datetime64(birth_dates) -> np.ndarray:
+    """Приводит даты к datetime64[D] без поэлементного разбора NumPy"""
+    if isinstance(birth_dates, np.ndarray):
+        return birth_dates.astype('datetime64[D]')
+    birth_dates = list(birth_dates)
+    if birth_dates and isinstance(birth_dates[0], date):
+        ordinals = np.fromiter(map(date.toordinal, birth_dates), dtype=np.int64,
+                               count=len(birth_dates))
+        return (ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+    return np.asarray(birth_dates, dtype='datetime64[D]')
+
+
+class BatchResult:
+    """Колоночный результат пакетного расчета
+
+    Каждое поле MatrixResult хранится как массив NumPy длины N;
+    matrix - массив (N, 9) в порядке MATRIX_POSITIONS.
+    """
+
+    def __init__(self, calculator: MatrixCalculator, columns: dict):
+        self._calculator = calculator
+        self.day = columns['day']
+        self.month = columns['month']
+        self.year = columns['year']
+        self.year_reduced = columns['year_reduced']
+        self.personal_number = columns['personal_number']
+        self.destiny_number = columns['destiny_number']
+        self.soul_number = columns['soul_number']
+        self.personality_number = columns['personality_number']
+        self.life_path = columns['life_path']
+        self.expression = columns['expression']
+        self.matrix = columns['matrix']
+        self.karmic_mask = columns['karmic_mask']
+        self.karmic_chains = columns['karmic_chains']
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def to_result(self, index: int) -> MatrixResult:
+        """Строит MatrixResult для одной строки"""
+        matrix = dict(zip(MATRIX_POSITIONS, self.matrix[index].tolist()))
+        personal = int(self.personal_number[index])
+        destiny = int(self.destiny_number[index])
+        soul = int(self.soul_number[index])
+        personality = int(self.personality_number[index])
+        life_path = int(self.life_path[index])
+        expression = int(self.expression[index])
+
+        return MatrixResult(
+            day=int(self.day[index]),
+            month=int(self.month[index]),
+            year=int(self.year[index]),
+            year_reduced=int(self.year_reduced[index]),
+            personal_number=personal,
+            destiny_number=destiny,
+            soul_number=soul,
+            personality_number=personality,
+            matrix=matrix,
+            karmic_numbers=list(karmic.KARMIC_BY_MASK[self.karmic_mask[index]]),
+            karmic_analysis=karmic.analysis(int(self.karmic_chains[index])),
+            life_path=life_path,
+            expression=expression,
+            interpretation_keys=self._calculator._get_interpretations(
+                personal, destiny, soul, personality, life_path, expression, matrix
+            )
+        )
+
+    def to_results(self) -> Iterator[MatrixResult]:
+        """Лениво преобразует все строки в MatrixResult"""
+        for index in range(len(self)):
+            yield self.to_result(index)
+
+
+def calculate_batch(calculator: MatrixCalculator,
+                    birth_dates: Union[Sequence, np.ndarray],
+                    names: Sequence[str]) -> BatchResult:
+    """Рассчитывает матрицы для массивов дат рождения и имен"""
+
+    dates = _to_datetime64(birth_dates)
+    if len(dates) != len(names):
+        raise ValueError("birth_dates и names должны быть одной длины")
+
+    # Базовые числа
+    year = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    month_start = dates.astype('datetime64[M]')
+    month = month_start.astype(np.int64) % 12 + 1
+    day = (dates - month_start).astype(np.int64) + 1
+    year_reduced = reduce_array(year)
+
+    personal_sum = day + month
+    destiny_sum = _digit_sum(day) + _digit_sum(month) + _digit_sum(year)
+    life_path_sum = personal_sum + year_reduced
+    personal = reduce_array(personal_sum)
+    destiny = reduce_array(destiny_sum)
+    life_path = reduce_array(life_path_sum)
+
+    # Числа имени
+    soul_sum, personality_sum, expression_sum = _name_sums(
+        names, calculator.name_engine, _build_lookup(calculator.name_engine)
+    )
+    soul = reduce_array(soul_sum)
+    personality = reduce_array(personality_sum)
+    expression = reduce_array(expression_sum)
+
+    matrix = np.stack([
+        reduce_array(day), reduce_array(month), year_reduced,
+        personal, destiny, expression,
+        soul, personality, life_path,
+    ], axis=1).astype(np.uint8)
+
+    return BatchResult(calculator, {
+        'day': day.astype(np.uint8),
+        'month': month.astype(np.uint8),
+        'year': year.astype(np.int32),
+        'year_reduced': year_reduced.astype(np.uint8),
+        'personal_number': personal.astype(np.uint8),
+        'destiny_number': destiny.astype(np.uint8),
+        'soul_number': soul.astype(np.uint8),
+        'personality_number': personality.astype(np.uint8),
+        'life_path': life_path.astype(np.uint8),
+        'expression': expression.astype(np.uint8),
+        'matrix': matrix,
+        'karmic_mask': karmic_mask_array(day, month, year, personal, destiny),
+        'karmic_chains': _pack_chains({
+            'top_left': chain_mask_array(day),
+            'top_center': chain_mask_array(month),
+            'top_right': chain_mask_array(year),
+            'middle_left': chain_mask_array(personal_sum),
+            'center': chain_mask_array(destiny_sum),
+            'middle_right': chain_mask_array(expression_sum),
+            'bottom_left': chain_mask_array(soul_sum),
+            'bottom_center': chain_mask_array(personality_sum),
+            'bottom_right': chain_mask_array(life_path_sum),
+        }),
+    })
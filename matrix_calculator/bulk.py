@@ -0,0 +1,259 @@
+"""Массовый расчет матриц из CSV/NDJSON
+
+Строки читаются потоком, разбиваются на блоки и считаются в пуле
+процессов векторизованным calculate_batch. Результаты пишутся в порядке
+входных строк; в памяти одновременно находится ограниченное число блоков.
+Некорректные строки (дата, JSON, не объект) не прерывают обработку: они
+выводятся с колонкой error. Для NDJSON на входе и CSV на выходе колонки
+исходных данных берутся из ключей первого объекта.
+
+Пример:
+    python -m matrix_calculator.bulk clients.csv results.ndjson --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .karmic import KARMIC_BY_MASK, analysis
+from .models import MATRIX_POSITIONS, MAX_NAME_LENGTH
+
+RESULT_COLUMNS = (
+    'day', 'month', 'year', 'year_reduced',
+    'personal_number', 'destiny_number', 'soul_number', 'personality_number',
+    'life_path', 'expression',
+) + tuple(f'matrix_{position}' for position in MATRIX_POSITIONS) + (
+    'karmic_numbers', 'karmic_analysis', 'error',
+)
+
+_calculator = None
+
+
+def _init_worker(latin: str) -> None:
+    """Создает калькулятор один раз на процесс"""
+    global _calculator
+    from .calculator import MatrixCalculator
+    _calculator = MatrixCalculator(latin=latin)
+
+
+def _calculate_chunk(names: List[str], birth_dates: List[str]) -> List[Dict]:
+    """Считает блок строк; строки с некорректной датой или именем получают error"""
+    results: List[Dict] = [{} for _ in names]
+    valid = []
+    for index, value in enumerate(birth_dates):
+        if len(names[index]) > MAX_NAME_LENGTH:
+            results[index] = {'error': f'name longer than {MAX_NAME_LENGTH} characters'}
+            continue
+        try:
+            valid.append((index, date.fromisoformat(value.strip())))
+        except (AttributeError, ValueError):
+            results[index] = {'error': f'invalid birth_date: {value!r}'}
+
+    if valid:
+        batch = _calculator.calculate_batch(
+            [birth_date for _, birth_date in valid],
+            [names[index] for index, _ in valid]
+        )
+        columns = {
+            'day': batch.day.tolist(),
+            'month': batch.month.tolist(),
+            'year': batch.year.tolist(),
+            'year_reduced': batch.year_reduced.tolist(),
+            'personal_number': batch.personal_number.tolist(),
+            'destiny_number': batch.destiny_number.tolist(),
+            'soul_number': batch.soul_number.tolist(),
+            'personality_number': batch.personality_number.tolist(),
+            'life_path': batch.life_path.tolist(),
+            'expression': batch.expression.tolist(),
+        }
+        for position, cells in zip(MATRIX_POSITIONS, batch.matrix.T.tolist()):
+            columns[f'matrix_{position}'] = cells
+        karmic = [list(KARMIC_BY_MASK[mask]) for mask in batch.karmic_mask.tolist()]
+        chains = batch.karmic_chains.tolist()
+
+        for row, (index, _) in enumerate(valid):
+            result = {column: values[row] for column, values in columns.items()}
+            result['karmic_numbers'] = karmic[row]
+            result['karmic_analysis'] = analysis(chains[row])
+            results[index] = result
+    return results
+
+
+# Строка входа и ошибка ее разбора (None - строка корректна)
+Row = Tuple[Dict, Optional[str]]
+
+
+def _ndjson_rows(stream: TextIO) -> Iterator[Row]:
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield {}, f'invalid JSON on line {number}: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield {}, f'line {number}: expected a JSON object, got {type(row).__name__}'
+            continue
+        yield row, None
+
+
+def _read_rows(stream: TextIO, input_format: str) -> Tuple[List[str], Iterator[Row]]:
+    """Возвращает имена входных колонок и поток строк
+
+    Для NDJSON колонки - ключи первого корректного объекта.
+    """
+    if input_format == 'csv':
+        reader = csv.DictReader(stream)
+        return list(reader.fieldnames or []), ((row, None) for row in reader)
+
+    rows = _ndjson_rows(stream)
+    head: List[Row] = []
+    for item in rows:
+        head.append(item)
+        if item[1] is None:
+            break
+    columns = list(head[-1][0]) if head and head[-1][1] is None else []
+    return columns, chain(head, rows)
+
+
+def _chunks(rows: Iterator[Row], size: int) -> Iterator[List[Row]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Writer:
+    """Запись результатов в CSV или NDJSON"""
+
+    def __init__(self, stream: TextIO, output_format: str, input_columns: List[str]):
+        self.stream = stream
+        self.output_format = output_format
+        self.csv_writer = None
+        if output_format == 'csv':
+            columns = input_columns + [c for c in RESULT_COLUMNS if c not in input_columns]
+            self.csv_writer = csv.DictWriter(stream, fieldnames=columns, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, row: Dict, result: Dict) -> None:
+        merged = {**row, **result}
+        if self.csv_writer is not None:
+            if 'karmic_numbers' in merged:
+                merged['karmic_numbers'] = ' '.join(map(str, merged['karmic_numbers']))
+            if 'karmic_analysis' in merged:
+                # Формат: позиция:числа через запятую, позиции через пробел
+                merged['karmic_analysis'] = ' '.join(
+                    f"{position}:{','.join(map(str, numbers))}"
+                    for position, numbers in merged['karmic_analysis'].items()
+                )
+            self.csv_writer.writerow(merged)
+        else:
+            self.stream.write(json.dumps(merged, ensure_ascii=False, default=str))
+            self.stream.write('\n')
+
+
+def _detect_format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    return 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+
+def run(input_stream: TextIO, output_stream: TextIO, input_format: str = 'csv',
+        output_format: str = 'csv', name_column: str = 'name',
+        date_column: str = 'birth_date', workers: Optional[int] = None,
+        chunk_size: int = 10000, latin: str = 'pythagorean',
+        progress: Optional[TextIO] = sys.stderr) -> int:
+    """Обрабатывает входной поток и возвращает число строк"""
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    input_columns, rows = _read_rows(input_stream, input_format)
+    writer = _Writer(output_stream, output_format, input_columns)
+
+    total = 0
+    started = time.perf_counter()
+    last_report = started
+
+    def drain(pending: deque) -> None:
+        nonlocal total, last_report
+        chunk, future = pending.popleft()
+        for (row, error), result in zip(chunk, future.result()):
+            writer.write(row, {'error': error} if error is not None else result)
+        total += len(chunk)
+        now = time.perf_counter()
+        if progress is not None and now - last_report >= 5:
+            last_report = now
+            progress.write(f"{total} строк, {total / (now - started):.0f} строк/с\n")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(latin,)) as executor:
+        pending: deque = deque()
+        for chunk in _chunks(rows, chunk_size):
+            names = [str(row.get(name_column) or '') for row, _ in chunk]
+            birth_dates = [row.get(date_column) for row, _ in chunk]
+            pending.append((chunk, executor.submit(_calculate_chunk, names, birth_dates)))
+            # Ограничиваем число блоков в памяти
+            while len(pending) >= max_pending:
+                drain(pending)
+        while pending:
+            drain(pending)
+
+    output_stream.flush()
+    if progress is not None:
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0.0
+        progress.write(f"Готово: {total} строк за {elapsed:.1f} с ({rate:.0f} строк/с)\n")
+    return total
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m matrix_calculator.bulk',
+        description='Массовый расчет матриц судьбы из CSV/NDJSON'
+    )
+    parser.add_argument('input', help="Входной файл ('-' - stdin)")
+    parser.add_argument('output', help="Выходной файл ('-' - stdout)")
+    parser.add_argument('--input-format', choices=('csv', 'ndjson'))
+    parser.add_argument('--output-format', choices=('csv', 'ndjson'))
+    parser.add_argument('--name-column', default='name')
+    parser.add_argument('--date-column', default='birth_date')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Число процессов (по умолчанию - все ядра)')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--latin', default='pythagorean',
+                        help="Таблица латиницы: pythagorean, cyrillic, none")
+    args = parser.parse_args(argv)
+
+    input_format = _detect_format(args.input, args.input_format)
+    output_format = _detect_format(args.output, args.output_format)
+
+    # Одиночные суррогаты из экранирования JSON (\ud800) не кодируются в UTF-8:
+    # пишем их как \ud800, в NDJSON это то же значение
+    if args.output == '-':
+        sys.stdout.reconfigure(errors='backslashreplace')
+    input_stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', newline='')
+    output_stream = sys.stdout if args.output == '-' else open(
+        args.output, 'w', encoding='utf-8', errors='backslashreplace', newline=''
+    )
+    try:
+        run(input_stream, output_stream, input_format, output_format,
+            name_column=args.name_column, date_column=args.date_column,
+            workers=args.workers, chunk_size=args.chunk_size, latin=args.latin)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,125 +1,175 @@
 """Калькулятор личной матрицы судьбы"""
 from datetime import date
-from typing import Dict, List
-from .models import MatrixData, MatrixResult
-from .interpretations import get_interpretation
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .models import MatrixData, MatrixRecord, MatrixResult
+from .interpretations import interpretation_key
+from .date_table import DateNumbers, get_date_numbers
+from .name_engine import LetterTable, NameEngine
+from .cache import LRUCache
+from . import karmic, numerology
 
 
 class MatrixCalculator:
     """Класс для расчета личной матрицы судьбы"""
     
     # Кармические числа
-    KARMIC_NUMBERS = [13, 14, 16, 19]
+    KARMIC_NUMBERS = list(numerology.KARMIC_NUMBERS)
     
-    def __init__(self):
-        self.interpretations = get_interpretation()
+    def __init__(self, latin: Union[str, LetterTable] = 'pythagorean',
+                 cache_size: int = 0, cache_ttl: Optional[float] = None,
+                 date_cache_size: int = 0, name_cache_size: int = 0,
+                 date_index_path: Optional[str] = None):
+        """
+        Args:
+            latin: Способ подсчета латинских имен - 'pythagorean',
+                'cyrillic' (транслитерация), 'none' или своя таблица
+            cache_size: Размер кэша результатов (0 - без кэша)
+            cache_ttl: Время жизни результата в кэше, секунды
+            date_cache_size: Размер кэша чисел даты
+            name_cache_size: Размер кэша чисел имени
+            date_index_path: Файл обратного индекса дат (см. find_birth_dates)
+        """
+        self.name_engine = NameEngine(latin)
+        # Результат не зависит от пола, поэтому ключ - только имя и дата
+        self.cache = LRUCache(cache_size, cache_ttl)
+        # Половины расчета кэшируются независимо: новое написание имени
+        # при известной дате пересчитывает только числа имени
+        self.date_cache = LRUCache(date_cache_size)
+        self.name_cache = LRUCache(name_cache_size)
+        self.date_index_path = date_index_path
     
     def reduce_number(self, number: int) -> int:
         """Редуцирует число до однозначного (кроме мастер-чисел 11, 22)"""
-        while number > 9 and number not in [11, 22]:
-            number = sum(int(digit) for digit in str(number))
-        return number
+        return numerology.reduce_number(number)
     
     def calculate_name_numbers(self, name: str) -> Dict[str, int]:
-        """Вычисляет числа имени"""
-        # Русский алфавит с нумерологическими значениями
-        # А=1, Б=2, В=6, Г=3, Д=4, Е=5, Ё=5, Ж=2, З=7, И=1, Й=1, К=2, Л=3, М=4, Н=5, О=7, П=8, Р=2, С=3, Т=4, У=6, Ф=8, Х=5, Ц=3, Ч=7, Ш=2, Щ=9, Ъ=1, Ы=1, Ь=1, Э=6, Ю=7, Я=2
-        
-        # Упрощенная версия - используем стандартную нумерологию
-        name_upper = name.upper().replace(' ', '')
-        
-        # Гласные: А, Е, Ё, И, О, У, Ы, Э, Ю, Я
-        vowels = 'АЕЁИОУЫЭЮЯ'
-        # Согласные: все остальные
-        consonants = 'БВГДЖЗЙКЛМНПРСТФХЦЧШЩ'
-        
-        soul_sum = sum(self._char_to_number(char) for char in name_upper if char in vowels)
-        personality_sum = sum(self._char_to_number(char) for char in name_upper if char in consonants)
-        
+        """Вычисляет числа имени (душа, личность, выражение) за один проход"""
+        soul, personality, expression, _ = self._name_numbers(self.name_engine.normalize(name))
         return {
-            'soul': self.reduce_number(soul_sum),
-            'personality': self.reduce_number(personality_sum)
+            'soul': soul,
+            'personality': personality,
+            'expression': expression
         }
     
-    def _char_to_number(self, char: str) -> int:
-        """Преобразует символ в число по нумерологии"""
-        # Русская нумерология
-        mapping = {
-            'А': 1, 'Б': 2, 'В': 6, 'Г': 3, 'Д': 4, 'Е': 5, 'Ё': 5, 'Ж': 2, 'З': 7,
-            'И': 1, 'Й': 1, 'К': 2, 'Л': 3, 'М': 4, 'Н': 5, 'О': 7, 'П': 8, 'Р': 2,
-            'С': 3, 'Т': 4, 'У': 6, 'Ф': 8, 'Х': 5, 'Ц': 3, 'Ч': 7, 'Ш': 2, 'Щ': 9,
-            'Ъ': 1, 'Ы': 1, 'Ь': 1, 'Э': 6, 'Ю': 7, 'Я': 2
-        }
-        return mapping.get(char, 0)
-    
     def calculate_matrix(self, data: MatrixData) -> MatrixResult:
-        """Основной метод расчета матрицы"""
-        birth_date = data.birth_date
-        
-        # Базовые числа
-        day = birth_date.day
-        month = birth_date.month
-        year = birth_date.year
-        year_reduced = self.reduce_number(year)
+        """Основной метод расчета матрицы (с кэшированием одинаковых входных данных)
         
-        # Личное число (день + месяц)
-        personal_number = self.reduce_number(day + month)
-        
-        # Число судьбы (сумма всех цифр даты)
-        date_sum = sum(int(d) for d in str(day) + str(month) + str(year))
-        destiny_number = self.reduce_number(date_sum)
+        Возвращаемый результат может быть общим для нескольких вызовов
+        и не должен изменяться.
+        """
+        return self.calculate_record(data).to_model()
+    
+    def calculate_record(self, data: MatrixData) -> MatrixRecord:
+        """Расчет без построения модели Pydantic - для JSON-ответов и внутренних нужд
+        
+        Запись кэшируется и может быть общей для нескольких вызовов.
+        """
+        name_key = self.name_engine.normalize(data.name)
+        return self.cache.get_or_compute(
+            (name_key, data.birth_date),
+            lambda: self._calculate(name_key, data.birth_date)
+        )
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Счетчики кэшей (результаты, числа даты, числа имени) для мониторинга"""
+        return {
+            'result': self.cache.stats(),
+            'date': self.date_cache.stats(),
+            'name': self.name_cache.stats()
+        }
+    
+    def _date_numbers(self, birth_date: date) -> DateNumbers:
+        """Числа даты из кэша или предрассчитанной таблицы"""
+        return self.date_cache.get_or_compute(birth_date, lambda: get_date_numbers(birth_date))
+    
+    def _name_numbers(self, name_key: str) -> Tuple[int, int, int, int]:
+        """Редуцированные (душа, личность, выражение) и кармические маски имени"""
+        def compute():
+            sums = self.name_engine.score(name_key)
+            return (
+                self.reduce_number(sums.soul),
+                self.reduce_number(sums.personality),
+                self.reduce_number(sums.expression),
+                karmic.name_chains(sums.soul, sums.personality, sums.expression)
+            )
+        return self.name_cache.get_or_compute(name_key, compute)
+    
+    def _calculate(self, name_key: str, birth_date: date) -> MatrixRecord:
+        """Расчет матрицы из независимо кэшируемых половин: даты и имени"""
+        # Числа даты (день, месяц, год, личное число, число судьбы,
+        # путь жизни, кармические числа) берутся из предрассчитанной таблицы
+        dates = self._date_numbers(birth_date)
+        personal_number = dates.personal_number
+        destiny_number = dates.destiny_number
+        life_path = dates.life_path
         
         # Числа имени
-        name_numbers = self.calculate_name_numbers(data.name)
-        soul_number = name_numbers['soul']
-        personality_number = name_numbers['personality']
-        
-        # Путь жизни (сумма дня, месяца, года)
-        life_path = self.reduce_number(day + month + year_reduced)
-        
-        # Выражение (сумма всех чисел имени)
-        name_sum = sum(self._char_to_number(char) for char in data.name.upper().replace(' ', ''))
-        expression = self.reduce_number(name_sum)
+        soul_number, personality_number, expression, name_chains = self._name_numbers(name_key)
         
         # Построение матрицы 3x3
-        matrix = self._build_matrix(
-            day, month, year_reduced, 
-            personal_number, destiny_number,
-            soul_number, personality_number,
-            life_path, expression
-        )
-        
-        # Кармические числа
-        karmic_numbers = self._find_karmic_numbers(
-            day, month, year, personal_number, destiny_number
-        )
+        matrix = self._build_matrix(dates, soul_number, personality_number, expression)
         
-        # Интерпретации
-        interpretations = self._get_interpretations(
+        # Ключи интерпретаций
+        interpretation_keys = self._get_interpretations(
             personal_number, destiny_number, soul_number,
             personality_number, life_path, expression, matrix
         )
         
-        return MatrixResult(
-            day=day,
-            month=month,
-            year=year,
-            year_reduced=year_reduced,
+        # Все поля рассчитаны здесь же, поэтому валидация Pydantic не нужна
+        return MatrixRecord(
+            day=dates.day,
+            month=dates.month,
+            year=dates.year,
+            year_reduced=dates.year_reduced,
             personal_number=personal_number,
             destiny_number=destiny_number,
             soul_number=soul_number,
             personality_number=personality_number,
             matrix=matrix,
-            karmic_numbers=karmic_numbers,
+            karmic_numbers=dates.karmic_numbers,
+            karmic_analysis=karmic.analysis(dates.karmic_chains | name_chains),
             life_path=life_path,
             expression=expression,
-            interpretations=interpretations
+            interpretation_keys=interpretation_keys
         )
     
-    def _build_matrix(self, day: int, month: int, year_reduced: int,
-                     personal: int, destiny: int,
-                     soul: int, personality: int,
-                     life_path: int, expression: int) -> Dict[str, int]:
+    def calculate_batch(self, birth_dates, names):
+        """Векторизованный расчет матриц для массивов дат и имен (NumPy)
+        
+        Возвращает колоночный BatchResult; MatrixResult создаются
+        только по запросу через to_result()/to_results().
+        """
+        from .batch import calculate_batch
+        return calculate_batch(self, birth_dates, names)
+    
+    def find_birth_dates(self, limit: Optional[int] = None, **conditions) -> List[date]:
+        """Даты рождения (1900–2100) с заданными числами матрицы
+        
+        Пример: find_birth_dates(destiny_number=22, karmic=[13])
+        Условия - см. DateIndex.query: cells, karmic, year_reduced,
+        day_reduced, month_reduced, personal_number, destiny_number, life_path.
+        """
+        from .date_index import get_date_index
+        return get_date_index(self.date_index_path).find_dates(limit=limit, **conditions)
+    
+    def load_date_index(self) -> None:
+        """Загружает (или строит) индекс дат заранее, чтобы первый поиск не ждал"""
+        from .date_index import get_date_index
+        get_date_index(self.date_index_path)
+    
+    def search_birth_dates(self, limit: Optional[int] = None,
+                           **conditions) -> Tuple[int, List[date]]:
+        """Число подходящих дат и первые limit из них (условия - как в find_birth_dates)
+        
+        В даты переводятся только возвращаемые смещения, а не все совпадения.
+        """
+        from .date_index import get_date_index
+        index = get_date_index(self.date_index_path)
+        days = index.query(**conditions)
+        return len(days), index.to_dates(days[:limit])
+    
+    def _build_matrix(self, dates: DateNumbers,
+                     soul: int, personality: int, expression: int) -> Dict[str, int]:
         """Строит матрицу 3x3"""
         # Матрица судьбы: квадрат с диагоналями
         # Верхний ряд: день, месяц, год
@@ -127,39 +177,27 @@ class MatrixCalculator:
         # Нижний ряд: душа, личность, путь жизни
         
         return {
-            'top_left': self.reduce_number(day),
-            'top_center': self.reduce_number(month),
-            'top_right': self.reduce_number(year_reduced),
-            'middle_left': personal,
-            'center': destiny,
+            'top_left': dates.day_reduced,
+            'top_center': dates.month_reduced,
+            'top_right': dates.year_reduced,
+            'middle_left': dates.personal_number,
+            'center': dates.destiny_number,
             'middle_right': expression,
             'bottom_left': soul,
             'bottom_center': personality,
-            'bottom_right': life_path
+            'bottom_right': dates.life_path
         }
     
-    def _find_karmic_numbers(self, day: int, month: int, year: int,
-                            personal: int, destiny: int) -> List[int]:
-        """Находит кармические числа в расчетах"""
-        found = []
-        numbers_to_check = [day, month, year, personal, destiny]
-        
-        for num in numbers_to_check:
-            if num in self.KARMIC_NUMBERS:
-                found.append(num)
-        
-        return list(set(found))
-    
     def _get_interpretations(self, personal: int, destiny: int, soul: int,
                            personality: int, life_path: int, expression: int,
                            matrix: Dict[str, int]) -> Dict[str, str]:
-        """Получает интерпретации для всех чисел"""
+        """Получает ключи интерпретаций для всех чисел"""
         return {
-            'personal_number': self.interpretations.get(f'number_{personal}', ''),
-            'destiny_number': self.interpretations.get(f'number_{destiny}', ''),
-            'soul_number': self.interpretations.get(f'number_{soul}', ''),
-            'personality_number': self.interpretations.get(f'number_{personality}', ''),
-            'life_path': self.interpretations.get(f'number_{life_path}', ''),
-            'expression': self.interpretations.get(f'number_{expression}', ''),
-            'matrix_center': self.interpretations.get(f'number_{matrix["center"]}', ''),
+            'personal_number': interpretation_key(personal),
+            'destiny_number': interpretation_key(destiny),
+            'soul_number': interpretation_key(soul),
+            'personality_number': interpretation_key(personality),
+            'life_path': interpretation_key(life_path),
+            'expression': interpretation_key(expression),
+            'matrix_center': interpretation_key(matrix["center"]),
         }
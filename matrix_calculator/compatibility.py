@@ -0,0 +1,147 @@
+"""Совместимость матриц судьбы
+
+Матрица клиента упаковывается в 9 небольших целых чисел (порядок
+MATRIX_POSITIONS). Индекс хранит матрицы поколоночно, поэтому оценка
+одного клиента против всех остальных - девять векторных выборок
+из таблицы очков и сумма.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import MATRIX_POSITIONS, MatrixResult
+from .numerology import REDUCED
+
+# Значения ячеек: 0-9, 11, 22
+_MAX_CELL = 22
+
+# Вес позиции: центр (число судьбы) важнее остальных
+CELL_WEIGHTS = (1, 1, 1, 1, 2, 1, 1, 1, 1)
+
+# Очки за пару значений: совпадение - 2, общий корень (11 и 2, 22 и 4) - 1
+MATCH_POINTS = 2
+ROOT_POINTS = 1
+
+# Корни мастер-чисел
+_MASTER_ROOTS = {11: 2, 22: 4}
+
+
+def _pair_scores() -> np.ndarray:
+    roots = [_MASTER_ROOTS.get(value, REDUCED[value]) for value in range(_MAX_CELL + 1)]
+    scores = np.zeros((_MAX_CELL + 1, _MAX_CELL + 1), dtype=np.uint16)
+    for a in range(_MAX_CELL + 1):
+        for b in range(_MAX_CELL + 1):
+            if a == b:
+                scores[a, b] = MATCH_POINTS
+            elif roots[a] == roots[b]:
+                scores[a, b] = ROOT_POINTS
+    return scores
+
+
+PAIR_SCORES = _pair_scores()
+MAX_SCORE = MATCH_POINTS * sum(CELL_WEIGHTS)
+
+
+def pack_matrix(matrix: Dict[str, int]) -> np.ndarray:
+    """Упаковывает матрицу MatrixResult.matrix в массив из 9 чисел"""
+    return np.array([matrix[position] for position in MATRIX_POSITIONS], dtype=np.uint8)
+
+
+def pack_matrices(results: Iterable[MatrixResult]) -> np.ndarray:
+    """Упаковывает набор результатов в массив (N, 9)"""
+    rows = [[result.matrix[position] for position in MATRIX_POSITIONS] for result in results]
+    return np.array(rows, dtype=np.uint8).reshape(-1, len(MATRIX_POSITIONS))
+
+
+class CompatibilityIndex:
+    """Упакованные матрицы клиентов для векторной оценки совместимости
+
+    Индекс можно пополнять (append) без перестройки: строки дописываются
+    в буфер с запасом. Читатели берут согласованный снимок (колонки, id),
+    поэтому оценка может идти параллельно с пополнением из одного потока.
+    """
+
+    def __init__(self, matrices: Optional[np.ndarray] = None, ids: Optional[Sequence[int]] = None):
+        """
+        Args:
+            matrices: Массив (N, 9) упакованных матриц (см. pack_matrices
+                или BatchResult.matrix); None - пустой индекс
+            ids: Идентификаторы клиентов (по умолчанию - номера строк)
+        """
+        self._columns = np.zeros((len(MATRIX_POSITIONS), 0), dtype=np.uint8)
+        self._ids = np.zeros(0, dtype=np.int64)
+        # (колонки, id) длины N - заменяется целиком при пополнении
+        self._view: Tuple[np.ndarray, np.ndarray] = (self._columns, self._ids)
+        if matrices is not None:
+            self.append(matrices, ids)
+
+    @property
+    def columns(self) -> np.ndarray:
+        return self._view[0]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._view[1]
+
+    def __len__(self) -> int:
+        return len(self._view[1])
+
+    def append(self, matrices: np.ndarray, ids: Optional[Sequence[int]] = None) -> None:
+        """Добавляет матрицы в конец индекса"""
+        matrices = np.asarray(matrices, dtype=np.uint8)
+        if matrices.ndim != 2 or matrices.shape[1] != len(MATRIX_POSITIONS):
+            raise ValueError("matrices должен иметь форму (N, 9)")
+        size = len(self)
+        new_size = size + len(matrices)
+        if ids is None:
+            ids = np.arange(size, new_size)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(matrices):
+            raise ValueError("matrices и ids должны быть одной длины")
+
+        if new_size > self._columns.shape[1]:
+            # Запас вдвое: пополнение по одному клиенту - амортизированно O(1)
+            capacity = max(new_size, 2 * self._columns.shape[1])
+            columns = np.zeros((len(MATRIX_POSITIONS), capacity), dtype=np.uint8)
+            columns[:, :size] = self._columns[:, :size]
+            all_ids = np.zeros(capacity, dtype=np.int64)
+            all_ids[:size] = self._ids[:size]
+            self._columns, self._ids = columns, all_ids
+        # Поколоночное хранение: каждая выборка идет по непрерывной памяти.
+        # Новые строки пишутся за пределами текущего снимка
+        self._columns[:, size:new_size] = matrices.T
+        self._ids[size:new_size] = ids
+        self._view = (self._columns[:, :new_size], self._ids[:new_size])
+
+    @staticmethod
+    def _scores(columns: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        total = np.zeros(columns.shape[1], dtype=np.uint16)
+        for position, (value, weight) in enumerate(zip(matrix.tolist(), CELL_WEIGHTS)):
+            total += (PAIR_SCORES[value] * weight)[columns[position]]
+        return (total * 100 // MAX_SCORE).astype(np.uint8)
+
+    def scores(self, matrix: np.ndarray) -> np.ndarray:
+        """Совместимость матрицы со всеми клиентами индекса, в процентах"""
+        return self._scores(self.columns, matrix)
+
+    def top_k(self, matrix: np.ndarray, k: int = 10,
+              exclude_id: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Лучшие k совпадений: [(id, процент)], по убыванию, при равенстве - по порядку"""
+        columns, ids = self._view
+        scores = self._scores(columns, matrix).astype(np.int16)
+        if exclude_id is not None:
+            scores[ids == exclude_id] = -1
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        # Порог - k-й по величине результат; при равенстве берем первые по порядку
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+        candidates = np.concatenate((above, tied))
+        # Детерминированный порядок: очки по убыванию, затем позиция в индексе
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [
+            (ids[i].item(), int(scores[i]))
+            for i in order if scores[i] >= 0
+        ]
@@ -0,0 +1,180 @@
+"""Обратный индекс: числа матрицы -> даты рождения
+
+Для каждого поля, зависящего только от даты (см. date_table), хранится
+отображение значение -> отсортированный массив дней (смещений от
+TABLE_START) в формате CSR: keys, offsets, days. Запрос пересекает
+массивы, начиная с самого короткого.
+"""
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .date_table import TABLE_START, get_date_table
+from .numerology import KARMIC_NUMBERS
+
+# Поля индекса и соответствующие колонки таблицы дат
+FIELDS = {
+    'year_reduced': 'year_reduced',
+    'day_reduced': 'day_reduced',
+    'month_reduced': 'month_reduced',
+    'personal_number': 'personal',
+    'destiny_number': 'destiny',
+    'life_path': 'life_path',
+}
+
+# Ячейки матрицы, зависящие только от даты
+DATE_CELLS = ('top_left', 'top_center', 'top_right', 'middle_left', 'center', 'bottom_right')
+_CELL_BASE = 23
+
+
+def encode_cells(cells: Sequence[int]) -> int:
+    """Кодирует кортеж ячеек DATE_CELLS в одно число"""
+    key = 0
+    for value in cells:
+        key = key * _CELL_BASE + value
+    return key
+
+
+class _Postings:
+    """Списки дней по значениям одного поля (CSR)"""
+
+    def __init__(self, keys: np.ndarray, offsets: np.ndarray, days: np.ndarray):
+        self.keys = keys
+        self.offsets = offsets
+        self.days = days
+
+    @classmethod
+    def from_column(cls, values: np.ndarray) -> '_Postings':
+        order = np.argsort(values, kind='stable').astype(np.uint32)
+        keys, starts = np.unique(values[order], return_index=True)
+        offsets = np.append(starts, len(values)).astype(np.uint32)
+        return cls(keys, offsets, order)
+
+    def get(self, key: int) -> np.ndarray:
+        position = np.searchsorted(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            return self.days[:0]
+        return self.days[self.offsets[position]:self.offsets[position + 1]]
+
+
+class DateIndex:
+    """Обратный индекс по датам диапазона TABLE_START–TABLE_END"""
+
+    def __init__(self, postings: Dict[str, _Postings]):
+        self._postings = postings
+
+    @classmethod
+    def build(cls) -> 'DateIndex':
+        """Строит индекс по предрассчитанной таблице дат"""
+        table = get_date_table()
+        columns = {
+            field: np.frombuffer(getattr(table, column), dtype=np.uint8)
+            for field, column in FIELDS.items()
+        }
+        postings = {field: _Postings.from_column(values) for field, values in columns.items()}
+
+        cells = np.zeros(len(columns['destiny_number']), dtype=np.int64)
+        for field in ('day_reduced', 'month_reduced', 'year_reduced',
+                      'personal_number', 'destiny_number', 'life_path'):
+            cells = cells * _CELL_BASE + columns[field]
+        postings['cells'] = _Postings.from_column(cells)
+
+        # Кармические числа: у даты может быть несколько, поэтому по битам маски
+        mask = np.frombuffer(table.karmic_mask, dtype=np.uint8)
+        days = [np.flatnonzero(mask & (1 << bit)).astype(np.uint32)
+                for bit in range(len(KARMIC_NUMBERS))]
+        postings['karmic'] = _Postings(
+            np.array(KARMIC_NUMBERS, dtype=np.int64),
+            np.cumsum([0] + [len(d) for d in days]).astype(np.uint32),
+            np.concatenate(days)
+        )
+        return cls(postings)
+
+    def save(self, path: str) -> None:
+        """Сохраняет индекс в файл .npz"""
+        arrays = {}
+        for field, postings in self._postings.items():
+            arrays[f'{field}.keys'] = postings.keys
+            arrays[f'{field}.offsets'] = postings.offsets
+            arrays[f'{field}.days'] = postings.days
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'DateIndex':
+        """Загружает индекс, сохраненный save()"""
+        with np.load(path) as data:
+            fields = {name.split('.')[0] for name in data.files}
+            return cls({
+                field: _Postings(data[f'{field}.keys'], data[f'{field}.offsets'],
+                                 data[f'{field}.days'])
+                for field in fields
+            })
+
+    def query(self, cells: Union[Sequence[int], Dict[str, int], None] = None,
+              karmic: Iterable[int] = (), **fields: Optional[int]) -> np.ndarray:
+        """Смещения дней, удовлетворяющих всем условиям
+
+        Args:
+            cells: Значения ячеек DATE_CELLS (кортеж или словарь по позициям)
+            karmic: Кармические числа, которые должны присутствовать
+            **fields: Значения полей из FIELDS (None - без условия)
+        """
+        lists = []
+        if isinstance(cells, dict):
+            cells = [cells[position] for position in DATE_CELLS]
+        if cells is not None:
+            lists.append(self._postings['cells'].get(encode_cells(cells)))
+        for number in karmic:
+            lists.append(self._postings['karmic'].get(number))
+        for field, value in fields.items():
+            if field not in FIELDS:
+                raise ValueError(f"Неизвестное поле индекса: {field}")
+            if value is not None:
+                lists.append(self._postings[field].get(value))
+
+        if not lists:
+            raise ValueError("Не задано ни одного условия поиска")
+
+        lists.sort(key=len)
+        result = lists[0]
+        for days in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, days, assume_unique=True)
+        return result
+
+    @staticmethod
+    def to_dates(days: np.ndarray) -> List[date]:
+        """Смещения дней от TABLE_START -> даты"""
+        return [TABLE_START + timedelta(days=day) for day in days.tolist()]
+
+    def find_dates(self, limit: Optional[int] = None, **conditions) -> List[date]:
+        """Даты рождения, удовлетворяющие условиям query()"""
+        days = self.query(**conditions)
+        if limit is not None:
+            days = days[:limit]
+        return self.to_dates(days)
+
+
+_index: Optional[DateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_date_index(path: Optional[str] = None) -> DateIndex:
+    """Общий индекс процесса: загружается из path или строится (и сохраняется в path)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                if path:
+                    try:
+                        _index = DateIndex.load(path)
+                    except FileNotFoundError:
+                        _index = DateIndex.build()
+                        _index.save(path)
+                else:
+                    _index = DateIndex.build()
+    return _index
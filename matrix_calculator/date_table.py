@@ -0,0 +1,166 @@
+"""Предрассчитанная таблица чисел даты рождения
+
+Все числа матрицы, зависящие только от даты, для диапазона 1900–2100
+хранятся в компактных массивах, индексируемых порядковым номером даты.
+Таблица строится один раз при первом обращении; даты вне диапазона
+считаются арифметически.
+"""
+import threading
+from array import array
+from calendar import monthrange
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from .karmic import (
+    CHAIN_MASKS, KARMIC_BY_MASK, POSITION_SHIFTS, VALUE_MASKS,
+    chain_mask, date_chains, value_mask,
+)
+from .numerology import REDUCED, digit_sum, reduce_number
+
+TABLE_START = date(1900, 1, 1)
+TABLE_END = date(2100, 12, 31)
+
+_START_ORDINAL = TABLE_START.toordinal()
+_SIZE = TABLE_END.toordinal() - _START_ORDINAL + 1
+
+class DateNumbers(NamedTuple):
+    """Числа матрицы, зависящие только от даты рождения"""
+    day: int
+    month: int
+    year: int
+    year_reduced: int
+    day_reduced: int
+    month_reduced: int
+    personal_number: int
+    destiny_number: int
+    life_path: int
+    karmic_numbers: List[int]
+    karmic_chains: int  # Упакованные маски позиций даты (см. karmic)
+
+
+class _DateTable:
+    """Массивы предрассчитанных значений, по одному байту на дату"""
+
+    def __init__(self):
+        self.year_reduced = array('B', bytes(_SIZE))
+        self.day_reduced = array('B', bytes(_SIZE))
+        self.month_reduced = array('B', bytes(_SIZE))
+        self.personal = array('B', bytes(_SIZE))
+        self.destiny = array('B', bytes(_SIZE))
+        self.life_path = array('B', bytes(_SIZE))
+        self.karmic_mask = array('B', bytes(_SIZE))
+        self.karmic_chains = array('Q', bytes(8 * _SIZE))
+        self._fill()
+
+    def _fill(self):
+        # Все промежуточные суммы в диапазоне таблицы меньше 100
+        reduced = REDUCED
+        karmic = VALUE_MASKS
+        # Цепочечные маски, сдвинутые на место своей позиции матрицы
+        chains = {
+            position: [CHAIN_MASKS[n] << POSITION_SHIFTS[position] for n in range(100)]
+            for position in ('top_left', 'top_center', 'middle_left', 'center', 'bottom_right')
+        }
+        day_chains = chains['top_left']
+        personal_chains = chains['middle_left']
+        destiny_chains = chains['center']
+        life_path_chains = chains['bottom_right']
+        day_digits = [digit_sum(d) for d in range(32)]
+
+        index = 0
+        for year in range(TABLE_START.year, TABLE_END.year + 1):
+            year_reduced = reduce_number(year)
+            year_digits = digit_sum(year)
+            year_karmic = value_mask(year)
+            year_chain = chain_mask(year) << POSITION_SHIFTS['top_right']
+            for month in range(1, 13):
+                month_reduced = reduced[month]
+                month_digits = digit_sum(month)
+                month_karmic = karmic[month] | year_karmic
+                month_chain = chains['top_center'][month] | year_chain
+                for day in range(1, monthrange(year, month)[1] + 1):
+                    personal_sum = day + month
+                    destiny_sum = day_digits[day] + month_digits + year_digits
+                    life_path_sum = personal_sum + year_reduced
+                    personal = reduced[personal_sum]
+                    destiny = reduced[destiny_sum]
+
+                    self.year_reduced[index] = year_reduced
+                    self.day_reduced[index] = reduced[day]
+                    self.month_reduced[index] = month_reduced
+                    self.personal[index] = personal
+                    self.destiny[index] = destiny
+                    self.life_path[index] = reduced[life_path_sum]
+                    self.karmic_mask[index] = (
+                        karmic[day] | month_karmic | karmic[personal] | karmic[destiny]
+                    )
+                    self.karmic_chains[index] = (
+                        day_chains[day] | month_chain | personal_chains[personal_sum]
+                        | destiny_chains[destiny_sum] | life_path_chains[life_path_sum]
+                    )
+                    index += 1
+
+    def lookup(self, birth_date: date, index: int) -> DateNumbers:
+        return DateNumbers(
+            day=birth_date.day,
+            month=birth_date.month,
+            year=birth_date.year,
+            year_reduced=self.year_reduced[index],
+            day_reduced=self.day_reduced[index],
+            month_reduced=self.month_reduced[index],
+            personal_number=self.personal[index],
+            destiny_number=self.destiny[index],
+            life_path=self.life_path[index],
+            karmic_numbers=list(KARMIC_BY_MASK[self.karmic_mask[index]]),
+            karmic_chains=self.karmic_chains[index],
+        )
+
+
+_table: Optional[_DateTable] = None
+_table_lock = threading.Lock()
+
+
+def get_date_table() -> _DateTable:
+    """Общая таблица чисел дат процесса (строится при первом обращении)"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = _DateTable()
+    return _table
+
+
+def compute_date_numbers(birth_date: date) -> DateNumbers:
+    """Арифметический расчет чисел даты (для дат вне таблицы)"""
+    day = birth_date.day
+    month = birth_date.month
+    year = birth_date.year
+    year_reduced = reduce_number(year)
+    personal = reduce_number(day + month)
+    destiny = reduce_number(digit_sum(day) + digit_sum(month) + digit_sum(year))
+
+    mask = 0
+    for num in (day, month, year, personal, destiny):
+        mask |= value_mask(num)
+
+    return DateNumbers(
+        day=day,
+        month=month,
+        year=year,
+        year_reduced=year_reduced,
+        day_reduced=reduce_number(day),
+        month_reduced=reduce_number(month),
+        personal_number=personal,
+        destiny_number=destiny,
+        life_path=reduce_number(day + month + year_reduced),
+        karmic_numbers=list(KARMIC_BY_MASK[mask]),
+        karmic_chains=date_chains(day, month, year, year_reduced),
+    )
+
+
+def get_date_numbers(birth_date: date) -> DateNumbers:
+    """Возвращает числа даты: из таблицы за O(1) или арифметически вне диапазона"""
+    index = birth_date.toordinal() - _START_ORDINAL
+    if 0 <= index < _SIZE:
+        return get_date_table().lookup(birth_date, index)
+    return compute_date_numbers(birth_date)
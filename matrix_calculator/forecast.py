@@ -0,0 +1,93 @@
+"""Прогноз: личный год, месяц и день для диапазона дат
+
+Весь диапазон считается одним векторным проходом по таблице редукции:
+    личный год   = редукция(день рождения + месяц рождения + редукция(год))
+    личный месяц = редукция(личный год + календарный месяц)
+    личный день  = редукция(личный месяц + календарный день)
+Значения хранятся как uint8 - 10 лет ежедневного прогноза занимают ~11 КБ.
+"""
+from datetime import date, timedelta
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .batch import _to_datetime64, reduce_array
+from .numerology import REDUCED
+
+_REDUCED = np.array(REDUCED, dtype=np.uint8)
+
+
+def _calendar(start: date, days: int):
+    """Календарные год, месяц и день для каждого дня диапазона"""
+    dates = np.arange(np.datetime64(start, 'D'), np.datetime64(start, 'D') + days)
+    month_start = dates.astype('datetime64[M]')
+    year = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = month_start.astype(np.int64) % 12 + 1
+    day = (dates - month_start).astype(np.int64) + 1
+    return year, month, day
+
+
+class Forecast:
+    """Ежедневный прогноз для одного клиента в виде компактных массивов"""
+
+    def __init__(self, start: date, personal_year: np.ndarray,
+                 personal_month: np.ndarray, personal_day: np.ndarray):
+        self.start = start
+        self.personal_year = personal_year
+        self.personal_month = personal_month
+        self.personal_day = personal_day
+
+    def __len__(self) -> int:
+        return len(self.personal_day)
+
+    @property
+    def end(self) -> date:
+        """Последний день прогноза"""
+        return self.start + timedelta(days=len(self) - 1)
+
+    def to_bytes(self) -> bytes:
+        """Компактная форма: три подряд идущих массива по байту на день"""
+        return np.concatenate((self.personal_year, self.personal_month,
+                               self.personal_day)).tobytes()
+
+    def to_dict(self) -> Dict:
+        """Форма для JSON"""
+        return {
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'personal_year': self.personal_year.tolist(),
+            'personal_month': self.personal_month.tolist(),
+            'personal_day': self.personal_day.tolist(),
+        }
+
+
+def forecast_batch(birth_dates: Sequence, start: date, days: int) -> Dict[str, np.ndarray]:
+    """Прогноз для многих клиентов: массивы (клиенты, дни) типа uint8"""
+    births = _to_datetime64(birth_dates)
+    birth_month_start = births.astype('datetime64[M]')
+    birth_month = birth_month_start.astype(np.int64) % 12 + 1
+    birth_day = (births - birth_month_start).astype(np.int64) + 1
+
+    year, month, day = _calendar(start, days)
+    # Кроме самого года, все промежуточные суммы меньше размера таблицы редукции
+    base = (birth_day + birth_month)[:, None]
+    personal_year = _REDUCED[base + reduce_array(year)[None, :]]
+    personal_month = _REDUCED[personal_year + month[None, :]]
+    personal_day = _REDUCED[personal_month + day[None, :]]
+
+    return {
+        'personal_year': personal_year,
+        'personal_month': personal_month,
+        'personal_day': personal_day,
+    }
+
+
+def forecast(birth_date: date, start: date, days: int = 365) -> Forecast:
+    """Ежедневный прогноз для одного клиента"""
+    series = forecast_batch([birth_date], start, days)
+    return Forecast(
+        start,
+        series['personal_year'][0],
+        series['personal_month'][0],
+        series['personal_day'][0],
+    )
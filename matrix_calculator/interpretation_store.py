@@ -0,0 +1,187 @@
+"""Скомпилированное хранилище текстов интерпретаций
+
+Исходные тексты лежат в locales/<локаль>/<ключ>.txt и редактируются как
+обычные файлы. Для работы они компилируются в один файл locales/<локаль>.bin:
+
+    MINT | версия | число ключей | индекс (ключ, смещение, длина) | тексты UTF-8
+
+Файл открывается через mmap: страницы общие для всех процессов через
+page cache, а текст декодируется только при первом обращении к ключу.
+Если .bin отсутствует или старше исходников, он пересобирается при
+открытии; при недоступной записи хранилище собирается в памяти.
+
+Сборка вручную:
+    python -m matrix_calculator.interpretation_store [локаль ...]
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+
+LOCALES_DIR = os.path.join(os.path.dirname(__file__), 'locales')
+DEFAULT_LOCALE = 'ru'
+
+_MAGIC = b'MINT'
+_VERSION = 1
+_HEADER = struct.Struct('<4sII')
+_KEY_LENGTH = struct.Struct('<H')
+_ENTRY = struct.Struct('<II')
+
+
+def compiled_path(locale: str, root: str = LOCALES_DIR) -> str:
+    """Путь к скомпилированному файлу локали"""
+    return os.path.join(root, f'{locale}.bin')
+
+
+def available_locales(root: str = LOCALES_DIR) -> List[str]:
+    """Локали, для которых есть исходники или скомпилированный файл"""
+    locales = set()
+    for name in os.listdir(root):
+        if os.path.isdir(os.path.join(root, name)):
+            locales.add(name)
+        elif name.endswith('.bin'):
+            locales.add(name[:-4])
+    return sorted(locales)
+
+
+def read_sources(locale: str, root: str = LOCALES_DIR) -> Dict[str, bytes]:
+    """Исходные тексты локали: ключ (имя файла без .txt) -> байты UTF-8"""
+    source_dir = os.path.join(root, locale)
+    texts = {}
+    for filename in sorted(os.listdir(source_dir)):
+        if filename.endswith('.txt'):
+            with open(os.path.join(source_dir, filename), 'rb') as f:
+                texts[filename[:-4]] = f.read()
+    return texts
+
+
+def compile_texts(texts: Dict[str, bytes]) -> bytes:
+    """Собирает двоичное хранилище из словаря текстов"""
+    index = []
+    offset = 0
+    for key, data in texts.items():
+        encoded = key.encode('utf-8')
+        index.append(_KEY_LENGTH.pack(len(encoded)) + encoded + _ENTRY.pack(offset, len(data)))
+        offset += len(data)
+    header = _HEADER.pack(_MAGIC, _VERSION, len(texts))
+    return header + b''.join(index) + b''.join(texts.values())
+
+
+def build(locale: str = DEFAULT_LOCALE, root: str = LOCALES_DIR) -> str:
+    """Компилирует исходники локали в .bin и возвращает путь к файлу"""
+    data = compile_texts(read_sources(locale, root))
+    path = compiled_path(locale, root)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    # Атомарная замена: уже открытые mmap продолжают видеть старый файл
+    os.replace(temp_path, path)
+    return path
+
+
+def _is_stale(locale: str, root: str) -> bool:
+    source_dir = os.path.join(root, locale)
+    if not os.path.isdir(source_dir):
+        return False
+    try:
+        built = os.path.getmtime(compiled_path(locale, root))
+    except OSError:
+        return True
+    if os.path.getmtime(source_dir) > built:
+        return True
+    return any(
+        os.path.getmtime(os.path.join(source_dir, name)) > built
+        for name in os.listdir(source_dir)
+    )
+
+
+class InterpretationStore:
+    """Тексты одной локали поверх mmap или байтового буфера"""
+
+    def __init__(self, buffer: Union[mmap.mmap, bytes]):
+        magic, version, count = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Неверный формат хранилища интерпретаций")
+
+        position = _HEADER.size
+        self._entries = {}
+        for _ in range(count):
+            (key_length,) = _KEY_LENGTH.unpack_from(buffer, position)
+            position += _KEY_LENGTH.size
+            key = buffer[position:position + key_length].decode('utf-8')
+            position += key_length
+            self._entries[key] = _ENTRY.unpack_from(buffer, position)
+            position += _ENTRY.size
+
+        self._buffer = buffer
+        self._blob_start = position
+        self._texts: Dict[str, str] = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'InterpretationStore':
+        """Открывает скомпилированный файл через mmap"""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def get(self, key: str, default: str = '') -> str:
+        """Текст по ключу; декодируется при первом обращении"""
+        text = self._texts.get(key)
+        if text is None:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            offset, length = entry
+            start = self._blob_start + offset
+            text = self._texts[key] = self._buffer[start:start + length].decode('utf-8')
+        return text
+
+
+def load(locale: str = DEFAULT_LOCALE, root: str = LOCALES_DIR) -> InterpretationStore:
+    """Открывает хранилище локали, при необходимости пересобирая .bin"""
+    if locale not in available_locales(root):
+        raise ValueError(f"Неизвестная локаль: {locale}")
+    if _is_stale(locale, root):
+        try:
+            build(locale, root)
+        except OSError:
+            # Только чтение (например, контейнер) - собираем в памяти процесса
+            return InterpretationStore(compile_texts(read_sources(locale, root)))
+    return InterpretationStore.open(compiled_path(locale, root))
+
+
+_stores: Dict[str, InterpretationStore] = {}
+_lock = threading.Lock()
+
+
+def get_store(locale: str = DEFAULT_LOCALE) -> InterpretationStore:
+    """Общее хранилище локали, открывается один раз на процесс"""
+    store = _stores.get(locale)
+    if store is None:
+        with _lock:
+            store = _stores.get(locale)
+            if store is None:
+                store = _stores[locale] = load(locale)
+    return store
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    locales = list(argv if argv is not None else sys.argv[1:]) or available_locales()
+    for locale in locales:
+        path = build(locale)
+        print(f"{locale}: {path} ({os.path.getsize(path)} байт)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
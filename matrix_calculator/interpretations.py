@@ -1,492 +1,30 @@
-"""База интерпретаций для чисел матрицы судьбы"""
-from typing import Dict
-
-
-def get_interpretation() -> Dict[str, str]:
-    """Возвращает словарь интерпретаций для всех чисел матрицы судьбы"""
-    
-    interpretations = {
-        'number_1': """
-Число 1 - МАГ (Аркан Таро: Маг)
-Энергия лидерства и независимости
-
-🎯 ВАША СУТЬ:
-Вы - прирожденный лидер с сильной волей и стремлением к независимости. 
-Ваша энергия направлена на создание нового, на инициативу и первенство.
-Вы обладаете уникальной способностью превращать идеи в реальность.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Уверенность в себе и своих силах
-• Решительность и способность принимать решения
-• Оригинальность мышления
-• Лидерские качества
-• Независимость и самостоятельность
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Эгоизм и эгоцентризм
-• Упрямство и нетерпимость к критике
-• Склонность к доминированию
-• Нетерпеливость
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для руководящих позиций, предпринимательства, независимой работы.
-Ваша энергия лучше всего проявляется в начале новых проектов.
-Избегайте рутинной работы - она вас угнетает.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы стремитесь к лидерству. Важно научиться учитывать мнение партнера.
-Ищите партнера, который ценит вашу независимость, но может быть вашей опорой.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться использовать свою силу для помощи другим, а не только для себя.
-Развить терпение и умение слушать. Научиться сотрудничеству.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Развивайте эмпатию и умение понимать других
-• Учитесь делегировать и доверять
-• Используйте свою энергию для создания, а не разрушения
-• Практикуйте медитацию для баланса внутренней силы
-        """,
-        
-        'number_2': """
-Число 2 - ЖРИЦА (Аркан Таро: Верховная Жрица)
-Энергия гармонии и интуиции
-
-🎯 ВАША СУТЬ:
-Вы - дипломат и миротворец, стремитесь к гармонии и балансу во всем.
-Ваша сила в интуиции, чувствительности и способности видеть обе стороны ситуации.
-Вы обладаете даром объединять людей и создавать атмосферу сотрудничества.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Тактичность и дипломатичность
-• Развитая интуиция
-• Терпение и выдержка
-• Умение работать в команде
-• Чувствительность к потребностям других
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Нерешительность и сомнения
-• Зависимость от мнения других
-• Пассивность в принятии решений
-• Склонность к самопожертвованию
-• Излишняя чувствительность
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для работы в команде, консультирования, медиации, психологии.
-Ваша интуиция помогает в принятии правильных решений.
-Избегайте работы, требующей быстрых решений без размышлений.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете гармонию и взаимопонимание. Важно научиться выражать свои потребности.
-Идеальный партнер - тот, кто ценит вашу чувствительность и поддерживает вашу интуицию.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться принимать решения самостоятельно, не полагаясь только на мнение других.
-Развить уверенность в себе и умение отстаивать свою точку зрения.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Развивайте уверенность в своих решениях
-• Учитесь говорить "нет" когда нужно
-• Используйте свою дипломатичность для разрешения конфликтов
-• Практикуйте медитацию для усиления интуиции
-• Научитесь ценить свое мнение так же, как мнение других
-        """,
-        
-        'number_3': """
-Число 3 - ИМПЕРАТРИЦА (Аркан Таро: Императрица)
-Энергия творчества и изобилия
-
-🎯 ВАША СУТЬ:
-Вы - творческая личность с богатым воображением и даром самовыражения.
-Ваша энергия направлена на создание красоты, вдохновение других и проявление талантов.
-Вы обладаете способностью видеть красоту в обыденном и делиться ею с миром.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Креативность и воображение
-• Коммуникабельность и обаяние
-• Энтузиазм и оптимизм
-• Дар слова и самовыражения
-• Способность вдохновлять других
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Поверхностность в некоторых вопросах
-• Расточительность и неумение экономить
-• Склонность к сплетням и болтливости
-• Рассеянность внимания
-• Склонность к преувеличению
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для творческих профессий, маркетинга, PR, преподавания, искусства.
-Ваша энергия лучше всего проявляется в проектах, требующих креативности.
-Избегайте монотонной работы - она подавляет вашу творческую природу.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы привносите радость и легкость. Важно научиться глубине и серьезности.
-Идеальный партнер - тот, кто ценит вашу творческую натуру и поддерживает ваши идеи.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться фокусироваться и доводить дела до конца. Развить дисциплину без потери творчества.
-Использовать свой дар слова для созидания, а не разрушения.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Фокусируйтесь на конкретных целях и завершайте начатое
-• Развивайте финансовую дисциплину
-• Используйте свой талант для создания чего-то значимого
-• Практикуйте медитацию для концентрации
-• Учитесь слушать так же хорошо, как и говорить
-        """,
-        
-        'number_4': """
-Число 4 - ИМПЕРАТОР (Аркан Таро: Император)
-Энергия стабильности и структуры
-
-🎯 ВАША СУТЬ:
-Вы - практичный и надежный человек, создающий прочный фундамент для себя и других.
-Ваша энергия направлена на построение стабильности, порядка и системы.
-Вы обладаете способностью превращать хаос в структуру и создавать надежные основы.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Организованность и системность
-• Надежность и ответственность
-• Практичность и реализм
-• Трудолюбие и терпение
-• Способность к долгосрочному планированию
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Упрямство и ригидность
-• Консервативность и нежелание меняться
-• Склонность к рутине
-• Излишняя серьезность
-• Сложность в принятии спонтанных решений
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для управления, строительства, финансов, инженерии, системного администрирования.
-Ваша энергия лучше всего проявляется в создании структур и процессов.
-Избегайте работы, требующей постоянной импровизации и спонтанности.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете стабильность и надежность. Важно научиться проявлять гибкость.
-Идеальный партнер - тот, кто ценит вашу надежность, но может добавить легкости в отношения.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться балансировать между стабильностью и гибкостью. Развить открытость новому опыту.
-Использовать свою способность к структурированию для помощи другим, а не для контроля.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Развивайте гибкость и открытость новому
-• Не бойтесь изменений, но делайте их постепенно
-• Учитесь расслабляться и находить время для отдыха
-• Практикуйте спонтанность в безопасных ситуациях
-• Используйте свою организованность для создания, а не ограничения
-        """,
-        
-        'number_5': """
-Число 5 - ИЕРОФАНТ (Аркан Таро: Иерофант)
-Энергия свободы и приключений
-
-🎯 ВАША СУТЬ:
-Вы - свободолюбивая личность, жаждущая перемен, приключений и нового опыта.
-Ваша энергия направлена на исследование мира, получение знаний и расширение границ.
-Вы обладаете способностью адаптироваться к любым изменениям и находить выход из ситуаций.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Авантюризм и любопытство
-• Коммуникабельность и общительность
-• Многогранность и универсальность
-• Энергичность и активность
-• Способность к быстрой адаптации
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Непостоянство и непредсказуемость
-• Импульсивность и поспешность
-• Склонность к риску без расчета
-• Нетерпеливость
-• Сложность в завершении начатого
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для работы, связанной с путешествиями, продажами, журналистикой, исследованиями.
-Ваша энергия лучше всего проявляется в динамичной среде с разнообразием задач.
-Избегайте монотонной работы - она убивает вашу природу.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете свободу и разнообразие. Важно научиться стабильности и верности.
-Идеальный партнер - тот, кто понимает вашу потребность в свободе, но может быть вашей опорой.
+"""База интерпретаций для чисел матрицы судьбы
 
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться балансировать между свободой и ответственностью. Развить способность к завершению дел.
-Использовать свою энергию для продуктивных целей, а не только для развлечений.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Развивайте дисциплину и способность завершать начатое
-• Учитесь планировать и следовать планам
-• Используйте свою энергию для продуктивных целей
-• Практикуйте медитацию для внутреннего покоя
-• Находите баланс между приключениями и стабильностью
-        """,
-        
-        'number_6': """
-Число 6 - ВЛЮБЛЕННЫЕ (Аркан Таро: Влюбленные)
-Энергия заботы и гармонии
-
-🎯 ВАША СУТЬ:
-Вы - заботливый и ответственный человек, стремящийся создавать гармонию и помогать другим.
-Ваша энергия направлена на заботу, воспитание и создание красоты в отношениях.
-Вы обладаете способностью видеть лучшее в людях и помогать им раскрыться.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Забота и внимание к другим
-• Ответственность и надежность
-• Терпение и понимание
-• Способность к воспитанию
-• Гармоничность в отношениях
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Чрезмерная опека и контроль
-• Самопожертвование в ущерб себе
-• Склонность к критике и перфекционизму
-• Зависимость от одобрения других
-• Сложность в принятии помощи
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для работы в сфере заботы, образования, медицины, дизайна, консультирования.
-Ваша энергия лучше всего проявляется в работе с людьми и создании гармонии.
-Избегайте работы, требующей жесткости и бесчувственности.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете гармонию и взаимную заботу. Важно научиться принимать, а не только отдавать.
-Идеальный партнер - тот, кто ценит вашу заботу и способен заботиться о вас в ответ.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться заботиться о себе так же, как о других. Развить способность принимать помощь.
-Использовать свою заботу для поддержки, а не для контроля над другими.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Научитесь заботиться о себе так же, как о других
-• Не берите на себя слишком много ответственности
-• Учитесь принимать помощь и поддержку
-• Развивайте способность отпускать контроль
-• Практикуйте самолюбие и самопринятие
-        """,
-        
-        'number_7': """
-Число 7 - КОЛЕСНИЦА (Аркан Таро: Колесница)
-Энергия мудрости и духовного поиска
-
-🎯 ВАША СУТЬ:
-Вы - мыслитель и исследователь, стремящийся к глубокому пониманию жизни и истины.
-Ваша энергия направлена на поиск знаний, духовное развитие и постижение тайн бытия.
-Вы обладаете способностью видеть суть вещей и находить ответы на сложные вопросы.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Мудрость и глубина мышления
-• Развитая интуиция
-• Аналитический ум
-• Независимость и самодостаточность
-• Духовная глубина
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Отстраненность от практических дел
-• Скептицизм и критичность
-• Склонность к одиночеству
-• Сложность в выражении эмоций
-• Излишняя замкнутость
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для исследований, науки, философии, психологии, духовных практик, консультирования.
-Ваша энергия лучше всего проявляется в работе, требующей глубокого анализа и понимания.
-Избегайте работы, требующей постоянного общения и поверхностного подхода.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете глубокую связь и понимание. Важно научиться открываться и выражать чувства.
-Идеальный партнер - тот, кто ценит вашу мудрость и дает вам пространство для внутренней работы.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться делиться своими знаниями с другими. Развить способность к практическому применению мудрости.
-Найти баланс между внутренним миром и внешней активностью.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Делитесь своими знаниями и мудростью с другими
-• Развивайте способность выражать эмоции
-• Находите баланс между одиночеством и общением
-• Практикуйте применение знаний в реальной жизни
-• Учитесь доверять интуиции и следовать ей
-        """,
-        
-        'number_8': """
-Число 8 - СИЛА (Аркан Таро: Сила)
-Энергия власти и материального успеха
-
-🎯 ВАША СУТЬ:
-Вы - амбициозный и целеустремленный человек, обладающий силой воли и способностью достигать целей.
-Ваша энергия направлена на создание материального успеха, организацию и управление.
-Вы обладаете способностью превращать идеи в реальные результаты и создавать структуры.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Амбиции и целеустремленность
-• Организаторские способности
-• Сила воли и выносливость
-• Деловая хватка
-• Практичность и реализм
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Материализм и фокус только на деньгах
-• Жесткость и бесчувственность
-• Склонность к власти ради власти
-• Игнорирование духовных ценностей
-• Сложность в проявлении мягкости
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для бизнеса, управления, финансов, строительства, организации крупных проектов.
-Ваша энергия лучше всего проявляется в создании и управлении структурами.
-Избегайте работы, не дающей возможности для роста и достижений.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете партнера, который разделяет ваши амбиции. Важно научиться проявлять мягкость.
-Идеальный партнер - тот, кто ценит вашу силу, но может добавить эмоциональности в отношения.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться использовать свою власть и влияние для блага других. Развить баланс между материальным и духовным.
-Использовать свою силу для создания, а не для разрушения или подавления.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Используйте свою власть для помощи другим
-• Помните о духовных ценностях, не только о материальных
-• Развивайте эмпатию и способность к сочувствию
-• Учитесь проявлять мягкость и гибкость
-• Практикуйте благотворительность и помощь нуждающимся
-        """,
-        
-        'number_9': """
-Число 9 - ОТШЕЛЬНИК (Аркан Таро: Отшельник)
-Энергия гуманизма и служения
-
-🎯 ВАША СУТЬ:
-Вы - гуманист и филантроп, стремящийся помогать человечеству и делать мир лучше.
-Ваша энергия направлена на служение, сострадание и создание универсального блага.
-Вы обладаете способностью видеть общую картину и понимать нужды других.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Сострадание и гуманизм
-• Мудрость и понимание
-• Универсальность и широта взглядов
-• Терпимость и принятие
-• Способность к самопожертвованию
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Идеализм и оторванность от реальности
-• Склонность к жертвованию собой
-• Эмоциональность и ранимость
-• Сложность в завершении циклов
-• Склонность к разочарованию
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для работы в сфере помощи, благотворительности, образования, искусства, гуманитарных наук.
-Ваша энергия лучше всего проявляется в служении другим и создании чего-то значимого.
-Избегайте работы, требующей жесткости и бесчувственности.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете глубокую связь и взаимное понимание. Важно научиться заботиться о себе.
-Идеальный партнер - тот, кто разделяет ваши гуманистические ценности и поддерживает ваши идеалы.
-
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться помогать, не забывая о себе. Развить способность завершать циклы и отпускать прошлое.
-Использовать свою мудрость для практических целей, а не только для идеализации.
-
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Научитесь помогать, не забывая о себе
-• Развивайте способность завершать циклы
-• Используйте свою мудрость для практических целей
-• Практикуйте реализм наряду с идеализмом
-• Учитесь отпускать прошлое и двигаться вперед
-        """,
-        
-        'number_11': """
-Число 11 - СИЛА (Мастер-число: Вдохновение и просветление)
-Аркан Таро: Сила / Правосудие
-
-🎯 ВАША СУТЬ:
-Вы - просветленная личность с высоким духовным потенциалом и способностью вдохновлять других.
-Ваша энергия направлена на духовное развитие, интуитивное понимание и помощь другим в их пути.
-Вы обладаете уникальной способностью видеть за пределами обычного и передавать это видение другим.
-
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Развитая интуиция и духовное видение
-• Способность вдохновлять и мотивировать
-• Высокая чувствительность к энергиям
-• Творческое вдохновение
-• Способность к духовному руководству
-
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Повышенная чувствительность и ранимость
-• Нервозность и тревожность
-• Завышенные ожидания от себя и других
-• Склонность к идеализации
-• Сложность в практическом применении идей
-
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для духовных практик, консультирования, искусства, преподавания, целительства.
-Ваша энергия лучше всего проявляется в работе, требующей интуиции и вдохновения.
-Избегайте работы, требующей только логики без духовного аспекта.
-
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете глубокую духовную связь. Важно научиться принимать несовершенство партнера.
-Идеальный партнер - тот, кто ценит вашу духовность и может быть вашей опорой в материальном мире.
+Тексты хранятся в locales/<локаль>/number_N.txt и читаются через
+скомпилированное хранилище (см. interpretation_store).
+"""
+from typing import Dict
 
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться справляться с повышенной чувствительностью. Развить способность к практическому применению вдохновения.
-Использовать свою интуицию для помощи другим, не теряя связи с реальностью.
+from .interpretation_store import DEFAULT_LOCALE, get_store
 
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Развивайте свою интуицию через практику и медитацию
-• Учитесь заземляться и оставаться в реальности
-• Используйте свою чувствительность как дар, а не как бремя
-• Практикуйте защиту энергетических границ
-• Находите баланс между духовным и материальным
-        """,
-        
-        'number_22': """
-Число 22 - ШУТ (Мастер-число: Строитель и практический идеалист)
-Аркан Таро: Шут / Мир
 
-🎯 ВАША СУТЬ:
-Вы - практический идеалист, способный воплощать великие идеи в реальность и создавать что-то значимое.
-Ваша энергия направлена на строительство, организацию масштабных проектов и реализацию видения.
-Вы обладаете уникальной способностью сочетать идеализм с практичностью и создавать долговечные структуры.
+def get_interpretation(locale: str = DEFAULT_LOCALE) -> Dict[str, str]:
+    """Возвращает словарь интерпретаций для всех чисел матрицы судьбы"""
+    store = get_store(locale)
+    return {key: store.get(key) for key in store.keys()}
 
-💪 СИЛЬНЫЕ СТОРОНЫ:
-• Глобальное видение и способность видеть картину целиком
-• Практичность в реализации идей
-• Организаторские способности высшего уровня
-• Сила воли и выносливость
-• Способность вдохновлять других на великие дела
 
-⚠️ СЛАБЫЕ СТОРОНЫ:
-• Перфекционизм и завышенные стандарты
-• Давление ответственности и переутомление
-• Склонность брать на себя слишком много
-• Сложность в делегировании
-• Игнорирование собственных потребностей
+def interpretation_key(number: int) -> str:
+    """Ключ интерпретации для числа"""
+    return f'number_{number}'
 
-💼 РАБОЧИЙ ПОТЕНЦИАЛ:
-Идеальны для крупных проектов, строительства, архитектуры, организации масштабных мероприятий, управления.
-Ваша энергия лучше всего проявляется в создании чего-то значимого и долговечного.
-Избегайте мелких задач - они не используют ваш потенциал.
 
-💑 ОТНОШЕНИЯ:
-В отношениях вы ищете партнера, который разделяет ваше видение. Важно научиться находить время для близости.
-Идеальный партнер - тот, кто поддерживает ваши амбиции, но напоминает о важности личной жизни.
+def get_interpretation_text(key: str, locale: str = DEFAULT_LOCALE) -> str:
+    """Возвращает текст интерпретации по ключу (пустая строка, если нет)"""
+    return get_store(locale).get(key)
 
-🔮 КАРМИЧЕСКАЯ ЗАДАЧА:
-Научиться делегировать и не брать на себя слишком много. Развить способность к балансу между работой и отдыхом.
-Использовать свой талант для создания, не забывая о собственных потребностях и здоровье.
 
-✨ РЕКОМЕНДАЦИИ ПО ПРОРАБОТКЕ:
-• Используйте свой талант для создания чего-то действительно значимого
-• Научитесь делегировать и доверять другим
-• Развивайте способность к отдыху и восстановлению
-• Практикуйте баланс между работой и личной жизнью
-• Помните, что перфекционизм может быть препятствием
-        """,
-    }
-    
-    return interpretations
+def resolve_interpretations(keys: Dict[str, str], locale: str = DEFAULT_LOCALE) -> Dict[str, str]:
+    """Подставляет тексты вместо ключей интерпретаций"""
+    store = get_store(locale)
+    return {name: store.get(key) for name, key in keys.items()}
@@ -0,0 +1,108 @@
+"""Кармические числа на битовых масках
+
+Каждому кармическому числу соответствует бит (в порядке KARMIC_NUMBERS).
+Для чисел меньше REDUCE_TABLE_SIZE заранее посчитаны две маски:
+    VALUE_MASKS[n] - кармическим является само число;
+    CHAIN_MASKS[n] - кармическое число встречается в цепочке редукции
+                     n -> сумма цифр -> ... (промежуточные суммы до редукции).
+
+Кармический анализ позиций матрицы хранится одним целым числом:
+по POSITION_BITS бит на позицию в порядке MATRIX_POSITIONS. Половины
+от даты и от имени считаются независимо и объединяются через OR.
+"""
+from typing import Dict, List
+
+from .models import MATRIX_POSITIONS
+from .numerology import KARMIC_NUMBERS, MASTER_NUMBERS, REDUCE_TABLE_SIZE, digit_sum
+
+POSITION_BITS = len(KARMIC_NUMBERS)
+_POSITION_MASK = (1 << POSITION_BITS) - 1
+POSITION_SHIFTS = {
+    position: index * POSITION_BITS for index, position in enumerate(MATRIX_POSITIONS)
+}
+
+# Битовая маска -> отсортированный кортеж кармических чисел
+KARMIC_BY_MASK = tuple(
+    tuple(number for bit, number in enumerate(KARMIC_NUMBERS) if mask & (1 << bit))
+    for mask in range(1 << len(KARMIC_NUMBERS))
+)
+
+
+def _value_mask(number: int) -> int:
+    if number in KARMIC_NUMBERS:
+        return 1 << KARMIC_NUMBERS.index(number)
+    return 0
+
+
+def _chain_mask(number: int) -> int:
+    mask = 0
+    while number > 9 and number not in MASTER_NUMBERS:
+        mask |= _value_mask(number)
+        number = digit_sum(number)
+    return mask
+
+
+VALUE_MASKS = tuple(_value_mask(n) for n in range(REDUCE_TABLE_SIZE))
+CHAIN_MASKS = tuple(_chain_mask(n) for n in range(REDUCE_TABLE_SIZE))
+
+
+def value_mask(number: int) -> int:
+    """Маска одного числа (0, если число не кармическое)"""
+    if 0 <= number < REDUCE_TABLE_SIZE:
+        return VALUE_MASKS[number]
+    return 0
+
+
+def chain_mask(number: int) -> int:
+    """Маска кармических чисел в цепочке редукции числа"""
+    if number < 0:
+        return 0
+    # Кармические числа меньше размера таблицы: большие числа только сворачиваем
+    while number >= REDUCE_TABLE_SIZE:
+        number = digit_sum(number)
+    return CHAIN_MASKS[number]
+
+
+def mask_numbers(mask: int) -> List[int]:
+    """Отсортированный список кармических чисел маски"""
+    return list(KARMIC_BY_MASK[mask])
+
+
+def pack_positions(masks: Dict[str, int]) -> int:
+    """Упаковывает маски позиций {позиция: маска} в одно число"""
+    packed = 0
+    for position, mask in masks.items():
+        packed |= mask << POSITION_SHIFTS[position]
+    return packed
+
+
+def date_chains(day: int, month: int, year: int, year_reduced: int) -> int:
+    """Упакованные цепочечные маски позиций матрицы, зависящих от даты"""
+    return pack_positions({
+        'top_left': chain_mask(day),
+        'top_center': chain_mask(month),
+        'top_right': chain_mask(year),
+        'middle_left': chain_mask(day + month),
+        'center': chain_mask(digit_sum(day) + digit_sum(month) + digit_sum(year)),
+        'bottom_right': chain_mask(day + month + year_reduced),
+    })
+
+
+def name_chains(soul_sum: int, personality_sum: int, expression_sum: int) -> int:
+    """Упакованные цепочечные маски позиций матрицы, зависящих от имени"""
+    return pack_positions({
+        'middle_right': chain_mask(expression_sum),
+        'bottom_left': chain_mask(soul_sum),
+        'bottom_center': chain_mask(personality_sum),
+    })
+
+
+def analysis(packed: int) -> Dict[str, List[int]]:
+    """Кармические числа по позициям матрицы (только непустые позиции)"""
+    result = {}
+    if packed:
+        for position, shift in POSITION_SHIFTS.items():
+            mask = (packed >> shift) & _POSITION_MASK
+            if mask:
+                result[position] = list(KARMIC_BY_MASK[mask])
+    return result
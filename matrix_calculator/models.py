@@ -1,13 +1,25 @@
 """Модели данных для матрицы"""
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
 from typing import Dict, List, Optional
+from .interpretation_store import DEFAULT_LOCALE
+from .interpretations import resolve_interpretations
+
+# Позиции матрицы 3x3 построчно
+MATRIX_POSITIONS = (
+    'top_left', 'top_center', 'top_right',
+    'middle_left', 'center', 'middle_right',
+    'bottom_left', 'bottom_center', 'bottom_right',
+)
+
+# Предельная длина имени во входных данных (API, массовый расчет)
+MAX_NAME_LENGTH = 256
 
 
 class MatrixData(BaseModel):
     """Входные данные для расчета матрицы"""
     birth_date: date
-    name: str
+    name: str = Field(max_length=MAX_NAME_LENGTH)
     gender: Optional[str] = None  # 'male' или 'female'
 
 
@@ -30,10 +42,85 @@ class MatrixResult(BaseModel):
     
     # Кармические числа
     karmic_numbers: List[int]
+    # Кармические числа по позициям матрицы, включая промежуточные
+    # суммы до редукции (только позиции, где они встретились)
+    karmic_analysis: Dict[str, List[int]] = {}
     
     # Дополнительные расчеты
     life_path: int
     expression: int
     
-    # Интерпретации
-    interpretations: Dict[str, str]
+    # Ключи интерпретаций (например, 'number_7'); тексты берутся
+    # из общего хранилища только при выводе
+    interpretation_keys: Dict[str, str]
+    
+    def interpretation_texts(self, locale: str = DEFAULT_LOCALE) -> Dict[str, str]:
+        """Тексты интерпретаций по ключам"""
+        return resolve_interpretations(self.interpretation_keys, locale)
+
+
+class MatrixRecord:
+    """Результат расчета без валидации Pydantic для внутренних горячих путей
+    
+    Поля те же, что у MatrixResult. Публичная модель строится только на
+    границе API (to_model), для JSON достаточно to_dict.
+    """
+    
+    __slots__ = (
+        'day', 'month', 'year', 'year_reduced',
+        'personal_number', 'destiny_number', 'soul_number', 'personality_number',
+        'matrix', 'karmic_numbers', 'karmic_analysis', 'life_path', 'expression',
+        'interpretation_keys', '_model',
+    )
+    
+    def __init__(self, day: int, month: int, year: int, year_reduced: int,
+                 personal_number: int, destiny_number: int, soul_number: int,
+                 personality_number: int, matrix: Dict[str, int],
+                 karmic_numbers: List[int], karmic_analysis: Dict[str, List[int]],
+                 life_path: int, expression: int, interpretation_keys: Dict[str, str]):
+        self.day = day
+        self.month = month
+        self.year = year
+        self.year_reduced = year_reduced
+        self.personal_number = personal_number
+        self.destiny_number = destiny_number
+        self.soul_number = soul_number
+        self.personality_number = personality_number
+        self.matrix = matrix
+        self.karmic_numbers = karmic_numbers
+        self.karmic_analysis = karmic_analysis
+        self.life_path = life_path
+        self.expression = expression
+        self.interpretation_keys = interpretation_keys
+        self._model: Optional[MatrixResult] = None
+    
+    def to_dict(self) -> Dict:
+        """То же, что MatrixResult.model_dump(), без прохода через Pydantic"""
+        return {
+            'day': self.day,
+            'month': self.month,
+            'year': self.year,
+            'year_reduced': self.year_reduced,
+            'personal_number': self.personal_number,
+            'destiny_number': self.destiny_number,
+            'soul_number': self.soul_number,
+            'personality_number': self.personality_number,
+            'matrix': dict(self.matrix),
+            'karmic_numbers': list(self.karmic_numbers),
+            'karmic_analysis': {
+                position: list(numbers) for position, numbers in self.karmic_analysis.items()
+            },
+            'life_path': self.life_path,
+            'expression': self.expression,
+            'interpretation_keys': dict(self.interpretation_keys),
+        }
+    
+    def to_model(self) -> MatrixResult:
+        """Публичная модель (создается один раз на запись)"""
+        if self._model is None:
+            self._model = MatrixResult(**self.to_dict())
+        return self._model
+    
+    def interpretation_texts(self, locale: str = DEFAULT_LOCALE) -> Dict[str, str]:
+        """Тексты интерпретаций по ключам"""
+        return resolve_interpretations(self.interpretation_keys, locale)
@@ -0,0 +1,146 @@
+"""Нумерология имени: таблица символов и транслитерация
+
+Каждому символу заранее сопоставлено упакованное число, в битовых полях
+которого лежат значения для гласных, согласных и прочих букв. Сумма
+упакованных значений за один проход по имени дает сразу все три суммы:
+число души, личности и выражения.
+"""
+import sys
+from itertools import repeat
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+# Значение буквы: (гласная, согласная, прочая) - заполнено одно из полей
+LetterTable = Dict[str, Tuple[int, int, int]]
+
+# Русский алфавит с нумерологическими значениями
+CYRILLIC_VALUES = {
+    'А': 1, 'Б': 2, 'В': 6, 'Г': 3, 'Д': 4, 'Е': 5, 'Ё': 5, 'Ж': 2, 'З': 7,
+    'И': 1, 'Й': 1, 'К': 2, 'Л': 3, 'М': 4, 'Н': 5, 'О': 7, 'П': 8, 'Р': 2,
+    'С': 3, 'Т': 4, 'У': 6, 'Ф': 8, 'Х': 5, 'Ц': 3, 'Ч': 7, 'Ш': 2, 'Щ': 9,
+    'Ъ': 1, 'Ы': 1, 'Ь': 1, 'Э': 6, 'Ю': 7, 'Я': 2
+}
+
+# Гласные: А, Е, Ё, И, О, У, Ы, Э, Ю, Я
+CYRILLIC_VOWELS = 'АЕЁИОУЫЭЮЯ'
+# Согласные: все остальные (Ъ и Ь учитываются только в выражении)
+CYRILLIC_CONSONANTS = 'БВГДЖЗЙКЛМНПРСТФХЦЧШЩ'
+
+
+def _letter_table(values: Mapping[str, int], vowels: str, consonants: str) -> LetterTable:
+    table = {}
+    for letter, value in values.items():
+        if letter in vowels:
+            table[letter] = (value, 0, 0)
+        elif letter in consonants:
+            table[letter] = (0, value, 0)
+        else:
+            table[letter] = (0, 0, value)
+    return table
+
+
+def transliteration_table(mapping: Mapping[str, str],
+                          base: Optional[LetterTable] = None) -> LetterTable:
+    """Таблица для латиницы через транслитерацию в кириллицу (X -> КС и т.п.)"""
+    base = CYRILLIC_TABLE if base is None else base
+    table = {}
+    for letter, target in mapping.items():
+        parts = [base[ch] for ch in target if ch in base]
+        table[letter] = tuple(sum(field) for field in zip((0, 0, 0), *parts))
+    return table
+
+
+CYRILLIC_TABLE = _letter_table(CYRILLIC_VALUES, CYRILLIC_VOWELS, CYRILLIC_CONSONANTS)
+
+# Пифагорейская система: A=1 ... I=9, J=1 ... R=9, S=1 ... Z=8
+PYTHAGOREAN_TABLE = _letter_table(
+    {chr(ord('A') + i): i % 9 + 1 for i in range(26)},
+    vowels='AEIOU',
+    consonants='BCDFGHJKLMNPQRSTVWXYZ'
+)
+
+LATIN_TO_CYRILLIC = {
+    'A': 'А', 'B': 'Б', 'C': 'Ц', 'D': 'Д', 'E': 'Е', 'F': 'Ф', 'G': 'Г',
+    'H': 'Х', 'I': 'И', 'J': 'Й', 'K': 'К', 'L': 'Л', 'M': 'М', 'N': 'Н',
+    'O': 'О', 'P': 'П', 'Q': 'К', 'R': 'Р', 'S': 'С', 'T': 'Т', 'U': 'У',
+    'V': 'В', 'W': 'В', 'X': 'КС', 'Y': 'Ы', 'Z': 'З'
+}
+
+# Варианты подсчета латинских имен
+LATIN_TABLES: Dict[str, LetterTable] = {
+    'pythagorean': PYTHAGOREAN_TABLE,
+    'cyrillic': transliteration_table(LATIN_TO_CYRILLIC),
+    'none': {},
+}
+
+# Ширина битового поля упакованного значения. Поле не переполняется, пока
+# в имени не больше NameEngine.packed_length букв (для встроенных таблиц -
+# более 100 тысяч); более длинные имена считаются по полям отдельно
+FIELD_BITS = 20
+_FIELD_MASK = (1 << FIELD_BITS) - 1
+
+
+class NameNumbers(NamedTuple):
+    """Нередуцированные суммы имени"""
+    soul: int         # Гласные
+    personality: int  # Согласные
+    expression: int   # Все буквы
+
+
+class NameEngine:
+    """Подсчет чисел имени за один проход по символам"""
+
+    def __init__(self, latin: Union[str, LetterTable] = 'pythagorean'):
+        """
+        Args:
+            latin: Таблица для латинских букв - имя из LATIN_TABLES
+                или собственная LetterTable
+        """
+        if isinstance(latin, str):
+            if latin not in LATIN_TABLES:
+                raise ValueError(f"Неизвестная таблица латиницы: {latin}")
+            latin = LATIN_TABLES[latin]
+
+        self.values: LetterTable = {}
+        self.packed: Dict[str, int] = {}
+        for table in (latin, CYRILLIC_TABLE):
+            for letter, (vowel, consonant, other) in table.items():
+                packed = vowel | consonant << FIELD_BITS | other << (2 * FIELD_BITS)
+                self.values[letter] = (vowel, consonant, other)
+                self.packed[letter] = packed
+                # Строчные буквы - без вызова upper() на каждом имени
+                if letter.lower().upper() == letter:
+                    self.values[letter.lower()] = (vowel, consonant, other)
+                    self.packed[letter.lower()] = packed
+
+        # Наибольшая длина имени, при которой сумма каждого поля (включая
+        # старшее - в uint64 пакетного расчета) помещается в FIELD_BITS бит
+        max_value = max((max(value) for value in self.values.values()), default=0)
+        self.packed_length = _FIELD_MASK // max_value if max_value else sys.maxsize
+
+    def normalize(self, name: str) -> str:
+        """Каноничная форма имени: только учитываемые буквы в верхнем регистре
+
+        Имена с одинаковой нормальной формой дают одинаковые числа.
+        """
+        return ''.join(filter(self.packed.__contains__, name)).upper()
+
+    def score(self, name: str) -> NameNumbers:
+        """Возвращает суммы гласных, согласных и всех букв имени"""
+        if len(name) > self.packed_length:
+            return self._score_fields(name)
+        total = sum(map(self.packed.get, name, repeat(0)))
+        soul = total & _FIELD_MASK
+        personality = (total >> FIELD_BITS) & _FIELD_MASK
+        other = total >> (2 * FIELD_BITS)
+        return NameNumbers(soul, personality, soul + personality + other)
+
+    def _score_fields(self, name: str) -> NameNumbers:
+        """Суммы по полям без упаковки (для имен длиннее packed_length)"""
+        soul = personality = other = 0
+        for letter in name:
+            value = self.values.get(letter)
+            if value is not None:
+                soul += value[0]
+                personality += value[1]
+                other += value[2]
+        return NameNumbers(soul, personality, soul + personality + other)
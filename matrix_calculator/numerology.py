@@ -0,0 +1,42 @@
+"""Базовые нумерологические операции"""
+
+# Мастер-числа, которые не редуцируются
+MASTER_NUMBERS = (11, 22)
+
+# Кармические числа
+KARMIC_NUMBERS = (13, 14, 16, 19)
+
+# Размер таблицы редукции: покрывает суммы имен и дат с запасом
+REDUCE_TABLE_SIZE = 4096
+
+
+def _reduce_number_loop(number: int) -> int:
+    """Эталонная редукция последовательным сложением цифр"""
+    while number > 9 and number not in MASTER_NUMBERS:
+        number = sum(int(digit) for digit in str(number))
+    return number
+
+
+REDUCED = tuple(_reduce_number_loop(n) for n in range(REDUCE_TABLE_SIZE))
+
+
+def reduce_number(number: int) -> int:
+    """Редуцирует число до однозначного (кроме мастер-чисел 11, 22)"""
+    if 0 <= number < REDUCE_TABLE_SIZE:
+        return REDUCED[number]
+    if number < 0:
+        return number
+    # Мастер-числа меньше размера таблицы, поэтому большие числа
+    # сначала сводятся суммой цифр, а остаток берется из таблицы
+    while number >= REDUCE_TABLE_SIZE:
+        number = digit_sum(number)
+    return REDUCED[number]
+
+
+def digit_sum(number: int) -> int:
+    """Сумма цифр неотрицательного числа"""
+    total = 0
+    while number:
+        number, digit = divmod(number, 10)
+        total += digit
+    return total
@@ -0,0 +1,24 @@
+"""Общие средства отрисовки: шрифты и пул для CPU-задач"""
+from typing import TYPE_CHECKING
+
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .executor import RenderExecutor, configure_executor, get_executor, run_in_executor
+    from .fonts import FontRegistry, configure_fonts, get_font, get_registry
+
+# Имя -> подмодуль; PIL загружается при первом обращении
+_EXPORTS = {
+    'FontRegistry': '.fonts',
+    'configure_fonts': '.fonts',
+    'get_font': '.fonts',
+    'get_registry': '.fonts',
+    'RenderExecutor': '.executor',
+    'configure_executor': '.executor',
+    'get_executor': '.executor',
+    'run_in_executor': '.executor',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
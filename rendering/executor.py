@@ -0,0 +1,140 @@
+"""Пул для CPU-задач отрисовки (PIL, ReportLab) вне цикла событий
+
+Асинхронные обработчики ждут результат через await, и цикл событий
+продолжает обслуживать остальные запросы, пока кодируется PNG или
+собирается PDF. По умолчанию используется пул потоков: PIL и zlib
+отпускают GIL на основной части работы. Пул процессов подходит для
+тяжелых задач, но функция и аргументы должны передаваться через pickle
+(функции уровня модуля, без замыканий и связанных методов).
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+EXECUTOR_KINDS = ('thread', 'process')
+
+
+def default_workers() -> int:
+    """Размер пула по умолчанию: по числу ядер, но не больше 8"""
+    return min(8, os.cpu_count() or 1)
+
+
+class RenderExecutor:
+    """Пул отрисовки с асинхронным интерфейсом и счетчиками очереди"""
+
+    def __init__(self, kind: str = 'thread', max_workers: Optional[int] = None):
+        """
+        Args:
+            kind: 'thread' - пул потоков, 'process' - пул процессов
+            max_workers: Размер пула (None или 0 - default_workers())
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Неизвестный тип пула отрисовки: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or default_workers()
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._total_seconds = 0.0
+
+    def _get_pool(self) -> Executor:
+        # Пул создается при первой задаче: процессы не запускаются при импорте
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.kind == 'process':
+                        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='render')
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Выполняет fn(*args, **kwargs) в пуле и возвращает результат"""
+        loop = asyncio.get_running_loop()
+        # run_in_executor не принимает именованные аргументы
+        call = functools.partial(fn, *args, **kwargs)
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            if self.in_flight > self.peak_in_flight:
+                self.peak_in_flight = self.in_flight
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(self._get_pool(), call)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+                self._total_seconds += elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики для мониторинга: глубина очереди и время от постановки до результата"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'kind': self.kind,
+                'workers': self.max_workers,
+                'in_flight': self.in_flight,
+                'queued': max(0, self.in_flight - self.max_workers),
+                'peak_in_flight': self.peak_in_flight,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'avg_latency_ms': self._total_seconds * 1000 / finished if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Останавливает пул; следующая задача создаст его заново"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_executor: Optional[RenderExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> RenderExecutor:
+    """Общий пул отрисовки процесса (по умолчанию - потоки)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = RenderExecutor()
+    return _executor
+
+
+def configure_executor(kind: str = 'thread', max_workers: Optional[int] = None) -> RenderExecutor:
+    """Заменяет общий пул отрисовки; прежний пул останавливается без ожидания"""
+    global _executor
+    executor = RenderExecutor(kind, max_workers)
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return executor
+
+
+async def run_in_executor(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Выполняет fn в общем пуле отрисовки"""
+    return await get_executor().run(fn, *args, **kwargs)
@@ -0,0 +1,100 @@
+"""Реестр шрифтов процесса для отрисовки PIL
+
+Семейство - упорядоченный список путей-кандидатов. Путь семейства
+определяется один раз (первый существующий файл, который удалось
+загрузить), а каждый шрифт (семейство, размер) загружается один раз и
+дальше берется из реестра. Последний кандидат по умолчанию - шрифт из
+комплекта (rendering/fonts), поэтому кириллица отображается и в
+контейнерах без системных шрифтов.
+"""
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import ImageFont
+
+BUNDLED_FONTS_DIR = os.path.join(os.path.dirname(__file__), 'fonts')
+BUNDLED_FONT = os.path.join(BUNDLED_FONTS_DIR, 'DejaVuSans-Bold.ttf')
+
+DEFAULT_FAMILY = 'sans-bold'
+
+# Системные шрифты, которые использовались раньше, затем шрифт из комплекта
+SYSTEM_FONT_PATHS = [
+    "/System/Library/Fonts/Helvetica.ttc",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",  # Linux
+    "C:/Windows/Fonts/arial.ttf",  # Windows
+]
+
+
+class FontRegistry:
+    """Потокобезопасный кэш шрифтов по (семейство, размер)"""
+
+    def __init__(self, families: Optional[Dict[str, List[str]]] = None):
+        self._families: Dict[str, List[str]] = {
+            DEFAULT_FAMILY: SYSTEM_FONT_PATHS + [BUNDLED_FONT]
+        }
+        if families:
+            self._families.update(families)
+        self._paths: Dict[str, Optional[str]] = {}
+        self._fonts: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+        self._lock = threading.Lock()
+
+    def register(self, family: str, paths: Iterable[str], prepend: bool = True) -> None:
+        """Добавляет кандидатов семейства (по умолчанию - перед имеющимися)"""
+        paths = [path for path in paths if path]
+        with self._lock:
+            current = self._families.get(family, [])
+            self._families[family] = paths + current if prepend else current + paths
+            # Сбрасываем уже разрешенные пути и загруженные шрифты семейства
+            self._paths.pop(family, None)
+            for key in [key for key in self._fonts if key[0] == family]:
+                del self._fonts[key]
+
+    def resolve(self, family: str = DEFAULT_FAMILY) -> Optional[str]:
+        """Путь к файлу шрифта семейства (None - встроенный шрифт PIL)"""
+        if family not in self._paths:
+            path = None
+            for candidate in self._families.get(family, []):
+                try:
+                    if os.path.exists(candidate):
+                        ImageFont.truetype(candidate, 10)
+                        path = candidate
+                        break
+                except OSError:
+                    continue
+            self._paths[family] = path
+        return self._paths[family]
+
+    def get(self, size: int, family: str = DEFAULT_FAMILY) -> ImageFont.ImageFont:
+        """Шрифт заданного размера; загружается один раз на процесс"""
+        key = (family, size)
+        font = self._fonts.get(key)
+        if font is None:
+            with self._lock:
+                font = self._fonts.get(key)
+                if font is None:
+                    path = self.resolve(family)
+                    font = (ImageFont.truetype(path, size) if path
+                            else ImageFont.load_default())
+                    self._fonts[key] = font
+        return font
+
+
+_registry = FontRegistry()
+
+
+def get_registry() -> FontRegistry:
+    """Общий реестр шрифтов процесса"""
+    return _registry
+
+
+def get_font(size: int, family: str = DEFAULT_FAMILY) -> ImageFont.ImageFont:
+    """Шрифт из общего реестра"""
+    return _registry.get(size, family)
+
+
+def configure_fonts(paths: Iterable[str] = ()) -> None:
+    """Добавляет шрифты из настроек перед системными кандидатами"""
+    paths = list(paths)
+    if paths:
+        _registry.register(DEFAULT_FAMILY, paths)
@@ -1,5 +1,26 @@
 """Генерация отчетов"""
-from .generator import ReportGenerator
-from .pdf_generator import PDFGenerator, generate_pdf_report
+from typing import TYPE_CHECKING
 
-__all__ = ['ReportGenerator', 'PDFGenerator', 'generate_pdf_report']
+from lazy_exports import lazy_exports
+
+if TYPE_CHECKING:
+    from .generator import ReportGenerator
+    from .pdf_jobs import PDFJobQueue, QueueFullError
+    from .pdf_generator import (
+        PDFGenerator, generate_pdf_report, generate_pdf_report_async, get_pdf_generator,
+    )
+
+# Имя -> подмодуль; PIL, reportlab и сбор данных загружаются при первом обращении
+_EXPORTS = {
+    'ReportGenerator': '.generator',
+    'PDFGenerator': '.pdf_generator',
+    'generate_pdf_report': '.pdf_generator',
+    'generate_pdf_report_async': '.pdf_generator',
+    'get_pdf_generator': '.pdf_generator',
+    'PDFJobQueue': '.pdf_jobs',
+    'QueueFullError': '.pdf_jobs',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,198 @@
+"""Сборка изображения матрицы из заранее отрисованных частей
+
+Фон (сетка, выделение центра, подпись) и спрайты чисел для каждого
+значения ячейки в обычном и центральном варианте рисуются один раз.
+Изображение собирается копией фона и девятью вставками спрайтов и
+попиксельно совпадает с последовательной отрисовкой всех элементов.
+
+Для PNG части заранее переводятся в палитру (белый, черный, золотой и
+переходы к черному для сглаживания): изображение собирается сразу в
+режиме P и кодируется без квантования на каждый запрос.
+"""
+import io
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from rendering.fonts import get_font
+from .layout import (
+    BORDER_COLOR, BORDER_WIDTH, CELL_COORDS, CELL_SIZE, CELL_VALUES, CENTER_COLOR,
+    CENTER_MARGIN, DEFAULT_FORMAT, FONT_SIZE, IMAGE_SIZE, LABEL_FONT_SIZE,
+    LABEL_HEIGHT, LABEL_TEXT, TEXT_COLOR,
+)
+
+# Запас вокруг textbbox на сглаживание краев глифов
+_SPRITE_PADDING = 2
+
+# Ступени перехода от фона к черному в палитре PNG
+PALETTE_STEPS = 32
+
+# Растровый формат -> (формат PIL, параметры сохранения)
+IMAGE_FORMATS = {
+    # Палитра и сильное сжатие: изображение кэшируется, важнее размер
+    'png': ('PNG', {'compress_level': 9}),
+    'webp': ('WEBP', {'lossless': True, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 90}),
+}
+
+# (изображение RGB, изображение в палитре, смещение в ячейке)
+Sprite = Tuple[Image.Image, Image.Image, Tuple[int, int]]
+
+
+def _ramp(start: Tuple[int, int, int], end: Tuple[int, int, int], steps: int) -> List[Tuple[int, ...]]:
+    return [
+        tuple(round(a + (b - a) * i / (steps - 1)) for a, b in zip(start, end))
+        for i in range(steps)
+    ]
+
+
+def build_palette(steps: int = PALETTE_STEPS) -> np.ndarray:
+    """Цвета палитры: переходы белый -> черный и золотой -> черный"""
+    colors = _ramp((255, 255, 255), TEXT_COLOR, steps) + _ramp(CENTER_COLOR, TEXT_COLOR, steps)
+    return np.array(list(dict.fromkeys(colors)), dtype=np.int32)
+
+
+def to_palette(image: Image.Image, palette: np.ndarray) -> Image.Image:
+    """Переводит изображение в режим P: каждый пиксель - ближайший цвет палитры
+
+    Точный поиск вместо Image.quantize: квантование PIL огрубляет цвета,
+    и чистый белый может получить соседний оттенок.
+    """
+    pixels = np.asarray(image.convert('RGB'), dtype=np.int32)
+    # Цвет как одно число: уникальные значения одномерного массива ищутся быстрее
+    packed = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+    keys, inverse = np.unique(packed, return_inverse=True)
+    colors = np.stack([keys >> 16, (keys >> 8) & 0xFF, keys & 0xFF], axis=1)
+    distances = ((colors[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+    indices = distances.argmin(axis=1).astype(np.uint8)[inverse.reshape(packed.shape)]
+    result = Image.fromarray(indices, 'P')
+    result.putpalette(palette.astype(np.uint8).tobytes())
+    return result
+
+
+class MatrixCompositor:
+    """Фон и спрайты чисел для быстрой сборки изображения матрицы"""
+
+    def __init__(self, font: Optional[ImageFont.ImageFont] = None,
+                 label_font: Optional[ImageFont.ImageFont] = None):
+        self.font = font or get_font(FONT_SIZE)
+        self.label_font = label_font or get_font(LABEL_FONT_SIZE)
+        self.palette = build_palette()
+        self.background = self._draw_background()
+        self.palette_background = to_palette(self.background, self.palette)
+        self._sprites: Dict[Tuple[int, bool], Sprite] = {}
+        self._lock = threading.Lock()
+        for value in CELL_VALUES:
+            for center in (False, True):
+                self._sprites[value, center] = self._draw_sprite(value, center)
+
+    def _draw_background(self) -> Image.Image:
+        """Сетка, выделение центральной ячейки и подпись"""
+        grid = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE), color='white')
+        draw = ImageDraw.Draw(grid)
+        for i in range(4):
+            x = i * CELL_SIZE
+            y = i * CELL_SIZE
+            # Вертикальные линии
+            draw.rectangle([x, 0, x + BORDER_WIDTH, IMAGE_SIZE], fill=BORDER_COLOR)
+            # Горизонтальные линии
+            draw.rectangle([0, y, IMAGE_SIZE, y + BORDER_WIDTH], fill=BORDER_COLOR)
+
+        col, row = CELL_COORDS['center']
+        draw.rectangle(
+            [col * CELL_SIZE + CENTER_MARGIN, row * CELL_SIZE + CENTER_MARGIN,
+             (col + 1) * CELL_SIZE - CENTER_MARGIN, (row + 1) * CELL_SIZE - CENTER_MARGIN],
+            fill=CENTER_COLOR, outline=BORDER_COLOR, width=2
+        )
+
+        # Сетка рисуется на квадрате и затем переносится: линии не должны
+        # заходить в область подписи
+        background = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE + LABEL_HEIGHT), color='white')
+        background.paste(grid, (0, 0))
+
+        draw = ImageDraw.Draw(background)
+        bbox = draw.textbbox((0, 0), LABEL_TEXT, font=self.label_font)
+        text_width = bbox[2] - bbox[0]
+        draw.text(
+            ((IMAGE_SIZE - text_width) // 2, IMAGE_SIZE + 10),
+            LABEL_TEXT,
+            fill=TEXT_COLOR,
+            font=self.label_font
+        )
+        return background
+
+    def _draw_sprite(self, value: int, center: bool) -> Sprite:
+        """Число на фоне своей ячейки: фрагмент в RGB и в палитре, смещение в ячейке"""
+        col, row = CELL_COORDS['center' if center else 'top_left']
+        left, top = col * CELL_SIZE, row * CELL_SIZE
+        tile = self.background.crop((left, top, left + CELL_SIZE, top + CELL_SIZE))
+        draw = ImageDraw.Draw(tile)
+
+        number = str(value)
+        bbox = draw.textbbox((0, 0), number, font=self.font)
+        origin = (CELL_SIZE // 2 - (bbox[2] - bbox[0]) // 2,
+                  CELL_SIZE // 2 - (bbox[3] - bbox[1]) // 2)
+        draw.text(origin, number, fill=TEXT_COLOR, font=self.font)
+
+        ink = draw.textbbox(origin, number, font=self.font)
+        # Спрайт не должен задевать линии сетки у левого и верхнего края ячейки
+        box = (
+            max(ink[0] - _SPRITE_PADDING, BORDER_WIDTH + 1),
+            max(ink[1] - _SPRITE_PADDING, BORDER_WIDTH + 1),
+            min(ink[2] + _SPRITE_PADDING, CELL_SIZE),
+            min(ink[3] + _SPRITE_PADDING, CELL_SIZE),
+        )
+        sprite = tile.crop(box)
+        return sprite, to_palette(sprite, self.palette), box[:2]
+
+    def _sprite(self, value: int, center: bool) -> Sprite:
+        sprite = self._sprites.get((value, center))
+        if sprite is None:
+            # Значения вне CELL_VALUES рисуются при первом появлении
+            with self._lock:
+                sprite = self._sprites.get((value, center))
+                if sprite is None:
+                    sprite = self._sprites[value, center] = self._draw_sprite(value, center)
+        return sprite
+
+    def render(self, matrix: Dict[str, int], palette: bool = False) -> Image.Image:
+        """Собирает изображение матрицы (RGB или в палитре)"""
+        image = (self.palette_background if palette else self.background).copy()
+        for position, (col, row) in CELL_COORDS.items():
+            rgb, indexed, (dx, dy) = self._sprite(matrix[position], position == 'center')
+            image.paste(indexed if palette else rgb, (col * CELL_SIZE + dx, row * CELL_SIZE + dy))
+        return image
+
+    def encode(self, matrix: Dict[str, int], image_format: str = DEFAULT_FORMAT) -> bytes:
+        """Собирает изображение матрицы и кодирует его в формат из IMAGE_FORMATS"""
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Неизвестный формат изображения: {image_format}")
+        pil_format, options = IMAGE_FORMATS[image_format]
+        buffer = io.BytesIO()
+        self.render(matrix, palette=image_format == 'png').save(buffer, format=pil_format, **options)
+        return buffer.getvalue()
+
+    def render_png(self, matrix: Dict[str, int]) -> bytes:
+        """Собирает изображение матрицы и кодирует его в PNG"""
+        return self.encode(matrix, 'png')
+
+
+_compositor: Optional[MatrixCompositor] = None
+_compositor_lock = threading.Lock()
+
+
+def get_compositor() -> MatrixCompositor:
+    """Общий компоновщик процесса (шрифты и спрайты готовятся один раз)"""
+    global _compositor
+    if _compositor is None:
+        with _compositor_lock:
+            if _compositor is None:
+                _compositor = MatrixCompositor()
+    return _compositor
+
+
+def render_matrix_image(matrix: Dict[str, int], image_format: str = DEFAULT_FORMAT) -> bytes:
+    """Изображение матрицы общим компоновщиком (функция модуля - для пула процессов)"""
+    return get_compositor().encode(matrix, image_format)
@@ -1,19 +1,16 @@
 """Генератор отчетов с интеграцией сбора данных с веб-сайтов"""
 from typing import Dict, List, Optional
 from matrix_calculator.models import MatrixResult, MatrixData
-from PIL import Image, ImageDraw, ImageFont
-import io
-import os
 import logging
 import asyncio
 
-from data_collector import (
-    WebScraper, 
-    TextProcessor, 
-    ImageProcessor, 
-    MATRIX_SOURCES,
-    MATRIX_KEYWORDS
-)
+# PIL, aiohttp и BeautifulSoup импортируются внутри методов, которым они
+# нужны: текстовый отчет не должен платить за их загрузку
+from data_collector.text_processor import TextProcessor
+from matrix_calculator.interpretations import DEFAULT_LOCALE
+from rendering.executor import RenderExecutor, get_executor
+from . import text_report
+from .image_cache import ImageCache, matrix_key
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +18,26 @@ logger = logging.getLogger(__name__)
 class ReportGenerator:
     """Генератор текстовых и визуальных отчетов с расширенной информацией"""
     
-    def __init__(self, enable_web_scraping: bool = True):
+    def __init__(self, enable_web_scraping: bool = True,
+                 image_cache: Optional[ImageCache] = None,
+                 executor: Optional[RenderExecutor] = None):
         """
         Инициализация генератора отчетов
         
         Args:
             enable_web_scraping: Включить ли сбор информации с веб-сайтов
+            image_cache: Кэш изображений матрицы (по умолчанию - только в памяти)
+            executor: Пул отрисовки для асинхронных методов (по умолчанию - общий)
         """
         self.enable_web_scraping = enable_web_scraping
         self.text_processor = TextProcessor()
+        self.image_cache = image_cache if image_cache is not None else ImageCache()
+        self._executor = executor
+    
+    @property
+    def executor(self) -> RenderExecutor:
+        """Пул отрисовки; общий пул берется при обращении, после configure_executor"""
+        return self._executor if self._executor is not None else get_executor()
     
     async def _collect_additional_info(self, result: MatrixResult) -> Dict[str, any]:
         """Собирает дополнительную информацию с веб-сайтов"""
@@ -41,6 +49,8 @@ class ReportGenerator:
             }
         
         try:
+            from data_collector import WebScraper, MATRIX_SOURCES, MATRIX_KEYWORDS
+            
             # Подготавливаем конфигурацию источников
             sources_config = [
                 {
@@ -70,103 +80,84 @@ class ReportGenerator:
                 'images': []
             }
     
+    def _report_header_parts(self, data: MatrixData, result: MatrixResult,
+                             locale: str = DEFAULT_LOCALE) -> List[str]:
+        """Персональная часть отчета (до полных интерпретаций) кусками для join"""
+        keys = result.interpretation_keys
+        values = {
+            'name': data.name,
+            'birth_date': data.birth_date.strftime('%d.%m.%Y'),
+            'day': str(result.day),
+            'month': str(result.month),
+            'year': str(result.year),
+            'year_reduced': str(result.year_reduced),
+            'personal_number': str(result.personal_number),
+            'destiny_number': str(result.destiny_number),
+            'soul_number': str(result.soul_number),
+            'personality_number': str(result.personality_number),
+            'life_path': str(result.life_path),
+            'expression': str(result.expression),
+            'karmic': ', '.join(map(str, result.karmic_numbers)) if result.karmic_numbers else 'Не обнаружено',
+            'matrix_center_preview': text_report.preview(
+                keys.get('matrix_center'), text_report.CENTER_PREVIEW_LENGTH, locale
+            ),
+        }
+        for position, value in result.matrix.items():
+            values[position] = str(value)
+        for field in text_report.PREVIEW_FIELDS:
+            values[f'{field}_preview'] = text_report.preview(
+                keys.get(field), text_report.PREVIEW_LENGTH, locale
+            )
+        return text_report.COMPILED_REPORT.render_parts(values)
+    
     def generate_text_report(self, data: MatrixData, result: MatrixResult, 
-                           additional_info: Optional[Dict] = None) -> str:
-        """Генерирует текстовый отчет"""
-        # Базовый отчет
-        report = f"""
-╔════════════════════════════════════════╗
-║     ЛИЧНАЯ МАТРИЦА СУДЬБЫ              ║
-╚════════════════════════════════════════╝
-
-👤 КЛИЕНТ: {data.name}
-📅 ДАТА РОЖДЕНИЯ: {data.birth_date.strftime('%d.%m.%Y')}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📊 ОСНОВНЫЕ ЧИСЛА:
-
-• День рождения: {result.day}
-• Месяц рождения: {result.month}
-• Год рождения: {result.year} (редуцировано: {result.year_reduced})
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🔢 КЛЮЧЕВЫЕ ЧИСЛА:
-
-• Личное число: {result.personal_number}
-  {result.interpretations.get('personal_number', '')[:200]}...
-
-• Число судьбы: {result.destiny_number}
-  {result.interpretations.get('destiny_number', '')[:200]}...
-
-• Число души: {result.soul_number}
-  {result.interpretations.get('soul_number', '')[:200]}...
-
-• Число личности: {result.personality_number}
-  {result.interpretations.get('personality_number', '')[:200]}...
-
-• Путь жизни: {result.life_path}
-  {result.interpretations.get('life_path', '')[:200]}...
-
-• Выражение: {result.expression}
-  {result.interpretations.get('expression', '')[:200]}...
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-🎯 МАТРИЦА СУДЬБЫ:
-
-        {result.matrix['top_left']}  |  {result.matrix['top_center']}  |  {result.matrix['top_right']}
-      ─────┼─────┼─────
-        {result.matrix['middle_left']}  |  {result.matrix['center']}  |  {result.matrix['middle_right']}
-      ─────┼─────┼─────
-        {result.matrix['bottom_left']}  |  {result.matrix['bottom_center']}  |  {result.matrix['bottom_right']}
-
-Центр матрицы (Число судьбы): {result.matrix['center']}
-{result.interpretations.get('matrix_center', '')[:300]}...
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-⚠️ КАРМИЧЕСКИЕ ЧИСЛА: {', '.join(map(str, result.karmic_numbers)) if result.karmic_numbers else 'Не обнаружено'}
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-📖 ПОЛНЫЕ ИНТЕРПРЕТАЦИИ:
-
-{self._format_interpretations(result.interpretations)}
-"""
-        
-        # Добавляем дополнительную информацию, если есть
-        if additional_info:
-            if additional_info.get('summary'):
-                report += f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                report += f"📚 КРАТКОЕ РЕЗЮМЕ ИЗ ИСТОЧНИКОВ:\n\n"
-                report += f"{additional_info['summary'][:500]}...\n"
-            
-            if additional_info.get('detailed_info'):
-                report += additional_info['detailed_info']
+                           additional_info: Optional[Dict] = None,
+                           locale: str = DEFAULT_LOCALE) -> str:
+        """Генерирует текстовый отчет
         
-        report += f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        report += f"✨ Отчет сгенерирован автоматически\n"
-        
-        return report
+        Фрагменты интерпретаций берутся готовыми по ключам (см. text_report),
+        на каждый отчет подставляются только данные клиента и числа.
+        """
+        parts = self._report_header_parts(data, result, locale)
+        parts += text_report.interpretation_sections(result.interpretation_keys, locale)
+        parts.append(text_report.SECTIONS_END)
+        parts += text_report.additional_sections(additional_info)
+        parts.append(text_report.REPORT_FOOTER)
+        return ''.join(parts)
+    
+    def generate_telegram_messages(self, data: MatrixData, result: MatrixResult,
+                                   additional_info: Optional[Dict] = None,
+                                   locale: str = DEFAULT_LOCALE) -> List[str]:
+        """Текстовый отчет в виде готовых сообщений Telegram (HTML, <pre>)
+        
+        Текст тот же, что у generate_text_report. Экранируются только
+        персональная часть и информация из источников: разделы
+        интерпретаций берутся экранированными из кэша по ключам.
+        """
+        header = ''.join(self._report_header_parts(data, result, locale))
+        return text_report.telegram_messages(
+            header, result.interpretation_keys, additional_info, locale
+        )
     
     async def generate_enhanced_report(self, data: MatrixData, result: MatrixResult) -> Dict[str, any]:
         """Генерирует расширенный отчет с информацией с веб-сайтов"""
         # Собираем дополнительную информацию
         additional_info = await self._collect_additional_info(result)
         
-        # Генерируем текстовый отчет
+        # Генерируем текстовый отчет (целиком и сообщениями для Telegram)
         text_report = self.generate_text_report(data, result, additional_info)
+        telegram_messages = self.generate_telegram_messages(data, result, additional_info)
         
-        # Генерируем визуализацию матрицы
-        visual_matrix = self.generate_visual_matrix(result)
+        # Генерируем визуализацию матрицы (отрисовка - в пуле)
+        visual_matrix = await self.generate_visual_matrix_async(result)
         
         # Обрабатываем изображения с сайтов
         processed_images = []
         if additional_info.get('images'):
             try:
-                async with ImageProcessor() as img_processor:
+                from data_collector import ImageProcessor
+                
+                async with ImageProcessor(executor=self.executor) as img_processor:
                     processed_images = await img_processor.process_images(
                         additional_info['images'],
                         max_images=3
@@ -176,135 +167,57 @@ class ReportGenerator:
         
         return {
             'text_report': text_report,
+            'telegram_messages': telegram_messages,
             'visual_matrix': visual_matrix,
             'additional_images': processed_images,
             'summary': additional_info.get('summary', '')
         }
     
-    def _format_interpretations(self, interpretations: Dict[str, str]) -> str:
-        """Форматирует интерпретации"""
-        text = ""
-        for key, value in interpretations.items():
-            if value:
-                title = key.replace('_', ' ').title()
-                text += f"\n{title}:\n{value.strip()}\n"
-        return text
-    
-    def generate_visual_matrix(self, result: MatrixResult) -> bytes:
-        """Генерирует визуальное изображение матрицы"""
-        # Создаем изображение
-        img_size = 600
-        img = Image.new('RGB', (img_size, img_size), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        # Параметры
-        cell_size = img_size // 3
-        border_width = 3
-        
-        # Цвета
-        bg_color = (255, 255, 255)
-        border_color = (0, 0, 0)
-        center_color = (255, 215, 0)  # Золотой для центра
-        
-        # Рисуем сетку
-        for i in range(4):
-            x = i * cell_size
-            y = i * cell_size
-            # Вертикальные линии
-            draw.rectangle([x, 0, x + border_width, img_size], fill=border_color)
-            # Горизонтальные линии
-            draw.rectangle([0, y, img_size, y + border_width], fill=border_color)
-        
-        # Заполняем ячейки
-        positions = {
-            'top_left': (0, 0),
-            'top_center': (1, 0),
-            'top_right': (2, 0),
-            'middle_left': (0, 1),
-            'center': (1, 1),
-            'middle_right': (2, 1),
-            'bottom_left': (0, 2),
-            'bottom_center': (1, 2),
-            'bottom_right': (2, 2),
-        }
-        
-        # Рисуем числа в ячейках
-        # Пытаемся найти подходящий шрифт
-        font = None
-        font_paths = [
-            "/System/Library/Fonts/Helvetica.ttc",  # macOS
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",  # Linux
-            "C:/Windows/Fonts/arial.ttf",  # Windows
-        ]
-        
-        for path in font_paths:
-            try:
-                if os.path.exists(path):
-                    font = ImageFont.truetype(path, 60)
-                    break
-            except:
-                continue
+    def generate_visual_matrix(self, result: MatrixResult, image_format: str = 'png') -> bytes:
+        """Генерирует визуальное изображение матрицы
         
-        if font is None:
-            try:
-                font = ImageFont.truetype("arial.ttf", 60)
-            except:
-                font = ImageFont.load_default()
+        Изображение зависит только от значений ячеек, поэтому готовые
+        байты берутся из кэша по кортежу значений и формату.
         
-        for key, (col, row) in positions.items():
-            x = col * cell_size + cell_size // 2
-            y = row * cell_size + cell_size // 2
-            
-            # Выделяем центр
-            if key == 'center':
-                margin = 10
-                draw.rectangle(
-                    [col * cell_size + margin, row * cell_size + margin,
-                     (col + 1) * cell_size - margin, (row + 1) * cell_size - margin],
-                    fill=center_color, outline=border_color, width=2
-                )
-            
-            # Рисуем число
-            number = str(result.matrix[key])
-            bbox = draw.textbbox((0, 0), number, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            draw.text(
-                (x - text_width // 2, y - text_height // 2),
-                number,
-                fill=(0, 0, 0),
-                font=font
-            )
+        Args:
+            image_format: 'png' (палитра, по умолчанию - самый компактный
+                из совместимых), 'webp' (без потерь), 'jpeg' или 'svg'
+                (строковый шаблон без PIL и без кэша)
+        """
+        if image_format == 'svg':
+            return self.generate_visual_matrix_svg(result).encode('utf-8')
+        return self.image_cache.get_or_render(
+            matrix_key(result.matrix),
+            lambda: self._render_visual_matrix(result.matrix, image_format),
+            image_format
+        )
+    
+    async def generate_visual_matrix_async(self, result: MatrixResult,
+                                           image_format: str = 'png') -> bytes:
+        """То же, что generate_visual_matrix, но отрисовка идет в пуле
         
-        # Добавляем подпись
-        try:
-            if font != ImageFont.load_default() and font_paths:
-                label_font = ImageFont.truetype(font_paths[0], 20)
-            else:
-                label_font = ImageFont.load_default()
-        except:
-            label_font = ImageFont.load_default()
+        Попадание в кэш и SVG возвращаются сразу, без обращения к пулу.
+        """
+        if image_format == 'svg':
+            return self.generate_visual_matrix_svg(result).encode('utf-8')
         
-        # Расширяем изображение для подписи
-        label_height = 40
-        new_img = Image.new('RGB', (img_size, img_size + label_height), color='white')
-        new_img.paste(img, (0, 0))
+        from .compositor import render_matrix_image
         
-        draw = ImageDraw.Draw(new_img)
-        label_text = "Матрица судьбы"
-        bbox = draw.textbbox((0, 0), label_text, font=label_font)
-        text_width = bbox[2] - bbox[0]
-        draw.text(
-            ((img_size - text_width) // 2, img_size + 10),
-            label_text,
-            fill=(0, 0, 0),
-            font=label_font
-        )
+        key = matrix_key(result.matrix)
+        visual = self.image_cache.get(key, image_format)
+        if visual is None:
+            visual = await self.executor.run(render_matrix_image, dict(result.matrix), image_format)
+            self.image_cache.put(key, visual, image_format)
+        return visual
+    
+    def generate_visual_matrix_svg(self, result: MatrixResult) -> str:
+        """SVG матрицы: та же сетка 3x3, отрисовка - одна подстановка в шаблон"""
+        from .svg import render_svg
         
-        # Сохраняем в bytes
-        img_bytes = io.BytesIO()
-        new_img.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
+        return render_svg(result.matrix)
+    
+    def _render_visual_matrix(self, matrix: Dict[str, int], image_format: str = 'png') -> bytes:
+        """Отрисовывает изображение матрицы из готовых фона и спрайтов"""
+        from .compositor import render_matrix_image
         
-        return img_bytes.getvalue()
+        return render_matrix_image(matrix, image_format)
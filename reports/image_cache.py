@@ -0,0 +1,150 @@
+"""Кэш изображений матрицы с адресацией по содержимому
+
+Изображение матрицы зависит только от девяти значений ячеек, поэтому
+ключ - кортеж значений в порядке MATRIX_POSITIONS (плюс версия отрисовки
+и формат). Перед диском стоит LRU в памяти; дисковый каталог
+необязателен и ограничен по суммарному размеру.
+"""
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from matrix_calculator.cache import LRUCache
+from matrix_calculator.models import MATRIX_POSITIONS
+
+logger = logging.getLogger(__name__)
+
+# Увеличивается при любом изменении отрисовки - старые файлы на диске
+# перестают совпадать по имени
+RENDER_VERSION = 3
+
+CellKey = Tuple[int, ...]
+
+
+def matrix_key(matrix: Dict[str, int]) -> CellKey:
+    """Ключ изображения: значения ячеек в порядке MATRIX_POSITIONS"""
+    return tuple(matrix[position] for position in MATRIX_POSITIONS)
+
+
+class ImageCache:
+    """Кэш готовых изображений: LRU в памяти и необязательный каталог на диске"""
+
+    def __init__(self, maxsize: int = 1024, directory: Optional[str] = None,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            maxsize: Число изображений в памяти (0 - без кэша в памяти)
+            directory: Каталог для файлов (None - только память)
+            disk_max_bytes: Предел суммарного размера файлов в каталоге
+        """
+        self.memory = LRUCache(maxsize)
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_writes = 0
+        self.renders = 0
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(directory)
+                                   if entry.is_file())
+
+    def _path(self, key: CellKey, image_format: str) -> str:
+        name = '-'.join(map(str, key))
+        return os.path.join(self.directory, f'v{RENDER_VERSION}_{name}.{image_format.lower()}')
+
+    def _read_disk(self, key: CellKey, image_format: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key, image_format), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.disk_misses += 1
+            return None
+        self.disk_hits += 1
+        return data
+
+    def _write_disk(self, key: CellKey, image_format: str, data: bytes) -> None:
+        path = self._path(key, image_format)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить изображение в кэш: {e}")
+            return
+        self.disk_writes += 1
+        with self._disk_lock:
+            self._disk_bytes += len(data)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Удаляет самые старые файлы, пока каталог не станет меньше 90% предела"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.disk_max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def get(self, key: CellKey, image_format: str = 'png') -> Optional[bytes]:
+        """Готовые байты изображения из памяти или с диска (None - нужна отрисовка)"""
+        memory_key = (key, image_format)
+        data = self.memory.get(memory_key)
+        if data is None and self.directory:
+            data = self._read_disk(key, image_format)
+            if data is not None:
+                self.memory.set(memory_key, data)
+        return data
+
+    def put(self, key: CellKey, data: bytes, image_format: str = 'png') -> None:
+        """Сохраняет только что отрисованное изображение"""
+        self.renders += 1
+        if self.directory:
+            self._write_disk(key, image_format, data)
+        self.memory.set((key, image_format), data)
+
+    def get_or_render(self, key: CellKey, render: Callable[[], bytes],
+                      image_format: str = 'png') -> bytes:
+        """Возвращает готовые байты изображения или отрисовывает и сохраняет их"""
+        data = self.get(key, image_format)
+        if data is None:
+            data = render()
+            self.put(key, data, image_format)
+        return data
+
+    def clear(self) -> None:
+        """Очищает кэш в памяти (файлы на диске остаются)"""
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики для мониторинга"""
+        requests = self.memory.hits + self.memory.misses
+        served = requests - self.renders
+        return {
+            'memory': self.memory.stats(),
+            'disk': {
+                'enabled': bool(self.directory),
+                'hits': self.disk_hits,
+                'misses': self.disk_misses,
+                'writes': self.disk_writes,
+                'bytes': self._disk_bytes,
+                'max_bytes': self.disk_max_bytes,
+            },
+            'renders': self.renders,
+            'hit_rate': served / requests if requests else 0.0,
+        }
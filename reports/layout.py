@@ -0,0 +1,36 @@
+"""Геометрия и цвета изображения матрицы
+
+Общие для растровой сборки (compositor) и SVG (svg); модуль не
+загружает PIL.
+"""
+from matrix_calculator.models import MATRIX_POSITIONS
+
+IMAGE_SIZE = 600
+CELL_SIZE = IMAGE_SIZE // 3
+FONT_SIZE = 60
+LABEL_FONT_SIZE = 20
+BORDER_WIDTH = 3
+CENTER_MARGIN = 10
+LABEL_HEIGHT = 40
+LABEL_TEXT = "Матрица судьбы"
+
+BORDER_COLOR = (0, 0, 0)
+CENTER_COLOR = (255, 215, 0)  # Золотой для центра
+TEXT_COLOR = (0, 0, 0)
+
+# Возможные значения ячеек: 0-9 и мастер-числа
+CELL_VALUES = tuple(range(10)) + (11, 22)
+
+# Позиция -> (столбец, строка)
+CELL_COORDS = {
+    position: (index % 3, index // 3) for index, position in enumerate(MATRIX_POSITIONS)
+}
+
+# Формат изображения -> MIME-тип
+MEDIA_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'svg': 'image/svg+xml',
+}
+DEFAULT_FORMAT = 'png'
@@ -1,4 +1,5 @@
 """Генератор PDF отчетов"""
+import threading
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
@@ -6,9 +7,91 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from io import BytesIO
+from xml.sax.saxutils import escape
+from typing import Dict, Optional, Tuple
+from matrix_calculator.interpretations import DEFAULT_LOCALE
 from matrix_calculator.models import MatrixData, MatrixResult
-from PIL import Image as PILImage
-import io
+from rendering.executor import RenderExecutor, get_executor
+
+
+NUMBERS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ECF0F1')])
+])
+
+MATRIX_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 20),
+    ('GRID', (0, 0), (-1, -1), 2, colors.black),
+    ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#F39C12')),  # Центр
+    ('TEXTCOLOR', (1, 1), (1, 1), colors.white),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 20),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 20),
+    ('TOPPADDING', (0, 0), (-1, -1), 20),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
+])
+
+INTERPRETATION_TITLES = {
+    'personal_number': 'Личное число',
+    'destiny_number': 'Число судьбы',
+    'soul_number': 'Число души',
+    'personality_number': 'Число личности',
+    'life_path': 'Путь жизни',
+    'expression': 'Выражение',
+}
+
+
+class ParsedText:
+    """Разобранная разметка абзаца и разбиения на строки по ширинам"""
+    
+    __slots__ = ('text', 'style', 'frags', 'lines')
+    
+    def __init__(self, text: str, style: ParagraphStyle):
+        paragraph = Paragraph(text, style)
+        self.text = paragraph.text
+        self.style = paragraph.style
+        self.frags = paragraph.frags
+        self.lines: Dict[Tuple[float, ...], tuple] = {}
+    
+    def paragraph(self) -> 'CachedParagraph':
+        """Новый абзац для документа без повторного разбора разметки"""
+        return CachedParagraph(self.text, self.style, frags=list(self.frags), parsed=self)
+
+
+class CachedParagraph(Paragraph):
+    """Paragraph, берущий разбиение на строки из ParsedText
+    
+    Разбиение зависит только от текста, стиля и ширин строк, а ширина
+    кадра одинакова во всех документах. Части, получающиеся при переносе
+    абзаца на следующую страницу, создаются без parsed и считаются обычно.
+    """
+    
+    def __init__(self, text, style=None, bulletText=None, frags=None,
+                 caseSensitive=1, encoding='utf8', parsed: Optional[ParsedText] = None):
+        super().__init__(text, style, bulletText, frags, caseSensitive, encoding)
+        self._parsed = parsed
+    
+    def breakLines(self, width):
+        if self._parsed is None:
+            return super().breakLines(width)
+        key = tuple(width) if isinstance(width, (list, tuple)) else (width,)
+        cached = self._parsed.lines.get(key)
+        if cached is None:
+            blPara = super().breakLines(width)
+            # breakLines также выставляет _width_max и может заменить frags
+            self._parsed.lines[key] = (blPara, self._width_max, self.frags)
+            return blPara
+        blPara, self._width_max, self.frags = cached
+        return blPara
 
 
 class PDFGenerator:
@@ -17,6 +100,36 @@ class PDFGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_styles()
+        self._parsed: Dict[tuple, ParsedText] = {}
+        self._lock = threading.Lock()
+    
+    def __reduce__(self):
+        # Для пула процессов: StyleSheet1 не восстанавливается из pickle,
+        # а настроек у генератора нет - в процессе берется общий генератор
+        return get_pdf_generator, ()
+    
+    def _cached(self, key: tuple, build) -> ParsedText:
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            with self._lock:
+                parsed = self._parsed.get(key)
+                if parsed is None:
+                    parsed = self._parsed[key] = build()
+        return parsed
+    
+    def _paragraph(self, text: str, style_name: str) -> Paragraph:
+        """Абзац с неизменным текстом (заголовки, подписи)"""
+        style = self.styles[style_name]
+        return self._cached(('text', style_name, text), lambda: ParsedText(text, style)).paragraph()
+    
+    def _interpretation_paragraph(self, key: str, text: str, locale: str) -> Paragraph:
+        """Абзац текста интерпретации; разметка разбирается один раз на ключ"""
+        style = self.styles['CustomBody']
+        # Очищаем от лишних переносов строк
+        return self._cached(
+            ('interpretation', locale, key),
+            lambda: ParsedText(' '.join(text.split()), style)
+        ).paragraph()
     
     def _setup_styles(self):
         """Настройка стилей"""
@@ -50,20 +163,25 @@ class PDFGenerator:
             spaceAfter=6
         ))
     
-    def generate_pdf(self, data: MatrixData, result: MatrixResult) -> bytes:
+    async def generate_pdf_async(self, data: MatrixData, result: MatrixResult,
+                                 executor: Optional[RenderExecutor] = None) -> bytes:
+        """Генерирует PDF в пуле отрисовки, не блокируя цикл событий"""
+        return await (executor or get_executor()).run(self.generate_pdf, data, result)
+    
+    def generate_pdf(self, data: MatrixData, result: MatrixResult,
+                     locale: str = DEFAULT_LOCALE) -> bytes:
         """Генерирует PDF отчет"""
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         story = []
         
         # Заголовок
-        title = Paragraph("ЛИЧНАЯ МАТРИЦА СУДЬБЫ", self.styles['CustomTitle'])
-        story.append(title)
+        story.append(self._paragraph("ЛИЧНАЯ МАТРИЦА СУДЬБЫ", 'CustomTitle'))
         story.append(Spacer(1, 10*mm))
         
         # Информация о клиенте
         client_info = f"""
-        <b>Имя:</b> {data.name}<br/>
+        <b>Имя:</b> {escape(data.name)}<br/>
         <b>Дата рождения:</b> {data.birth_date.strftime('%d.%m.%Y')}<br/>
         """
         if data.gender:
@@ -74,7 +192,7 @@ class PDFGenerator:
         story.append(Spacer(1, 10*mm))
         
         # Основные числа
-        story.append(Paragraph("ОСНОВНЫЕ ЧИСЛА", self.styles['CustomHeading']))
+        story.append(self._paragraph("ОСНОВНЫЕ ЧИСЛА", 'CustomHeading'))
         
         numbers_data = [
             ['Параметр', 'Значение'],
@@ -90,23 +208,13 @@ class PDFGenerator:
         ]
         
         numbers_table = Table(numbers_data, colWidths=[100*mm, 90*mm])
-        numbers_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ECF0F1')])
-        ]))
+        numbers_table.setStyle(NUMBERS_TABLE_STYLE)
         
         story.append(numbers_table)
         story.append(Spacer(1, 10*mm))
         
         # Матрица
-        story.append(Paragraph("МАТРИЦА СУДЬБЫ", self.styles['CustomHeading']))
+        story.append(self._paragraph("МАТРИЦА СУДЬБЫ", 'CustomHeading'))
         
         matrix_data = [
             [
@@ -127,59 +235,37 @@ class PDFGenerator:
         ]
         
         matrix_table = Table(matrix_data, colWidths=[60*mm, 60*mm, 60*mm])
-        matrix_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 20),
-            ('GRID', (0, 0), (-1, -1), 2, colors.black),
-            ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#F39C12')),  # Центр
-            ('TEXTCOLOR', (1, 1), (1, 1), colors.white),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 20),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 20),
-            ('TOPPADDING', (0, 0), (-1, -1), 20),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
-        ]))
+        matrix_table.setStyle(MATRIX_TABLE_STYLE)
         
         story.append(matrix_table)
         story.append(Spacer(1, 10*mm))
         
         # Кармические числа
         if result.karmic_numbers:
-            story.append(Paragraph("КАРМИЧЕСКИЕ ЧИСЛА", self.styles['CustomHeading']))
+            story.append(self._paragraph("КАРМИЧЕСКИЕ ЧИСЛА", 'CustomHeading'))
             karmic_text = f"Обнаружены кармические числа: {', '.join(map(str, result.karmic_numbers))}"
-            story.append(Paragraph(karmic_text, self.styles['CustomBody']))
+            story.append(self._paragraph(karmic_text, 'CustomBody'))
             story.append(Spacer(1, 10*mm))
         
         # Интерпретации
-        story.append(Paragraph("ИНТЕРПРЕТАЦИИ", self.styles['CustomHeading']))
-        
-        interpretations_map = {
-            'personal_number': 'Личное число',
-            'destiny_number': 'Число судьбы',
-            'soul_number': 'Число души',
-            'personality_number': 'Число личности',
-            'life_path': 'Путь жизни',
-            'expression': 'Выражение',
-        }
-        
-        for key, title in interpretations_map.items():
-            if key in result.interpretations and result.interpretations[key]:
-                story.append(Paragraph(f"<b>{title}</b>", self.styles['CustomBody']))
-                interpretation = result.interpretations[key].strip()
-                # Очищаем от лишних переносов строк
-                interpretation = ' '.join(interpretation.split())
-                story.append(Paragraph(interpretation, self.styles['CustomBody']))
+        story.append(self._paragraph("ИНТЕРПРЕТАЦИИ", 'CustomHeading'))
+        
+        interpretations = result.interpretation_texts(locale)
+        for field, title in INTERPRETATION_TITLES.items():
+            if interpretations.get(field):
+                story.append(self._paragraph(f"<b>{title}</b>", 'CustomBody'))
+                story.append(self._interpretation_paragraph(
+                    result.interpretation_keys[field], interpretations[field], locale
+                ))
                 story.append(Spacer(1, 5*mm))
         
         # Футер
         story.append(Spacer(1, 20*mm))
-        footer = Paragraph(
+        story.append(self._paragraph(
             f"<i>Отчет сгенерирован автоматически<br/>"
-            f"Дата создания: {result.model_dump().get('created_at', 'N/A')}</i>",
-            self.styles['Normal']
-        )
-        story.append(footer)
+            f"Дата создания: {getattr(result, 'created_at', 'N/A')}</i>",
+            'Normal'
+        ))
         
         # Собираем PDF
         doc.build(story)
@@ -187,7 +273,30 @@ class PDFGenerator:
         return buffer.getvalue()
 
 
+_generator: Optional[PDFGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_pdf_generator() -> PDFGenerator:
+    """Общий генератор процесса: стили и кэш абзацев создаются один раз
+    
+    Генератор потокобезопасен: кэшированные данные после построения только
+    читаются, а абзацы создаются на каждый документ.
+    """
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = PDFGenerator()
+    return _generator
+
+
 def generate_pdf_report(data: MatrixData, result: MatrixResult) -> bytes:
     """Удобная функция для генерации PDF"""
-    generator = PDFGenerator()
-    return generator.generate_pdf(data, result)
+    return get_pdf_generator().generate_pdf(data, result)
+
+
+async def generate_pdf_report_async(data: MatrixData, result: MatrixResult,
+                                    executor: Optional[RenderExecutor] = None) -> bytes:
+    """generate_pdf_report в пуле отрисовки"""
+    return await (executor or get_executor()).run(generate_pdf_report, data, result)
@@ -0,0 +1,171 @@
+"""Очередь фоновой генерации PDF
+
+Сборка PDF занимает десятки миллисекунд и блокирует поток, поэтому
+обработчик только ставит задачу и сразу возвращает ее идентификатор.
+Задачи выполняются в отдельном пуле отрисовки; число незавершенных
+задач ограничено, при переполнении submit() выбрасывает QueueFullError.
+Готовые PDF кэшируются по (ячейки матрицы, имя, дата рождения, пол), а
+повторный запрос тех же данных, пока задача еще идет, получает ту же
+задачу.
+
+Методы очереди вызываются из цикла событий (обработчики FastAPI),
+поэтому состояние задач меняется только в одном потоке.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from matrix_calculator.cache import LRUCache
+from matrix_calculator.models import MatrixData, MatrixResult
+from rendering.executor import RenderExecutor
+from .image_cache import matrix_key
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+ReportKey = Tuple[Tuple[int, ...], str, date, Optional[str]]
+
+
+class QueueFullError(Exception):
+    """Очередь генерации PDF заполнена"""
+
+
+def report_key(data: MatrixData, result: MatrixResult) -> ReportKey:
+    """Ключ кэша PDF: ячейки матрицы и данные клиента, попадающие в отчет"""
+    return matrix_key(result.matrix), data.name, data.birth_date, data.gender
+
+
+def build_pdf(data: MatrixData, result: MatrixResult) -> bytes:
+    """Собирает PDF (выполняется в пуле; reportlab загружается там же)"""
+    from .pdf_generator import generate_pdf_report
+
+    return generate_pdf_report(data, result)
+
+
+class PDFJob:
+    """Задача генерации PDF"""
+
+    __slots__ = ('id', 'key', 'status', 'pdf', 'error', 'created_at', 'finished_at', 'task')
+
+    def __init__(self, key: ReportKey):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = PENDING
+        self.pdf: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def finish(self, pdf: Optional[bytes] = None, error: Optional[str] = None) -> None:
+        self.status = FAILED if error is not None else DONE
+        self.pdf = pdf
+        self.error = error
+        self.finished_at = time.time()
+        self.task = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'size': len(self.pdf) if self.pdf is not None else None,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class PDFJobQueue:
+    """Ограниченная очередь задач PDF с кэшем готовых отчетов"""
+
+    def __init__(self, executor: RenderExecutor, max_pending: int = 32,
+                 cache_size: int = 256, max_jobs: int = 1000):
+        """
+        Args:
+            executor: Пул, в котором собираются PDF
+            max_pending: Предел незавершенных задач (дальше - QueueFullError)
+            cache_size: Число готовых PDF в кэше
+            max_jobs: Сколько задач хранить для запросов статуса
+        """
+        self.executor = executor
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.cache = LRUCache(cache_size)
+        self._jobs: 'OrderedDict[str, PDFJob]' = OrderedDict()
+        self._pending: Dict[ReportKey, PDFJob] = {}
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, data: MatrixData, result: MatrixResult) -> PDFJob:
+        """Ставит генерацию в очередь (или возвращает готовую/идущую задачу)"""
+        key = report_key(data, result)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+
+        job = PDFJob(key)
+        pdf = self.cache.get(key)
+        if pdf is not None:
+            job.finish(pdf)
+        else:
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"Очередь генерации PDF заполнена ({self.max_pending} задач)"
+                )
+            self._pending[key] = job
+            job.task = asyncio.get_running_loop().create_task(self._run(job, data, result))
+        self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[PDFJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: PDFJob, data: MatrixData, result: MatrixResult) -> None:
+        try:
+            pdf = await self.executor.run(build_pdf, data, result)
+        except Exception as e:
+            logger.error(f"Ошибка генерации PDF: {e}", exc_info=True)
+            job.finish(error=str(e))
+            self.failed += 1
+        else:
+            self.cache.set(job.key, pdf)
+            job.finish(pdf)
+            self.completed += 1
+        finally:
+            self._pending.pop(job.key, None)
+
+    def _remember(self, job: PDFJob) -> None:
+        self._jobs[job.id] = job
+        # Вытесняем самые старые завершенные задачи; идущие остаются
+        while len(self._jobs) > self.max_jobs:
+            oldest = next(
+                (job_id for job_id, old in self._jobs.items() if old.status != PENDING), None
+            )
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def stats(self) -> Dict[str, Any]:
+        """Счетчики для мониторинга"""
+        return {
+            'pending': len(self._pending),
+            'max_pending': self.max_pending,
+            'jobs': len(self._jobs),
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'cache': self.cache.stats(),
+            'executor': self.executor.stats(),
+        }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,67 @@
+"""SVG изображения матрицы без PIL
+
+Разметка (фон, сетка, выделение центра, подпись) собирается один раз в
+строковый шаблон с девятью полями под значения ячеек, поэтому отрисовка
+сводится к одному str.format. Геометрия та же, что у растровой сборки
+(см. layout); шрифт выбирает клиент по списку font-family.
+"""
+from typing import Dict, Tuple
+from xml.sax.saxutils import escape
+
+from matrix_calculator.models import MATRIX_POSITIONS
+from .layout import (
+    BORDER_COLOR, BORDER_WIDTH, CELL_COORDS, CELL_SIZE, CENTER_COLOR, CENTER_MARGIN,
+    FONT_SIZE, IMAGE_SIZE, LABEL_FONT_SIZE, LABEL_HEIGHT, LABEL_TEXT, TEXT_COLOR,
+)
+
+FONT_FAMILY = "DejaVu Sans,Arial,Helvetica,sans-serif"
+
+
+def _hex(color: Tuple[int, int, int]) -> str:
+    return '#%02x%02x%02x' % color
+
+
+def _build_template() -> str:
+    """Шаблон SVG с полями {0:d}..{8:d} в порядке MATRIX_POSITIONS"""
+    width, height = IMAGE_SIZE, IMAGE_SIZE + LABEL_HEIGHT
+    # Линии как в растре: прямоугольник PIL включает обе границы, а линии
+    # правого и нижнего края выходят за квадрат сетки и не видны
+    line = BORDER_WIDTH + 1
+    grid = ''.join(
+        f'M{i * CELL_SIZE} 0h{line}v{IMAGE_SIZE}h-{line}z'
+        f'M0 {i * CELL_SIZE}h{IMAGE_SIZE}v{line}h-{IMAGE_SIZE}z'
+        for i in range(3)
+    )
+    col, row = CELL_COORDS['center']
+    center_size = CELL_SIZE - 2 * CENTER_MARGIN
+
+    cells = ''.join(
+        f'<text x="{cell_col * CELL_SIZE + CELL_SIZE // 2}" '
+        f'y="{cell_row * CELL_SIZE + CELL_SIZE // 2}">{{{index}:d}}</text>'
+        for index, (cell_col, cell_row) in enumerate(
+            CELL_COORDS[position] for position in MATRIX_POSITIONS
+        )
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">'
+        f'<rect width="{width}" height="{height}" fill="#fff"/>'
+        f'<path d="{grid}" fill="{_hex(BORDER_COLOR)}"/>'
+        f'<rect x="{col * CELL_SIZE + CENTER_MARGIN}" y="{row * CELL_SIZE + CENTER_MARGIN}" '
+        f'width="{center_size}" height="{center_size}" fill="{_hex(CENTER_COLOR)}" '
+        f'stroke="{_hex(BORDER_COLOR)}" stroke-width="2"/>'
+        f'<g font-family="{FONT_FAMILY}" font-weight="bold" text-anchor="middle" '
+        f'dominant-baseline="central" fill="{_hex(TEXT_COLOR)}">'
+        f'<g font-size="{FONT_SIZE}">{cells}</g>'
+        f'<text x="{IMAGE_SIZE // 2}" y="{IMAGE_SIZE + LABEL_HEIGHT // 2}" '
+        f'font-size="{LABEL_FONT_SIZE}">{escape(LABEL_TEXT)}</text>'
+        f'</g></svg>'
+    )
+
+
+SVG_TEMPLATE = _build_template()
+
+
+def render_svg(matrix: Dict[str, int]) -> str:
+    """SVG матрицы; значения ячеек должны быть целыми числами"""
+    return SVG_TEMPLATE.format(*[matrix[position] for position in MATRIX_POSITIONS])
@@ -0,0 +1,300 @@
+"""Шаблон текстового отчета и готовые фрагменты интерпретаций
+
+Тексты интерпретаций зависят только от ключа (number_N) и локали,
+поэтому начало текста для краткой части и раздел полных интерпретаций
+готовятся один раз на ключ. Шаблон разбирается при импорте на
+неизменные куски и поля; отчет собирается одним join из кусков шаблона,
+значений полей и готовых разделов, без промежуточных строк.
+
+Для Telegram отчет делится на сообщения по границам разделов и
+экранируется для parse_mode=HTML один раз: разделы интерпретаций
+хранятся уже экранированными, на запрос экранируется только
+персональная часть.
+"""
+import html
+import string
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from matrix_calculator.interpretations import DEFAULT_LOCALE, get_interpretation_text
+
+PREVIEW_LENGTH = 200
+CENTER_PREVIEW_LENGTH = 300
+
+SEPARATOR = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+REPORT_TEMPLATE = """
+╔════════════════════════════════════════╗
+║     ЛИЧНАЯ МАТРИЦА СУДЬБЫ              ║
+╚════════════════════════════════════════╝
+
+👤 КЛИЕНТ: {name}
+📅 ДАТА РОЖДЕНИЯ: {birth_date}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📊 ОСНОВНЫЕ ЧИСЛА:
+
+• День рождения: {day}
+• Месяц рождения: {month}
+• Год рождения: {year} (редуцировано: {year_reduced})
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+🔢 КЛЮЧЕВЫЕ ЧИСЛА:
+
+• Личное число: {personal_number}
+  {personal_number_preview}...
+
+• Число судьбы: {destiny_number}
+  {destiny_number_preview}...
+
+• Число души: {soul_number}
+  {soul_number_preview}...
+
+• Число личности: {personality_number}
+  {personality_number_preview}...
+
+• Путь жизни: {life_path}
+  {life_path_preview}...
+
+• Выражение: {expression}
+  {expression_preview}...
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+🎯 МАТРИЦА СУДЬБЫ:
+
+        {top_left}  |  {top_center}  |  {top_right}
+      ─────┼─────┼─────
+        {middle_left}  |  {center}  |  {middle_right}
+      ─────┼─────┼─────
+        {bottom_left}  |  {bottom_center}  |  {bottom_right}
+
+Центр матрицы (Число судьбы): {center}
+{matrix_center_preview}...
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+⚠️ КАРМИЧЕСКИЕ ЧИСЛА: {karmic}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📖 ПОЛНЫЕ ИНТЕРПРЕТАЦИИ:
+
+"""
+
+
+class CompiledTemplate:
+    """Шаблон str.format, разобранный на куски и места подстановки полей"""
+
+    def __init__(self, template: str):
+        self.parts: List[Optional[str]] = []
+        self.slots: Dict[str, List[int]] = {}
+        for literal, field, _, _ in string.Formatter().parse(template):
+            if literal:
+                self.parts.append(literal)
+            if field is not None:
+                self.slots.setdefault(field, []).append(len(self.parts))
+                self.parts.append(None)
+
+    def render_parts(self, values: Dict[str, str]) -> List[str]:
+        """Куски шаблона с подставленными значениями (для ''.join)"""
+        parts = self.parts.copy()
+        for field, indices in self.slots.items():
+            value = values[field]
+            for index in indices:
+                parts[index] = value
+        return parts
+
+
+COMPILED_REPORT = CompiledTemplate(REPORT_TEMPLATE)
+
+# Поля с кратким текстом интерпретации в разделе ключевых чисел
+PREVIEW_FIELDS = (
+    'personal_number', 'destiny_number', 'soul_number',
+    'personality_number', 'life_path', 'expression',
+)
+
+_previews: Dict[Tuple[str, str, int], str] = {}
+_sections: Dict[Tuple[str, str, str], str] = {}
+
+
+def preview(key: Optional[str], length: int = PREVIEW_LENGTH,
+            locale: str = DEFAULT_LOCALE) -> str:
+    """Первые length символов интерпретации ('' без ключа)"""
+    if key is None:
+        return ''
+    cache_key = (locale, key, length)
+    text = _previews.get(cache_key)
+    if text is None:
+        text = _previews[cache_key] = get_interpretation_text(key, locale)[:length]
+    return text
+
+
+def section(field: str, key: str, locale: str = DEFAULT_LOCALE) -> str:
+    """Раздел полных интерпретаций для поля ('' для пустого текста)"""
+    cache_key = (locale, field, key)
+    text = _sections.get(cache_key)
+    if text is None:
+        value = get_interpretation_text(key, locale)
+        text = f"\n{field.replace('_', ' ').title()}:\n{value.strip()}\n" if value else ''
+        _sections[cache_key] = text
+    return text
+
+
+def interpretation_sections(keys: Dict[str, str], locale: str = DEFAULT_LOCALE) -> List[str]:
+    """Разделы полных интерпретаций в порядке ключей результата"""
+    return [section(field, key, locale) for field, key in keys.items()]
+
+
+def additional_sections(additional_info: Optional[Dict]) -> Iterable[str]:
+    """Фрагменты с информацией из внешних источников"""
+    if not additional_info:
+        return ()
+    parts = []
+    if additional_info.get('summary'):
+        parts.append(f"\n{SEPARATOR}\n📚 КРАТКОЕ РЕЗЮМЕ ИЗ ИСТОЧНИКОВ:\n\n"
+                     f"{additional_info['summary'][:500]}...\n")
+    if additional_info.get('detailed_info'):
+        parts.append(additional_info['detailed_info'])
+    return parts
+
+
+# После разделов интерпретаций: перевод строки из исходного шаблона отчета
+SECTIONS_END = "\n"
+REPORT_FOOTER = f"\n{SEPARATOR}\n✨ Отчет сгенерирован автоматически\n"
+
+
+# Telegram ограничивает сообщение 4096 символами UTF-16 после разбора
+# разметки. Длина считается по экранированному тексту: сущности (&lt;)
+# учитываются с запасом, emoji - как два символа
+TELEGRAM_MESSAGE_LIMIT = 4096
+_PRE_OPEN = '<pre>'
+_PRE_CLOSE = '</pre>'
+# Самая длинная сущность html.escape(quote=False) - &amp;
+_MAX_ENTITY_LENGTH = 5
+
+# Экранированный текст и его длина в символах UTF-16
+Block = Tuple[str, int]
+
+_telegram_sections: Dict[Tuple[str, str, str], Block] = {}
+
+
+def escape(text: str) -> str:
+    """Экранирование для parse_mode=HTML"""
+    return html.escape(text, quote=False)
+
+
+def utf16_length(text: str) -> int:
+    """Длина текста так, как ее считает Telegram"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def telegram_block(text: str) -> Block:
+    """Экранирует текст и считает его длину"""
+    escaped = escape(text)
+    return escaped, utf16_length(escaped)
+
+
+TELEGRAM_SECTIONS_END = telegram_block(SECTIONS_END)
+TELEGRAM_FOOTER = telegram_block(REPORT_FOOTER)
+
+
+def telegram_section(field: str, key: str, locale: str = DEFAULT_LOCALE) -> Block:
+    """Раздел полных интерпретаций, экранированный для HTML"""
+    cache_key = (locale, field, key)
+    block = _telegram_sections.get(cache_key)
+    if block is None:
+        block = _telegram_sections[cache_key] = telegram_block(section(field, key, locale))
+    return block
+
+
+def split_lines(text: str, limit: int) -> List[Block]:
+    """Делит экранированный текст на строки не длиннее limit
+
+    Строка длиннее limit режется по символам, но не внутри сущности
+    (&amp;, &lt;).
+    """
+    pieces = []
+    for line in text.splitlines(keepends=True):
+        units = utf16_length(line)
+        while units > limit:
+            # Символы вне BMP занимают по два символа UTF-16: срез
+            # укорачивается на превышение, пока не влезет в limit
+            cut = limit
+            excess = utf16_length(line[:cut]) - limit
+            while excess > 0:
+                cut -= excess
+                excess = utf16_length(line[:cut]) - limit
+            amp = line.rfind('&', cut - _MAX_ENTITY_LENGTH + 1, cut)
+            if amp > 0 and ';' not in line[amp:cut]:
+                cut = amp
+            head, line = line[:cut], line[cut:]
+            pieces.append((head, utf16_length(head)))
+            units = utf16_length(line)
+        if line:
+            pieces.append((line, units))
+    return pieces
+
+
+def _pack(blocks: Iterable[Block], limit: int, fill: bool = False) -> List[List[str]]:
+    """Складывает блоки подряд в сообщения не длиннее limit
+
+    Блок, не влезающий в текущее сообщение, начинает следующее; при
+    fill=True он делится по строкам и сначала дополняет текущее.
+    """
+    messages = []
+    current: List[str] = []
+    size = 0
+    for block in blocks:
+        units = block[1]
+        if current and size + units > limit:
+            pieces = split_lines(block[0], limit) if fill else (block,)
+        else:
+            pieces = (block,)
+        for text, units in pieces:
+            if current and size + units > limit:
+                messages.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += units
+    if current:
+        messages.append(current)
+    return messages
+
+
+def pack_messages(blocks: Iterable[Block], limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Собирает экранированные блоки в наименьшее число сообщений <pre>
+
+    Блоки (разделы отчета) идут целиком, пока помещаются в сообщение.
+    Если так выходит больше сообщений, чем при делении по строкам, разделы
+    на стыках сообщений делятся по строкам: разрыв раздела дешевле
+    лишнего вызова API.
+    """
+    body_limit = limit - len(_PRE_OPEN) - len(_PRE_CLOSE)
+    sections: List[Block] = []
+    for block in blocks:
+        if block[1] > body_limit:
+            sections += split_lines(block[0], body_limit)
+        elif block[1]:
+            sections.append(block)
+
+    messages = _pack(sections, body_limit)
+    total = sum(units for _, units in sections)
+    # Меньше, чем ceil(total / body_limit), сообщений не бывает
+    if len(messages) > -(-total // body_limit):
+        filled = _pack(sections, body_limit, fill=True)
+        if len(filled) < len(messages):
+            messages = filled
+    return [''.join([_PRE_OPEN, *parts, _PRE_CLOSE]) for parts in messages]
+
+
+def telegram_messages(header: str, keys: Dict[str, str], additional_info: Optional[Dict] = None,
+                      locale: str = DEFAULT_LOCALE) -> List[str]:
+    """Сообщения Telegram для отчета с готовой персональной частью header"""
+    blocks = [telegram_block(header)]
+    blocks += [telegram_section(field, key, locale) for field, key in keys.items()]
+    blocks.append(TELEGRAM_SECTIONS_END)
+    blocks += [telegram_block(part) for part in additional_sections(additional_info)]
+    blocks.append(TELEGRAM_FOOTER)
+    return pack_messages(blocks)
@@ -0,0 +1,60 @@
+"""Пакетный расчет совпадает с calculate_matrix для каждой строки"""
+import random
+from datetime import date
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from matrix_calculator import MatrixCalculator, MatrixData
+from matrix_calculator.models import MAX_NAME_LENGTH
+from matrix_calculator.name_engine import LATIN_TABLES
+
+NAMES = (
+    'Иван', 'Анна Петрова', 'Мария-Луиза Ёлкина', 'Ъ', 'John Smith', 'Xavier',
+    'Jo {x}', 'Иван Smith', '', ' ', '42', 'Щ' * MAX_NAME_LENGTH,
+)
+
+# Границы datetime64 и годы вне таблиц 1900-2100
+EDGE_DATES = (
+    date(1, 1, 1), date(1, 12, 31), date(1850, 2, 28), date(1899, 12, 31),
+    date(1900, 1, 1), date(2100, 12, 31), date(2101, 1, 1), date(2500, 6, 15),
+    date(9999, 12, 31),
+)
+
+
+def _dates(count: int = 400, seed: int = 2):
+    rng = random.Random(seed)
+    first, last = date(1, 1, 1).toordinal(), date(9999, 12, 31).toordinal()
+    inside = date(1900, 1, 1).toordinal(), date(2100, 12, 31).toordinal()
+    dates = list(EDGE_DATES)
+    for _ in range(count):
+        low, high = inside if rng.random() < 0.5 else (first, last)
+        dates.append(date.fromordinal(rng.randint(low, high)))
+    return dates
+
+
+@pytest.mark.parametrize('latin', sorted(LATIN_TABLES))
+def test_batch_matches_calculate_matrix(latin):
+    calculator = MatrixCalculator(latin=latin)
+    rng = random.Random(latin)
+    dates = _dates()
+    names = [rng.choice(NAMES) for _ in dates]
+
+    batch = calculator.calculate_batch(dates, names)
+    assert len(batch) == len(dates)
+    for index, (birth_date, name) in enumerate(zip(dates, names)):
+        expected = calculator.calculate_matrix(MatrixData(birth_date=birth_date, name=name))
+        assert batch.to_result(index).model_dump() == expected.model_dump(), (birth_date, name)
+
+
+def test_batch_numpy_dates():
+    import numpy as np
+
+    calculator = MatrixCalculator()
+    dates = list(EDGE_DATES)
+    names = ['Анна'] * len(dates)
+    from_dates = calculator.calculate_batch(dates, names)
+    from_array = calculator.calculate_batch(np.array(dates, dtype='datetime64[D]'), names)
+    for index in range(len(dates)):
+        assert from_array.to_result(index).model_dump() == from_dates.to_result(index).model_dump()
@@ -0,0 +1,79 @@
+"""Сборка из спрайтов попиксельно совпадает с последовательной отрисовкой"""
+import random
+
+import pytest
+
+pytest.importorskip('PIL')
+pytest.importorskip('numpy')
+
+from PIL import Image, ImageDraw
+
+from reports.compositor import MatrixCompositor, to_palette
+from reports.layout import (
+    BORDER_COLOR, BORDER_WIDTH, CELL_COORDS, CELL_SIZE, CELL_VALUES, CENTER_COLOR,
+    CENTER_MARGIN, IMAGE_SIZE, LABEL_HEIGHT, LABEL_TEXT, TEXT_COLOR,
+)
+from matrix_calculator.models import MATRIX_POSITIONS
+
+
+def draw_reference(matrix, font, label_font) -> Image.Image:
+    """Прямая отрисовка всех элементов, как до появления компоновщика"""
+    image = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE), color='white')
+    draw = ImageDraw.Draw(image)
+    for i in range(4):
+        x = y = i * CELL_SIZE
+        draw.rectangle([x, 0, x + BORDER_WIDTH, IMAGE_SIZE], fill=BORDER_COLOR)
+        draw.rectangle([0, y, IMAGE_SIZE, y + BORDER_WIDTH], fill=BORDER_COLOR)
+
+    for position, (col, row) in CELL_COORDS.items():
+        x = col * CELL_SIZE + CELL_SIZE // 2
+        y = row * CELL_SIZE + CELL_SIZE // 2
+        if position == 'center':
+            draw.rectangle(
+                [col * CELL_SIZE + CENTER_MARGIN, row * CELL_SIZE + CENTER_MARGIN,
+                 (col + 1) * CELL_SIZE - CENTER_MARGIN, (row + 1) * CELL_SIZE - CENTER_MARGIN],
+                fill=CENTER_COLOR, outline=BORDER_COLOR, width=2
+            )
+        number = str(matrix[position])
+        bbox = draw.textbbox((0, 0), number, font=font)
+        draw.text((x - (bbox[2] - bbox[0]) // 2, y - (bbox[3] - bbox[1]) // 2),
+                  number, fill=TEXT_COLOR, font=font)
+
+    result = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE + LABEL_HEIGHT), color='white')
+    result.paste(image, (0, 0))
+    draw = ImageDraw.Draw(result)
+    bbox = draw.textbbox((0, 0), LABEL_TEXT, font=label_font)
+    draw.text(((IMAGE_SIZE - (bbox[2] - bbox[0])) // 2, IMAGE_SIZE + 10),
+              LABEL_TEXT, fill=TEXT_COLOR, font=label_font)
+    return result
+
+
+def _matrices():
+    # Каждое значение во всех ячейках: и в обычном варианте, и в центре
+    matrices = [{position: value for position in MATRIX_POSITIONS} for value in CELL_VALUES]
+    rng = random.Random(3)
+    matrices += [
+        {position: rng.choice(CELL_VALUES) for position in MATRIX_POSITIONS}
+        for _ in range(20)
+    ]
+    # Значение вне CELL_VALUES: спрайт рисуется при первом появлении
+    matrices.append({position: 33 for position in MATRIX_POSITIONS})
+    return matrices
+
+
+@pytest.fixture(scope='module')
+def compositor():
+    return MatrixCompositor()
+
+
+@pytest.mark.parametrize('matrix', _matrices())
+def test_render_matches_reference(compositor, matrix):
+    reference = draw_reference(matrix, compositor.font, compositor.label_font)
+    assert compositor.render(matrix).tobytes() == reference.tobytes()
+
+
+@pytest.mark.parametrize('matrix', _matrices()[:len(CELL_VALUES)])
+def test_palette_render_matches_reference(compositor, matrix):
+    reference = draw_reference(matrix, compositor.font, compositor.label_font)
+    expected = to_palette(reference, compositor.palette)
+    assert compositor.render(matrix, palette=True).tobytes() == expected.tobytes()
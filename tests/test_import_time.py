@@ -0,0 +1,55 @@
+"""Импорт API не загружает тяжелые зависимости и укладывается в бюджет
+
+Замер - в отдельном процессе (python -X importtime), чтобы модули,
+уже загруженные другими тестами, не влияли на результат.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Загружаются только при первом обращении (генерация изображений, PDF,
+# сбор данных с сайтов, векторные расчеты)
+LAZY_MODULES = ('PIL', 'reportlab', 'aiohttp', 'bs4', 'numpy')
+
+# Бюджет накопленного времени импорта api.main, мс. Сейчас ~0.9 с на
+# одном ядре, из них ~0.5 с пришлось бы на LAZY_MODULES; на медленной
+# машине бюджет задается IMPORT_TIME_BUDGET_MS
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 1500))
+
+_SCRIPT = (
+    "import sys, api.main; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+
+def _import_api():
+    env = dict(os.environ)
+    env.setdefault('TELEGRAM_BOT_TOKEN', 'test')
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return process.stdout.strip(), process.stderr
+
+
+def _cumulative_us(importtime: str, module: str) -> int:
+    """Накопленное время импорта модуля (мкс) из вывода -X importtime"""
+    for line in importtime.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} не найден в выводе -X importtime")
+
+
+def test_api_import_is_lazy_and_within_budget():
+    loaded, importtime = _import_api()
+    assert loaded == '', f"при импорте api.main загружены: {loaded}"
+
+    elapsed_ms = _cumulative_us(importtime, 'api.main') / 1000
+    assert elapsed_ms < IMPORT_TIME_BUDGET_MS, (
+        f"импорт api.main занял {elapsed_ms:.0f} мс (бюджет {IMPORT_TIME_BUDGET_MS:.0f} мс)"
+    )
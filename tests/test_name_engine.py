@@ -0,0 +1,41 @@
+"""Упакованные суммы имени совпадают с подсчетом по полям"""
+from datetime import date
+
+import pytest
+
+from matrix_calculator.models import MAX_NAME_LENGTH, MatrixData
+from matrix_calculator.name_engine import LATIN_TABLES, NameEngine
+
+
+@pytest.mark.parametrize('latin', sorted(LATIN_TABLES))
+def test_packed_score_matches_fields(latin):
+    engine = NameEngine(latin)
+    for name in ('Иван Петров', 'Мария-Луиза Ёлкина', 'John Smith', 'Xavier', 'Ъ', ''):
+        assert engine.score(name) == engine._score_fields(name), name
+
+
+@pytest.mark.parametrize('length_delta', (0, 1))
+def test_long_name_does_not_overflow_fields(length_delta):
+    engine = NameEngine()
+    # Щ - согласная с наибольшим значением (9)
+    name = 'Щ' * (engine.packed_length + length_delta)
+    assert engine.score(name) == (0, 9 * len(name), 9 * len(name))
+    assert engine.score('Щ' * 120000).personality == 1080000
+
+
+def test_batch_long_name():
+    pytest.importorskip('numpy')
+    from matrix_calculator import MatrixCalculator
+
+    calculator = MatrixCalculator()
+    engine = calculator.name_engine
+    names = ['Анна', 'Щ' * 120000, 'A' * (engine.packed_length + 1) + 'Б']
+    batch = calculator.calculate_batch([date(1990, 1, 1)] * len(names), names)
+    for index, name in enumerate(names):
+        expected = engine.score(name)
+        assert batch.to_result(index).expression == calculator.reduce_number(expected.expression)
+
+
+def test_name_length_limited_at_input():
+    with pytest.raises(ValueError):
+        MatrixData(birth_date=date(1990, 1, 1), name='А' * (MAX_NAME_LENGTH + 1))
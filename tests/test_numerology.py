@@ -0,0 +1,55 @@
+"""Табличная редукция совпадает с эталонным сложением цифр"""
+import random
+
+import numpy as np
+import pytest
+
+from matrix_calculator.batch import reduce_array
+from matrix_calculator.numerology import (
+    MASTER_NUMBERS, REDUCE_TABLE_SIZE, _reduce_number_loop, reduce_number,
+)
+
+# Все значения таблицы и запас за ее пределами
+EXHAUSTIVE = range(-50, 20 * REDUCE_TABLE_SIZE)
+
+
+def _random_values(count: int = 20000, seed: int = 4):
+    rng = random.Random(seed)
+    values = [rng.randrange(REDUCE_TABLE_SIZE, 10 ** 18) for _ in range(count)]
+    # Числа, которые сводятся к мастер-числам через промежуточные суммы
+    values += [29, 38, 47, 56, 65, 299, 2999, 9992, 49, 499, 4999, 10 ** 17 + 21]
+    return values
+
+
+def test_reduce_number_exhaustive():
+    for number in EXHAUSTIVE:
+        assert reduce_number(number) == _reduce_number_loop(number), number
+
+
+def test_reduce_number_above_table():
+    for number in _random_values():
+        assert reduce_number(number) == _reduce_number_loop(number), number
+
+
+@pytest.mark.parametrize('number', MASTER_NUMBERS)
+def test_master_numbers_stop(number):
+    assert reduce_number(number) == number
+
+
+@pytest.mark.parametrize('number, expected', [
+    (29, 11), (2999, 11), (1993, 22), (499, 22),
+    # Через промежуточную сумму: 49 -> 13 -> 4, 3 * 10**6 + 1992 -> 24 -> 6
+    (49, 4), (3 * 10 ** 6 + 1992, 6),
+])
+def test_master_number_reached_through_sums(number, expected):
+    assert reduce_number(number) == expected
+
+
+def test_reduce_array_matches_loop():
+    values = list(EXHAUSTIVE) + _random_values()
+    expected = np.array([_reduce_number_loop(value) for value in values], dtype=np.int64)
+    assert np.array_equal(reduce_array(np.array(values, dtype=np.int64)), expected)
+
+
+def test_reduce_array_empty():
+    assert len(reduce_array(np.array([], dtype=np.int64))) == 0
@@ -0,0 +1,95 @@
+"""Сообщения Telegram: лимит длины, целые сущности и тот же текст, что в отчете"""
+import html
+import random
+import re
+from datetime import date, timedelta
+
+import pytest
+
+from matrix_calculator import MatrixCalculator, MatrixData
+from reports import text_report
+from reports.generator import ReportGenerator
+from reports.text_report import (
+    TELEGRAM_MESSAGE_LIMIT, _PRE_CLOSE, _PRE_OPEN, split_lines, utf16_length,
+)
+
+BODY_LIMIT = TELEGRAM_MESSAGE_LIMIT - len(_PRE_OPEN) - len(_PRE_CLOSE)
+EMOJI = '😀'
+# Амперсанд допустим только как начало сущности html.escape(quote=False)
+BROKEN_ENTITY = re.compile(r'&(?!(?:amp|lt|gt);)')
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return ReportGenerator(enable_web_scraping=False)
+
+
+def _cases(count: int = 30, seed: int = 11):
+    rng = random.Random(seed)
+    calculator = MatrixCalculator()
+    names = ('Иван', 'Анна <Петрова>', 'Tom & Jerry', f'Мария {EMOJI}')
+    cases = []
+    for _ in range(count):
+        data = MatrixData(
+            birth_date=date(1920, 1, 1) + timedelta(days=rng.randrange(40000)),
+            name=rng.choice(names)
+        )
+        cases.append((data, calculator.calculate_matrix(data)))
+    return cases
+
+
+def _bodies(messages):
+    bodies = []
+    for message in messages:
+        assert message.startswith(_PRE_OPEN) and message.endswith(_PRE_CLOSE)
+        bodies.append(message[len(_PRE_OPEN):-len(_PRE_CLOSE)])
+    return bodies
+
+
+def check_messages(messages, expected_text):
+    bodies = _bodies(messages)
+    for message, body in zip(messages, bodies):
+        assert utf16_length(message) <= TELEGRAM_MESSAGE_LIMIT
+        assert not BROKEN_ENTITY.search(body), body[-20:]
+        # Строка кодируется в UTF-16 без ошибок - половин суррогатных пар нет
+        body.encode('utf-16-le')
+    assert html.unescape(''.join(bodies)) == expected_text
+
+
+def _additional_infos():
+    return [
+        None,
+        {'summary': 'резюме & <итоги> ' * 60, 'detailed_info': '\nподробно\n'},
+        {'summary': '', 'detailed_info': ('строка & ' * 40 + '\n') * 40},
+    ]
+
+
+@pytest.mark.parametrize('additional_info', _additional_infos())
+def test_messages_reproduce_text_report(generator, additional_info):
+    for data, result in _cases():
+        messages = generator.generate_telegram_messages(data, result, additional_info)
+        check_messages(messages, generator.generate_text_report(data, result, additional_info))
+
+
+@pytest.mark.parametrize('tail', ('&', EMOJI, f'&{EMOJI}', f'{EMOJI}&'))
+@pytest.mark.parametrize('offset', range(-6, 3))
+def test_oversized_line_cut_at_boundary(generator, tail, offset):
+    # Строка без переводов длиннее сообщения, сущность или emoji на срезе
+    head = 'x' * (BODY_LIMIT + offset)
+    line = head + (tail * 8) + 'y' * BODY_LIMIT
+    data, result = _cases(1)[0]
+    info = {'summary': '', 'detailed_info': line}
+    messages = generator.generate_telegram_messages(data, result, info)
+    check_messages(messages, generator.generate_text_report(data, result, info))
+
+
+@pytest.mark.parametrize('limit', (8, 9, 10, 16))
+def test_split_lines_exhaustive_small_limits(limit):
+    for prefix in range(2 * limit):
+        for tail in ('&', EMOJI, f'&{EMOJI}', f'{EMOJI}&&'):
+            text = text_report.escape('a' * prefix + tail * 4 + 'b' * limit)
+            pieces = split_lines(text, limit)
+            assert ''.join(piece for piece, _ in pieces) == text
+            for piece, units in pieces:
+                assert units == utf16_length(piece) <= limit
+                assert not BROKEN_ENTITY.search(piece), piece